@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 The Linux Foundation
+"""
+Shared import-path setup for the scripts in this directory.
+
+Importing this module puts the repository's ``src`` directory at the front
+of ``sys.path`` exactly once, so the scripts exercise the working tree
+rather than any installed copy of github2gerrit.
+"""
+
+import sys
+from pathlib import Path
+
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent / "src")
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
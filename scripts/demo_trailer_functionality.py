@@ -8,12 +8,12 @@ This script demonstrates the trailer-aware duplicate detection and
 enhanced reconciliation features that have been implemented.
 """
 
+import contextlib
+import io
 import sys
-from pathlib import Path
-
 
 # Add src to Python path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import _bootstrap  # noqa: F401
 
 from github2gerrit.mapping_comment import ChangeIdMapping
 from github2gerrit.mapping_comment import compute_mapping_digest
@@ -27,9 +27,10 @@ from github2gerrit.trailers import compute_jaccard_similarity
 from github2gerrit.trailers import extract_change_ids
 from github2gerrit.trailers import extract_github_metadata
 from github2gerrit.trailers import extract_subject_tokens
-from github2gerrit.trailers import has_trailer
 from github2gerrit.trailers import normalize_subject_for_matching
 from github2gerrit.trailers import parse_trailers
+from github2gerrit.trailers import which_trailer_values_present
+from github2gerrit.trailers import which_trailers_present
 
 
 def demo_trailer_parsing():
@@ -72,13 +73,17 @@ GitHub-Hash: abc12345"""
     print(f"Change-IDs found: {change_ids}")
     print()
 
-    # Check for specific trailers
+    # Check for specific trailers (one parse per batch of checks)
+    present = which_trailers_present(commit_msg, {"Change-Id", "GitHub-PR"})
+    present_values = which_trailer_values_present(
+        commit_msg, {("GitHub-Hash", "abc12345")}
+    )
     print("Trailer checks:")
-    print(f"  Has Change-Id: {has_trailer(commit_msg, 'Change-Id')}")
-    print(f"  Has GitHub-PR: {has_trailer(commit_msg, 'GitHub-PR')}")
+    print(f"  Has Change-Id: {'Change-Id' in present}")
+    print(f"  Has GitHub-PR: {'GitHub-PR' in present}")
     print(
         f"  Has specific GitHub-Hash: "
-        f"{has_trailer(commit_msg, 'GitHub-Hash', 'abc12345')}"
+        f"{('GitHub-Hash', 'abc12345') in present_values}"
     )
     print()
 
@@ -315,7 +320,7 @@ GitHub-Hash: {github_hash}"""
     print()
 
 
-def main():
+def run_demos():
     """Run all demo functions."""
     print("GitHub2Gerrit Trailer Functionality Demo")
     print("=" * 50)
@@ -346,5 +351,16 @@ def main():
     return 0
 
 
+def main():
+    """Run the demos, writing their output to stdout in a single write."""
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return run_demos()
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -9,14 +9,69 @@ This script tests that the github2gerrit CLI automatically logs version
 information when running in a GitHub Actions environment.
 """
 
+import contextlib
+import importlib
+import io
 import os
 import subprocess
 import sys
 from pathlib import Path
 
-
 # Add the src directory to the path so we can import our modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import _bootstrap  # noqa: F401
+from typer.testing import CliRunner
+
+
+GITHUB_ACTIONS_ENV = {
+    "GITHUB_ACTIONS": "true",
+    "GITHUB_EVENT_NAME": "pull_request",
+    "GITHUB_REPOSITORY": "test/repo",
+}
+CLI_MODE_ENV: dict[str, str | None] = {
+    "GITHUB_ACTIONS": None,
+    "GITHUB_EVENT_NAME": None,
+}
+
+
+def _run_cli(
+    args: list[str], env: dict[str, str | None] | None = None
+) -> tuple[int, str]:
+    """Invoke the CLI in-process and return (exit code, stdout).
+
+    The version banner is printed when github2gerrit.cli is imported, so the
+    module is (re)imported with sys.argv and the environment patched to match
+    the simulated invocation. This avoids paying for a fresh interpreter per
+    check.
+    """
+    env = env or {}
+    saved_argv = sys.argv
+    saved_env = {key: os.environ.get(key) for key in env}
+    banner = io.StringIO()
+
+    sys.argv = ["github2gerrit", *args]
+    for key, value in env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+    try:
+        with contextlib.redirect_stdout(banner):
+            cli = sys.modules.get("github2gerrit.cli")
+            if cli is None:
+                cli = importlib.import_module("github2gerrit.cli")
+            else:
+                cli = importlib.reload(cli)
+        result = CliRunner().invoke(cli.app, args)
+    finally:
+        sys.argv = saved_argv
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    return result.exit_code, banner.getvalue() + result.stdout
 
 
 def test_cli_mode():
@@ -24,27 +79,15 @@ def test_cli_mode():
     print("🧪 Testing CLI Mode with --help (should show version)")
     print("-" * 55)
 
-    # Ensure we're NOT in GitHub Actions mode
-    env = os.environ.copy()
-    env.pop("GITHUB_ACTIONS", None)
-    env.pop("GITHUB_EVENT_NAME", None)
+    # Run the CLI help command, ensuring we're NOT in GitHub Actions mode
+    exit_code, stdout = _run_cli(["--help"], CLI_MODE_ENV)
 
-    # Run the CLI help command
-    result = subprocess.run(
-        [sys.executable, "-m", "github2gerrit.cli", "--help"],
-        check=False,
-        capture_output=True,
-        text=True,
-        env=env,
-        cwd=Path(__file__).parent.parent,
-    )
-
-    print(f"Exit code: {result.returncode}")
+    print(f"Exit code: {exit_code}")
     print("STDOUT preview:")
-    print(result.stdout[:200] + ("..." if len(result.stdout) > 200 else ""))
+    print(stdout[:200] + ("..." if len(stdout) > 200 else ""))
 
     # Check that version IS displayed (since --help was used)
-    has_auto_version = "🏷️  github2gerrit version" in result.stdout
+    has_auto_version = "🏷️  github2gerrit version" in stdout
     print(f"Has version logging with --help: {has_auto_version}")
 
     if has_auto_version:
@@ -63,28 +106,15 @@ def test_github_actions_mode():
     )
     print("-" * 60)
 
-    # Set GitHub Actions environment variables
-    env = os.environ.copy()
-    env["GITHUB_ACTIONS"] = "true"
-    env["GITHUB_EVENT_NAME"] = "pull_request"
-    env["GITHUB_REPOSITORY"] = "test/repo"
-
     # Run the CLI help command in GitHub Actions mode
-    result = subprocess.run(
-        [sys.executable, "-m", "github2gerrit.cli", "--help"],
-        check=False,
-        capture_output=True,
-        text=True,
-        env=env,
-        cwd=Path(__file__).parent.parent,
-    )
+    exit_code, stdout = _run_cli(["--help"], GITHUB_ACTIONS_ENV)
 
-    print(f"Exit code: {result.returncode}")
+    print(f"Exit code: {exit_code}")
     print("STDOUT preview:")
-    print(result.stdout[:400] + ("..." if len(result.stdout) > 400 else ""))
+    print(stdout[:400] + ("..." if len(stdout) > 400 else ""))
 
     # Check that version IS automatically displayed
-    has_auto_version = "🏷️  github2gerrit version" in result.stdout
+    has_auto_version = "🏷️  github2gerrit version" in stdout
     print(f"Has automatic version logging: {has_auto_version}")
 
     if has_auto_version:
@@ -107,20 +137,14 @@ def test_cli_mode_without_help():
     print("-" * 58)
 
     # Test a command that will fail quickly without showing help
-    result = subprocess.run(
-        [sys.executable, "-m", "github2gerrit.cli", "--version"],
-        check=False,
-        capture_output=True,
-        text=True,
-        cwd=Path(__file__).parent.parent,
-    )
+    exit_code, stdout = _run_cli(["--version"], CLI_MODE_ENV)
 
-    print(f"Exit code: {result.returncode}")
+    print(f"Exit code: {exit_code}")
     print("Version output:")
-    print(result.stdout.strip())
+    print(stdout.strip())
 
-    has_version_output = "github2gerrit version" in result.stdout
-    has_emoji_version = "🏷️  github2gerrit version" in result.stdout
+    has_version_output = "github2gerrit version" in stdout
+    has_emoji_version = "🏷️  github2gerrit version" in stdout
 
     if has_version_output and not has_emoji_version:
         print("✅ PASS: --version flag works without emoji (not help mode)")
@@ -137,19 +161,13 @@ def test_explicit_version_flag():
     print("-" * 35)
 
     # Test in normal mode
-    result = subprocess.run(
-        [sys.executable, "-m", "github2gerrit.cli", "--version"],
-        check=False,
-        capture_output=True,
-        text=True,
-        cwd=Path(__file__).parent.parent,
-    )
+    exit_code, stdout = _run_cli(["--version"])
 
-    print(f"Exit code: {result.returncode}")
+    print(f"Exit code: {exit_code}")
     print("Version output:")
-    print(result.stdout.strip())
+    print(stdout.strip())
 
-    has_version_output = "github2gerrit version" in result.stdout
+    has_version_output = "github2gerrit version" in stdout
     if has_version_output:
         print("✅ PASS: --version flag works correctly")
     else:
@@ -160,18 +178,23 @@ def test_explicit_version_flag():
 
 
 def test_version_in_github_actions_with_real_command():
-    """Test version logging with a real command in GitHub Actions mode."""
+    """Test version logging with a real command in GitHub Actions mode.
+
+    Kept as an end-to-end smoke test in a separate interpreter, since the
+    command runs the full PR pipeline rather than exiting early.
+    """
     print("🧪 Testing Version Logging with Real Command in GitHub Actions")
     print("-" * 60)
 
     # Set GitHub Actions environment variables
-    env = os.environ.copy()
-    env["GITHUB_ACTIONS"] = "true"
-    env["GITHUB_EVENT_NAME"] = "pull_request"
-    env["GITHUB_REPOSITORY"] = "test/repo"
-
-    # Run a command that would fail safely (no GitHub token)
-    result = subprocess.run(
+    env = {**os.environ, **GITHUB_ACTIONS_ENV}
+
+    # Run a command that would fail safely (no GitHub token). Output is
+    # streamed and the process stopped as soon as the banner shows up, so
+    # only the leading part of the output is ever buffered.
+    has_auto_version = False
+    preview = ""
+    with subprocess.Popen(
         [
             sys.executable,
             "-m",
@@ -179,23 +202,28 @@ def test_version_in_github_actions_with_real_command():
             "https://github.com/test/repo/pull/123",
             "--dry-run",
         ],
-        check=False,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
         text=True,
         env=env,
         cwd=Path(__file__).parent.parent,
-    )
-
-    print(f"Exit code: {result.returncode}")
-    print("STDOUT (first 500 chars):")
-    print(result.stdout[:500] + ("..." if len(result.stdout) > 500 else ""))
-
-    if result.stderr:
-        print("STDERR (first 200 chars):")
-        print(result.stderr[:200] + ("..." if len(result.stderr) > 200 else ""))
+    ) as proc:
+        for line in proc.stdout or ():
+            if len(preview) < 500:
+                preview += line
+            if "🏷️  github2gerrit version" in line:
+                has_auto_version = True
+                proc.terminate()
+                break
+        proc.wait()
+
+    status = "terminated early" if has_auto_version else proc.returncode
+    print(f"Exit code: {status}")
+    print("OUTPUT (first 500 chars):")
+    print(preview[:500] + ("..." if len(preview) > 500 else ""))
 
     # Check that version IS displayed at the beginning
-    has_auto_version = "🏷️  github2gerrit version" in result.stdout
     print(f"Has automatic version logging: {has_auto_version}")
 
     if has_auto_version:
@@ -207,6 +235,22 @@ def test_version_in_github_actions_with_real_command():
     return has_auto_version
 
 
+# (summary label, check) pairs, run in order by main()
+CHECKS = (
+    ("CLI Mode with --help (shows version)", test_cli_mode),
+    (
+        "CLI Mode without --help (no emoji version)",
+        test_cli_mode_without_help,
+    ),
+    ("GitHub Actions Mode (auto version)", test_github_actions_mode),
+    ("Explicit --version flag", test_explicit_version_flag),
+    (
+        "Real command in GitHub Actions",
+        test_version_in_github_actions_with_real_command,
+    ),
+)
+
+
 def main():
     """Run all tests and report results."""
     print("🎯 GitHub2Gerrit Version Logging Test Suite")
@@ -214,29 +258,7 @@ def main():
     print()
 
     # Run all tests
-    test_results = []
-
-    test_results.append(
-        ("CLI Mode with --help (shows version)", test_cli_mode())
-    )
-    test_results.append(
-        (
-            "CLI Mode without --help (no emoji version)",
-            test_cli_mode_without_help(),
-        )
-    )
-    test_results.append(
-        ("GitHub Actions Mode (auto version)", test_github_actions_mode())
-    )
-    test_results.append(
-        ("Explicit --version flag", test_explicit_version_flag())
-    )
-    test_results.append(
-        (
-            "Real command in GitHub Actions",
-            test_version_in_github_actions_with_real_command(),
-        )
-    )
+    test_results = [(name, check()) for name, check in CHECKS]
 
     # Summary
     print("📊 Test Results Summary")
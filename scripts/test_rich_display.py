@@ -9,13 +9,13 @@ This script demonstrates the Rich-formatted output that will be shown
 when processing GitHub PRs with the enhanced CLI.
 """
 
+import os
 import sys
 import time
-from pathlib import Path
-
+from datetime import timedelta
 
 # Add the src directory to the path so we can import our modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import _bootstrap  # noqa: F401
 
 from github2gerrit.rich_display import RICH_AVAILABLE
 from github2gerrit.rich_display import G2GProgressTracker
@@ -23,6 +23,25 @@ from github2gerrit.rich_display import console
 from github2gerrit.rich_display import display_pr_info
 
 
+# Skip the simulated delays with --fast or G2G_DEMO_FAST=1 (e.g. in CI)
+FAST_MODE = "--fast" in sys.argv[1:] or os.getenv(
+    "G2G_DEMO_FAST", ""
+).strip().lower() in ("1", "true", "yes", "on")
+
+
+def simulate_work(tracker: G2GProgressTracker, seconds: float) -> None:
+    """Simulate a processing step taking ``seconds``.
+
+    In fast mode the tracker's clock is advanced virtually by moving its
+    start time back, so reported elapsed times stay realistic without
+    blocking.
+    """
+    if FAST_MODE:
+        tracker.start_time -= timedelta(seconds=seconds)
+    else:
+        time.sleep(seconds)
+
+
 def demo_pr_info_display():
     """Demonstrate PR information display."""
     console.print("\n🔍 Examining pull request in os-climate")
@@ -70,7 +89,7 @@ def demo_progress_tracking():
 
         for operation, duration in operations:
             progress_tracker.update_operation(operation)
-            time.sleep(duration)
+            simulate_work(progress_tracker, duration)
 
             # Simulate some events during processing
             if "checkout" in operation:
@@ -82,7 +101,7 @@ def demo_progress_tracking():
                 )
 
         progress_tracker.update_operation("Completed successfully")
-        time.sleep(0.5)
+        simulate_work(progress_tracker, 0.5)
 
     finally:
         progress_tracker.stop()
@@ -105,7 +124,7 @@ def demo_bulk_processing():
 
     try:
         progress_tracker.update_operation("🔍 Examining pull requests")
-        time.sleep(1.0)
+        simulate_work(progress_tracker, 1.0)
 
         # Simulate finding multiple PRs
         pr_count = 5
@@ -116,7 +135,7 @@ def demo_bulk_processing():
         for i in range(1, pr_count + 1):
             progress_tracker.update_operation(f"Processing PR #{1000 + i}...")
             progress_tracker.pr_processed()
-            time.sleep(0.8)
+            simulate_work(progress_tracker, 0.8)
 
             # Simulate different outcomes
             if i <= 3:
@@ -127,7 +146,7 @@ def demo_bulk_processing():
                 progress_tracker.add_error(f"PR #{1000 + i} processing failed")
 
         progress_tracker.update_operation("Processing completed ✅")
-        time.sleep(0.5)
+        simulate_work(progress_tracker, 0.5)
 
     finally:
         progress_tracker.stop()
@@ -142,8 +161,8 @@ def demo_bulk_processing():
     console.print(f"❌ Errors: {summary['errors_count']}")
 
 
-def main():
-    """Run the Rich display demonstration."""
+def run_demos():
+    """Run the Rich display demonstrations."""
     console.print("🎨 Rich Display Demonstration for github2gerrit-action")
     console.print("=" * 60)
 
@@ -174,5 +193,20 @@ def main():
     console.print("processing GitHub PRs with the github2gerrit-action tool.")
 
 
+def main():
+    """Run the Rich display demonstration.
+
+    In fast mode nothing is animated, so the rendered output (styles
+    included) is captured and written in one go rather than line by line.
+    """
+    if FAST_MODE and RICH_AVAILABLE:
+        with console.capture() as capture:
+            run_demos()
+        sys.stdout.write(capture.get())
+        sys.stdout.flush()
+    else:
+        run_demos()
+
+
 if __name__ == "__main__":
     main()
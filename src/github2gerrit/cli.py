@@ -53,11 +53,10 @@ from .external_api import log_api_metrics_summary
 from .gerrit_pr_closer import FORCE_ABANDONED_CLEANUP
 from .gerrit_pr_closer import FORCE_GERRIT_CLEANUP
 from .gerrit_pr_closer import abandon_gerrit_change_for_closed_pr
-from .gerrit_pr_closer import check_gerrit_change_status
 from .gerrit_pr_closer import cleanup_abandoned_prs_bulk
 from .gerrit_pr_closer import cleanup_closed_github_prs
 from .gerrit_pr_closer import close_pr_with_status
-from .gerrit_pr_closer import extract_pr_url_from_gerrit_change
+from .gerrit_pr_closer import fetch_change_status_and_pr_url
 from .gerrit_pr_closer import parse_pr_url
 from .gerrit_pr_closer import process_recent_commits_for_pr_closure
 from .github_api import build_client
@@ -1901,8 +1900,9 @@ def _process_close_gerrit_change(
     """
     log.debug("Processing Gerrit change: %s", gerrit_change_url)
 
-    # First, check if this Gerrit change originated from GitHub
-    pr_url = extract_pr_url_from_gerrit_change(gerrit_change_url)
+    # Status and GitHub-PR trailer come from a single Gerrit REST call;
+    # first, check if this Gerrit change originated from GitHub
+    status, pr_url = fetch_change_status_and_pr_url(gerrit_change_url)
     if not pr_url:
         no_action_msg = (
             "✅ No action required: Gerrit change did NOT originate in GitHub"
@@ -1914,8 +1914,6 @@ def _process_close_gerrit_change(
     # Check if close_merged_prs is enabled
     close_merged_prs = env_bool("CLOSE_MERGED_PRS", True)
 
-    status = check_gerrit_change_status(gerrit_change_url)
-
     # Validate status: without --force, reject MERGED/ABANDONED changes
     if not force and status in ("MERGED", "ABANDONED"):
         error_msg = (
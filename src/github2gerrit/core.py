@@ -253,6 +253,37 @@ def _is_valid_change_id(value: str) -> bool:
     )
 
 
+# git error fragments meaning the requested commit is absent locally,
+# typically because a shallow clone does not reach back far enough
+_MISSING_COMMIT_ERROR_MARKERS = (
+    "not a commit",
+    "cannot be created from",
+    "bad revision",
+    "unknown revision",
+    "invalid reference",
+)
+
+
+def _is_missing_commit_error(msg: str) -> bool:
+    """Return True if a git error message reports a missing commit."""
+    lowered = msg.lower()
+    return any(marker in lowered for marker in _MISSING_COMMIT_ERROR_MARKERS)
+
+
+# git merge failures caused by history that a shallow clone cut off
+_UNRELATED_HISTORY_RE = re.compile(
+    r"unrelated histories|no common ancestor", re.IGNORECASE
+)
+
+
+def _is_unrelated_history_error(exc: CommandError) -> bool:
+    """Return True if a failed git merge reports unrelated histories."""
+    return bool(
+        _UNRELATED_HISTORY_RE.search(str(exc))
+        or _UNRELATED_HISTORY_RE.search(exc.stderr or "")
+    )
+
+
 # GerritInfo is imported from .gitreview (aliased from GitReviewInfo).
 # It retains the same frozen-dataclass interface (host, port, project) plus
 # an additional optional ``base_path`` field (default ``None``).
@@ -1628,7 +1659,7 @@ class Orchestrator:
         Assumes self._reconciliation_plan set by reconciliation step:
           {
             "change_ids": [...],
-            "digest": "<sha12>"
+            "digest": "<hex12>"
           }
         """
         plan = getattr(self, "_reconciliation_plan", None)
@@ -1823,6 +1854,8 @@ class Orchestrator:
         # Track workspace preparation state to avoid redundant fetches
         self._workspace_prepared: bool = False
         self._prepared_branch: str | None = None
+        # Memoized shallow-clone state; reset when the history is fetched
+        self._shallow_cache: bool | None = None
         # Track git-review setup state to avoid redundant setup
         self._git_review_initialized: bool = False
         # Resolved repository names (set during execute) used for
@@ -3176,9 +3209,17 @@ class Orchestrator:
     def _is_shallow_clone(self) -> bool:
         """Check if the current workspace is a shallow clone.
 
+        The result is cached until the history is deepened or unshallowed.
+
         Returns:
             True if the repository is a shallow clone, False otherwise.
         """
+        if self._shallow_cache is None:
+            self._shallow_cache = self._detect_shallow_clone()
+        return self._shallow_cache
+
+    def _detect_shallow_clone(self) -> bool:
+        """Inspect the workspace for shallow-clone markers (uncached)."""
         shallow_file = self.workspace / ".git" / "shallow"
         if shallow_file.exists():
             return True
@@ -3216,6 +3257,7 @@ class Orchestrator:
             return False
         else:
             log.debug("Repository unshallowed successfully")
+            self._shallow_cache = False
             return True
 
     def _deepen_repository(self, depth: int = 100) -> bool:
@@ -3246,6 +3288,7 @@ class Orchestrator:
             return False
         else:
             log.debug("Repository deepened by %d commits", depth)
+            self._shallow_cache = None
             return True
 
     def _checkout_with_unshallow_fallback(
@@ -3288,18 +3331,13 @@ class Orchestrator:
         if checkout_exc is None:
             return  # Success on first attempt
 
-        # Analyze the failure
-        error_msg = str(checkout_exc).lower()
-        # Check if failure is due to missing commit (shallow clone issue)
-        is_missing_commit = (
-            "not a commit" in error_msg
-            or "cannot be created from" in error_msg
-            or "bad revision" in error_msg
-            or "unknown revision" in error_msg
-            or "invalid reference" in error_msg
-        )
-
-        if not is_missing_commit:
+        # Check if failure is due to missing commit in a shallow clone;
+        # deepening cannot help a complete history, so skip the recovery
+        # fetches and checkout retries entirely in that case
+        if (
+            not _is_missing_commit_error(str(checkout_exc))
+            or not self._is_shallow_clone()
+        ):
             # Not a shallow clone issue, re-raise immediately
             raise checkout_exc
 
@@ -3367,17 +3405,10 @@ class Orchestrator:
             return  # Success on first attempt
 
         # Check if the failure is due to unrelated histories in a shallow clone
-        error_str = str(merge_exc).lower()
-        stderr_str = (merge_exc.stderr or "").lower()
-        combined = f"{error_str} {stderr_str}"
-
-        is_unrelated_histories = (
-            "refusing to merge unrelated histories" in combined
-            or "unrelated histories" in combined
-            or "no common ancestor" in combined
-        )
-
-        if not is_unrelated_histories or not self._is_shallow_clone():
+        if (
+            not _is_unrelated_history_error(merge_exc)
+            or not self._is_shallow_clone()
+        ):
             # Not a shallow clone issue — let the caller handle the error
             raise merge_exc
 
@@ -3404,15 +3435,7 @@ class Orchestrator:
                 # Re-check whether this is still a shallow-history problem;
                 # if the error has changed (e.g. real merge conflict), an
                 # expensive full unshallow cannot help — propagate immediately.
-                deepen_combined = (
-                    f"{deepen_exc} {deepen_exc.stderr or ''}".lower()
-                )
-                deepen_is_unrelated = (
-                    "refusing to merge unrelated histories" in deepen_combined
-                    or "unrelated histories" in deepen_combined
-                    or "no common ancestor" in deepen_combined
-                )
-                if not deepen_is_unrelated:
+                if not _is_unrelated_history_error(deepen_exc):
                     raise
             else:
                 log.info("Merge --squash succeeded after deepening repository")
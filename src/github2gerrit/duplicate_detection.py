@@ -34,6 +34,18 @@ from .trailers import extract_github_metadata
 
 log = logging.getLogger(__name__)
 
+# Gerrit subject normalization for duplicate checks; applied to every
+# candidate change, so the patterns are compiled once at import.
+_DUP_CC_PREFIX_RE = re.compile(
+    r"^(feat|fix|docs|style|refactor|test|chore|ci|build|perf)(\(.+?\))?: ",
+    re.IGNORECASE,
+)
+_DUP_MARKDOWN_RE = re.compile(r"[*_`]")
+_DUP_PREFIXED_VERSION_RE = re.compile(r"\bv\d+(\.\d+)*(-\w+)?\b")
+_DUP_DOTTED_VERSION_RE = re.compile(r"\b\d+(\.\d+)+(-\w+)?\b")
+_DUP_SHORT_VERSION_RE = re.compile(r"\b\d+\.\d+\b")
+_DUP_COMMIT_HASH_RE = re.compile(r"\b[a-f0-9]{7,40}\b")
+
 __all__ = [
     "ChangeFingerprint",
     "DuplicateChangeError",
@@ -329,25 +341,13 @@ class DuplicateDetector:
 
         # Helper: normalize subject like our existing title normalization
         def _normalize_subject(title: str) -> str:
-            normalized = title.strip()
-            normalized = re.sub(
-                r"^(feat|fix|docs|style|refactor|test|chore|ci|build|perf)"
-                r"(\(.+?\))?: ",
-                "",
-                normalized,
-                flags=re.IGNORECASE,
-            )
-            normalized = re.sub(r"[*_`]", "", normalized)
-            normalized = re.sub(
-                r"\bv\d+(\.\d+)*(-\w+)?\b", "vx.y.z", normalized
-            )
-            normalized = re.sub(r"\b\d+(\.\d+)+(-\w+)?\b", "x.y.z", normalized)
-            normalized = re.sub(r"\b\d+\.\d+\b", "x.y.z", normalized)
-            normalized = re.sub(
-                r"\b[a-f0-9]{7,40}\b", "commit_hash", normalized
-            )
-            normalized = re.sub(r"\s+", " ", normalized).strip()
-            return normalized.lower()
+            normalized = _DUP_CC_PREFIX_RE.sub("", title.strip())
+            normalized = _DUP_MARKDOWN_RE.sub("", normalized)
+            normalized = _DUP_PREFIXED_VERSION_RE.sub("vx.y.z", normalized)
+            normalized = _DUP_DOTTED_VERSION_RE.sub("x.y.z", normalized)
+            normalized = _DUP_SHORT_VERSION_RE.sub("x.y.z", normalized)
+            normalized = _DUP_COMMIT_HASH_RE.sub("commit_hash", normalized)
+            return " ".join(normalized.split()).lower()
 
         normalized_pr_subject = _normalize_subject(pr_title)
         log.debug(
@@ -474,7 +474,9 @@ class DuplicateDetector:
                             else ""
                         )
 
-                if msg:
+                # Cheap substring check first; only messages that mention
+                # the expected hash are worth parsing for trailers.
+                if msg and expected_github_hash in msg:
                     github_metadata = extract_github_metadata(msg)
                     change_github_hash = github_metadata.get("GitHub-Hash", "")
 
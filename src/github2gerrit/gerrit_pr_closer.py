@@ -10,11 +10,23 @@ merged and close the corresponding GitHub pull request that originated it.
 
 from __future__ import annotations
 
+import itertools
 import logging
 import os
 import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 from typing import Literal
+from typing import cast
+from urllib.parse import urlparse
 
 from .constants import GERRIT_CHANGE_URL_PATTERN
 from .constants import GITHUB_PR_URL_PATTERN
@@ -22,21 +34,117 @@ from .error_codes import ExitCode
 from .error_codes import GitHub2GerritError
 from .gerrit_rest import GerritRestError
 from .gerrit_rest import build_client_for_host
+
+# github_api and rich_display stay module-level imports: every importer of
+# this module (the CLI) loads them anyway, error_codes already pulls in
+# rich_display, and callers patch these names on this module.
+from .github_api import RateLimitExceededExceptionType
 from .github_api import build_client
 from .github_api import close_pr
 from .github_api import create_pr_comment
 from .github_api import get_pull
 from .github_api import iter_open_pulls
 from .gitutils import git_show
+from .gitutils import git_show_many
 from .pr_content_filter import sanitize_gerrit_comment
 from .rich_display import display_pr_info
 from .rich_display import safe_console_print
 from .trailers import GITHUB_PR_TRAILER
+from .trailers import extract_github_metadata
 from .trailers import parse_trailers
 
 
 log = logging.getLogger(__name__)
 
+# URL patterns compiled once at import; they are matched for every commit
+# and PR processed
+_GERRIT_CHANGE_RE = re.compile(GERRIT_CHANGE_URL_PATTERN)
+_GITHUB_PR_RE = re.compile(GITHUB_PR_URL_PATTERN)
+
+# "Superseded by #N" note left on a closed PR by the superseding workflow
+_SUPERSEDED_BY_RE = re.compile(r"Superseded by #(\d+)")
+
+# Hosts accepted by parse_pr_url: github.com and its subdomains (matched
+# against "." + host). GitHub Enterprise hosts come from GITHUB_SERVER_URL.
+_GITHUB_HOST_SUFFIXES = (".github.com",)
+
+# Gerrit change statuses understood here; anything else maps to UNKNOWN
+_ALLOWED_STATUSES = frozenset({"MERGED", "ABANDONED", "NEW", "UNKNOWN"})
+
+# Short-lived cache of Gerrit change detail responses keyed by
+# (host, change number), so a batch touching the same change queries it
+# once. Merged changes can no longer change, so they are kept longer.
+_CHANGE_DETAIL_TTL = 30.0
+_MERGED_CHANGE_DETAIL_TTL = 600.0
+_change_detail_cache: dict[tuple[str, str], tuple[float, Any]] = {}
+
+# Upper bound on commits processed concurrently for PR closure; the work is
+# network-bound (Gerrit and GitHub REST calls). The Gerrit and GitHub clients
+# are synchronous, so a fixed-size thread pool is used rather than an event
+# loop; its footprint stays at this many threads however large the batch.
+_PR_CLOSURE_MAX_WORKERS = 8
+
+# Serializes PR detail tables so concurrent workers don't interleave output
+_DISPLAY_LOCK = threading.Lock()
+
+
+# Reused Gerrit and GitHub clients, one set per thread. Neither pygerrit2
+# nor the PyGithub Requester is documented as thread-safe, so each closure
+# worker builds and keeps its own clients rather than sharing a session.
+# clear_client_cache() bumps the generation, which makes every thread
+# drop its clients on next use.
+_client_local = threading.local()
+_client_cache_generations = itertools.count()
+_client_cache_generation = [next(_client_cache_generations)]
+
+
+def _thread_clients() -> dict[tuple[str, ...], Any]:
+    """Return the calling thread's client cache, reset if stale."""
+    generation = _client_cache_generation[0]
+    if getattr(_client_local, "generation", None) != generation:
+        _client_local.clients = {}
+        _client_local.generation = generation
+    clients: dict[tuple[str, ...], Any] = _client_local.clients
+    return clients
+
+
+def _gerrit_client(host: str) -> Any:
+    """Return this thread's Gerrit REST client for ``host``.
+
+    Reusing the client keeps its HTTP session (and pooled connections)
+    alive across calls instead of paying a new TLS handshake each time.
+    """
+    clients = _thread_clients()
+    key = ("gerrit", host)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = build_client_for_host(host)
+    return client
+
+
+def _github_client() -> Any:
+    """Return this thread's GitHub client for the current settings."""
+    token = os.getenv("GITHUB_TOKEN", "")
+    # build_client() reads the API and server URLs from the environment
+    # itself; they are only part of the key so that a change to them
+    # yields a fresh client
+    key = (
+        "github",
+        token,
+        os.getenv("GITHUB_API_URL", ""),
+        os.getenv("GITHUB_SERVER_URL", ""),
+    )
+    clients = _thread_clients()
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = build_client(token or None)
+    return client
+
+
+def clear_client_cache() -> None:
+    """Drop the reused Gerrit and GitHub clients in every thread."""
+    _client_cache_generation[0] = next(_client_cache_generations)
+
 
 # Cleanup Gerrit changes when GitHub pull requests are closed.
 # Can be controlled via CLEANUP_ABANDONED and CLEANUP_GERRIT
@@ -100,7 +208,7 @@ def extract_change_number_from_url(
         ('gerrit.linuxfoundation.org', '123')
     """
     # Use shared pattern from constants module
-    match = re.match(GERRIT_CHANGE_URL_PATTERN, gerrit_change_url)
+    match = _GERRIT_CHANGE_RE.match(gerrit_change_url)
 
     if match:
         host = match.group(1)
@@ -111,6 +219,52 @@ def extract_change_number_from_url(
     return None
 
 
+# Gerrit query failure counts for the active batch (see
+# _gerrit_warning_batch), keyed by (message, exception type name). A
+# failure kind is logged as a warning once per batch and repeats go to
+# debug, so a Gerrit outage doesn't flood the log.
+_gerrit_warning_batches: list[Counter[tuple[str, str]]] = []
+_GERRIT_WARNING_LOCK = threading.Lock()
+
+
+def _warn_gerrit_query_failure(
+    message: str, change_number: str, exc: Exception
+) -> None:
+    """Log a Gerrit query failure, once per failure kind within a batch."""
+    key = (message, type(exc).__name__)
+    repeated = False
+    with _GERRIT_WARNING_LOCK:
+        if _gerrit_warning_batches:
+            counts = _gerrit_warning_batches[-1]
+            counts[key] += 1
+            repeated = counts[key] > 1
+    if repeated:
+        log.debug(message, change_number, exc)
+    else:
+        log.warning(message, change_number, exc)
+
+
+@contextmanager
+def _gerrit_warning_batch() -> Iterator[None]:
+    """Aggregate repeated Gerrit query warnings; summarize them on exit."""
+    counts: Counter[tuple[str, str]] = Counter()
+    with _GERRIT_WARNING_LOCK:
+        _gerrit_warning_batches.append(counts)
+    try:
+        yield
+    finally:
+        with _GERRIT_WARNING_LOCK:
+            _gerrit_warning_batches.remove(counts)
+        for (_message, exc_name), count in counts.items():
+            if count > 1:
+                log.warning(
+                    "%d further Gerrit query failure(s) of type %s in this "
+                    "batch (details at debug level)",
+                    count - 1,
+                    exc_name,
+                )
+
+
 def check_gerrit_change_status(
     gerrit_change_url: str,
 ) -> Literal["MERGED", "ABANDONED", "NEW", "UNKNOWN"]:
@@ -138,62 +292,133 @@ def check_gerrit_change_status(
     host, change_number = parsed
 
     try:
-        client = build_client_for_host(host)
-
-        # Query change details
-        # Gerrit REST API endpoint: GET /changes/{change-id}
-        change_data = client.get(f"/changes/{change_number}")
-
-        status = change_data.get("status", "UNKNOWN")
-        log.debug("Gerrit change %s status: %s", change_number, status)
+        # Shares the cached /detail response with PR URL lookups, so a
+        # change inspected for both is only queried once
+        change_data = _fetch_change_detail(host, change_number)
+        status = _parse_status(change_data, change_number)
     except GerritRestError as exc:
-        log.warning(
-            "Failed to query Gerrit change %s status: %s",
-            change_number,
-            exc,
+        _warn_gerrit_query_failure(
+            "Failed to query Gerrit change %s status: %s", change_number, exc
         )
         return "UNKNOWN"
     except Exception as exc:
-        log.warning(
-            "Unexpected error querying Gerrit change %s: %s",
-            change_number,
-            exc,
+        _warn_gerrit_query_failure(
+            "Unexpected error querying Gerrit change %s: %s", change_number, exc
         )
         return "UNKNOWN"
     else:
-        allowed_statuses = ("MERGED", "ABANDONED", "NEW", "UNKNOWN")
-        result: Literal["MERGED", "ABANDONED", "NEW", "UNKNOWN"] = (
-            status if status in allowed_statuses else "UNKNOWN"
-        )
-        if status not in allowed_statuses:
-            log.warning(
-                "Unexpected Gerrit status '%s' for change %s, "
-                "treating as UNKNOWN",
-                status,
-                change_number,
-            )
-        return result
+        return status
+
+
+def _fetch_change_detail(host: str, change_number: str) -> Any:
+    """
+    Fetch a Gerrit change with its current revision and commit message.
+
+    Gerrit REST API endpoint: GET /changes/{change-id}/detail. The response
+    carries the change status as well as the revision data, so one request
+    serves both status checks and trailer extraction.
+
+    Responses are cached per (host, change number) for a short time; see
+    clear_change_detail_cache().
+    """
+    key = (host, change_number)
+    now = time.monotonic()
+    cached = _change_detail_cache.get(key)
+    if cached is not None and cached[0] > now:
+        log.debug("Using cached detail for Gerrit change %s", change_number)
+        return cached[1]
+
+    client = _gerrit_client(host)
+    change_data = client.get(f"/changes/{change_number}/detail")
+
+    ttl = _CHANGE_DETAIL_TTL
+    if isinstance(change_data, dict) and change_data.get("status") == "MERGED":
+        ttl = _MERGED_CHANGE_DETAIL_TTL
+    _change_detail_cache[key] = (now + ttl, change_data)
+    return change_data
 
 
-def extract_pr_url_from_commit(commit_sha: str) -> str | None:
+def clear_change_detail_cache() -> None:
+    """Clear the cached Gerrit change detail responses."""
+    _change_detail_cache.clear()
+
+
+def _parse_status(
+    change_data: Any, change_number: str
+) -> Literal["MERGED", "ABANDONED", "NEW", "UNKNOWN"]:
+    """Read the change status from Gerrit change data."""
+    status = change_data.get("status", "UNKNOWN")
+    log.debug("Gerrit change %s status: %s", change_number, status)
+
+    if status in _ALLOWED_STATUSES:
+        return cast(Literal["MERGED", "ABANDONED", "NEW", "UNKNOWN"], status)
+    log.warning(
+        "Unexpected Gerrit status '%s' for change %s, treating as UNKNOWN",
+        status,
+        change_number,
+    )
+    return "UNKNOWN"
+
+
+def _pr_url_from_message(commit_message: str) -> str | None:
+    """Return the last GitHub-PR trailer value of a commit message.
+
+    extract_github_metadata() memoizes its trailer parse per message, so
+    a message seen again in the same batch (e.g. when both the local
+    commit and its Gerrit change are inspected) is not parsed twice.
+    """
+    return extract_github_metadata(commit_message).get(GITHUB_PR_TRAILER)
+
+
+def _parse_pr_url(change_data: Any, change_number: str) -> str | None:
+    """Read the GitHub-PR trailer from Gerrit change detail data."""
+    # Get the current revision (latest patchset)
+    current_revision = change_data.get("current_revision")
+    if not current_revision:
+        log.debug("No current revision found for change %s", change_number)
+        return None
+
+    revisions = change_data.get("revisions", {})
+    revision_data = revisions.get(current_revision, {})
+    commit_data = revision_data.get("commit", {})
+    commit_message = commit_data.get("message", "")
+
+    if not commit_message:
+        log.debug("No commit message found for change %s", change_number)
+        return None
+
+    pr_url = _pr_url_from_message(commit_message)
+    if pr_url:
+        log.debug("Found GitHub-PR trailer in Gerrit change: %s", pr_url)
+        return pr_url
+
+    log.debug(
+        "No GitHub-PR trailer found in Gerrit change %s",
+        change_number,
+    )
+    return None
+
+
+def extract_pr_url_from_commit(
+    commit_sha: str, commit_message: str | None = None
+) -> str | None:
     """
     Extract GitHub PR URL from a commit's trailers.
 
     Args:
         commit_sha: Git commit SHA to inspect
+        commit_message: Commit message, if already known (skips git show)
 
     Returns:
         GitHub PR URL if found, None otherwise
     """
     try:
-        commit_message = git_show(commit_sha, fmt="%B")
-
-        trailers = parse_trailers(commit_message)
+        if commit_message is None:
+            commit_message = git_show(commit_sha, fmt="%B")
 
         # Look for GitHub-PR trailer
-        pr_urls = trailers.get(GITHUB_PR_TRAILER, [])
-        if pr_urls:
-            pr_url = pr_urls[-1]  # Take the last one if multiple exist
+        pr_url = _pr_url_from_message(commit_message)
+        if pr_url:
             log.debug("Found GitHub-PR trailer: %s", pr_url)
             return pr_url
         else:
@@ -209,30 +434,49 @@ def extract_pr_url_from_commit(commit_sha: str) -> str | None:
         return None
 
 
+@lru_cache(maxsize=8)
+def _server_url_host(server_url: str) -> str:
+    """Return the lowercase host of a server URL ("" if unparsable)."""
+    try:
+        return (urlparse(server_url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def _is_github_host(host: str) -> bool:
+    """Check whether a host is github.com or the configured GHE server."""
+    host = host.lower()
+    if f".{host}".endswith(_GITHUB_HOST_SUFFIXES):
+        return True
+    server_url = os.getenv("GITHUB_SERVER_URL", "")
+    return bool(server_url) and host == _server_url_host(server_url)
+
+
 def parse_pr_url(pr_url: str) -> tuple[str, str, int] | None:
     """
     Parse a GitHub PR URL to extract owner, repo, and PR number.
 
+    Only github.com (and its subdomains) or the GitHub Enterprise server
+    named by GITHUB_SERVER_URL are accepted as hosts.
+
     Args:
         pr_url: GitHub PR URL (e.g., https://github.com/owner/repo/pull/123)
 
     Returns:
         Tuple of (owner, repo, pr_number) if valid, None otherwise
     """
+    # Cheap substring check before running the regex
+    if "/pull/" not in pr_url:
+        log.debug("Failed to parse PR URL: %s", pr_url)
+        return None
+
     # Use shared pattern from constants module (supports GHE)
-    match = re.match(GITHUB_PR_URL_PATTERN, pr_url)
+    match = _GITHUB_PR_RE.match(pr_url)
 
     if match:
         host = match.group(1)  # GitHub host (github.com or GHE domain)
 
-        # Exclude known non-GitHub hosts
-        bad_hosts = {
-            "gitlab.com",
-            "www.gitlab.com",
-            "bitbucket.org",
-            "www.bitbucket.org",
-        }
-        if host in bad_hosts:
+        if not _is_github_host(host):
             log.debug("Rejected non-GitHub host: %s", host)
             return None
 
@@ -269,55 +513,92 @@ def extract_pr_url_from_gerrit_change(gerrit_change_url: str) -> str | None:
     host, change_number = parsed
 
     try:
-        client = build_client_for_host(host)
+        change_data = _fetch_change_detail(host, change_number)
+        pr_url = _parse_pr_url(change_data, change_number)
+    except GerritRestError as exc:
+        _warn_gerrit_query_failure(
+            "Failed to query Gerrit change %s: %s", change_number, exc
+        )
+        return None
+    except Exception as exc:
+        _warn_gerrit_query_failure(
+            "Unexpected error querying Gerrit change %s: %s", change_number, exc
+        )
+        return None
+    else:
+        return pr_url
 
-        # Query change details including commit message
-        # Gerrit REST API endpoint: GET /changes/{change-id}/detail
-        change_data = client.get(f"/changes/{change_number}/detail")
 
-        # Get the current revision (latest patchset)
-        current_revision = change_data.get("current_revision")
-        if not current_revision:
-            log.debug("No current revision found for change %s", change_number)
-            return None
+def fetch_change_status_and_pr_url(
+    gerrit_change_url: str,
+) -> tuple[Literal["MERGED", "ABANDONED", "NEW", "UNKNOWN"], str | None]:
+    """
+    Get a Gerrit change's status and GitHub PR URL with a single REST call.
 
-        revisions = change_data.get("revisions", {})
-        revision_data = revisions.get(current_revision, {})
-        commit_data = revision_data.get("commit", {})
-        commit_message = commit_data.get("message", "")
+    Equivalent to calling check_gerrit_change_status() and
+    extract_pr_url_from_gerrit_change(), but both values are read from one
+    /detail response instead of two separate requests.
 
-        if not commit_message:
-            log.debug("No commit message found for change %s", change_number)
-            return None
+    Args:
+        gerrit_change_url: Full Gerrit change URL
 
-        trailers = parse_trailers(commit_message)
-        pr_urls = trailers.get(GITHUB_PR_TRAILER, [])
+    Returns:
+        Tuple of (status, pr_url); status is "UNKNOWN" and pr_url is None
+        when the change cannot be queried
+    """
+    parsed = extract_change_number_from_url(gerrit_change_url)
+    if not parsed:
+        log.warning(
+            "Cannot extract change number from URL: %s",
+            gerrit_change_url,
+        )
+        return "UNKNOWN", None
 
-        if pr_urls:
-            pr_url = pr_urls[-1]  # Take the last one if multiple exist
-            log.debug("Found GitHub-PR trailer in Gerrit change: %s", pr_url)
-            return pr_url
+    host, change_number = parsed
+
+    try:
+        change_data = _fetch_change_detail(host, change_number)
+        status = _parse_status(change_data, change_number)
+        pr_url = _parse_pr_url(change_data, change_number)
     except GerritRestError as exc:
-        log.warning(
-            "Failed to query Gerrit change %s: %s",
-            change_number,
-            exc,
+        _warn_gerrit_query_failure(
+            "Failed to query Gerrit change %s: %s", change_number, exc
         )
-        return None
+        return "UNKNOWN", None
     except Exception as exc:
-        log.warning(
-            "Unexpected error querying Gerrit change %s: %s",
-            change_number,
-            exc,
+        _warn_gerrit_query_failure(
+            "Unexpected error querying Gerrit change %s: %s", change_number, exc
         )
-        return None
+        return "UNKNOWN", None
     else:
-        # No PR URL found in trailers
-        log.debug(
-            "No GitHub-PR trailer found in Gerrit change %s",
-            change_number,
-        )
-        return None
+        return status, pr_url
+
+
+@dataclass(frozen=True, slots=True)
+class PRInfo:
+    """PR details shown in the closure table."""
+
+    repository: str
+    pr_number: int
+    title: str
+    author: str
+    base_branch: str
+    sha: str
+    url: str
+    files_changed: int | str
+
+    def items(self) -> list[tuple[str, Any]]:
+        """Return (label, value) rows in display order."""
+        return [
+            ("Repository", self.repository),
+            ("PR Number", self.pr_number),
+            ("Title", self.title),
+            ("Author", self.author),
+            ("Base Branch", self.base_branch),
+            ("SHA", self.sha),
+            ("URL", self.url),
+            ("Files Changed", self.files_changed),
+        ]
 
 
 def extract_pr_info_for_display(
@@ -325,7 +606,7 @@ def extract_pr_info_for_display(
     owner: str,
     repo: str,
     pr_number: int,
-) -> dict[str, Any]:
+) -> PRInfo:
     """
     Extract PR information for display in a formatted table.
 
@@ -336,42 +617,50 @@ def extract_pr_info_for_display(
         pr_number: PR number
 
     Returns:
-        Dictionary of PR information for display
+        PRInfo record for display
     """
     try:
-        title = getattr(pr_obj, "title", "No title")
+        # Direct attribute access; a missing attribute (or a None parent
+        # such as a deleted user) raises AttributeError and takes the default
+        try:
+            title = pr_obj.title or "No title"
+        except AttributeError:
+            title = "No title"
 
-        author = "Unknown"
-        user = getattr(pr_obj, "user", None)
-        if user:
-            author = getattr(user, "login", "Unknown") or "Unknown"
-
-        base_branch = "unknown"
-        base = getattr(pr_obj, "base", None)
-        if base:
-            base_branch = getattr(base, "ref", "unknown") or "unknown"
-
-        sha = "unknown"
-        head = getattr(pr_obj, "head", None)
-        if head:
-            sha = getattr(head, "sha", "unknown") or "unknown"
-
-        pr_info = {
-            "Repository": f"{owner}/{repo}",
-            "PR Number": pr_number,
-            "Title": title or "No title",
-            "Author": author,
-            "Base Branch": base_branch,
-            "SHA": sha,
-            "URL": f"https://github.com/{owner}/{repo}/pull/{pr_number}",
-        }
-
-        # Add file changes count if available
         try:
-            files = list(getattr(pr_obj, "get_files", list)())
-            pr_info["Files Changed"] = len(files)
+            author = pr_obj.user.login or "Unknown"
+        except AttributeError:
+            author = "Unknown"
+
+        try:
+            base_branch = pr_obj.base.ref or "unknown"
+        except AttributeError:
+            base_branch = "unknown"
+
+        try:
+            sha = pr_obj.head.sha or "unknown"
+        except AttributeError:
+            sha = "unknown"
+
+        # Add file changes count if available; changed_files is part of the
+        # PR payload, so no extra (paginated) files request is needed
+        try:
+            changed_files = getattr(pr_obj, "changed_files", None)
         except Exception:
-            pr_info["Files Changed"] = "unknown"
+            changed_files = None
+
+        pr_info = PRInfo(
+            repository=f"{owner}/{repo}",
+            pr_number=pr_number,
+            title=title,
+            author=author,
+            base_branch=base_branch,
+            sha=sha,
+            url=f"https://github.com/{owner}/{repo}/pull/{pr_number}",
+            files_changed=(
+                changed_files if isinstance(changed_files, int) else "unknown"
+            ),
+        )
 
     except Exception as exc:
         log.debug("Failed to extract PR info for display: %s", exc)
@@ -385,6 +674,61 @@ def extract_pr_info_for_display(
         return pr_info
 
 
+# HTTP status -> error kind for GitHub API failures
+_GITHUB_ERROR_KINDS: dict[
+    int, Literal["auth", "not_found", "rate_limit", "other"]
+] = {
+    401: "auth",
+    403: "auth",
+    404: "not_found",
+    429: "rate_limit",
+}
+
+# Error message markers for exceptions without a structured status, matched
+# in one pass over the lowercased message. Status codes must stand alone so
+# that numbers such as "4290 ms" or "/pulls/1403" are not taken for them.
+_GITHUB_ERROR_TEXT_RE = re.compile(
+    r"\b(?:401|403|404|429)\b|not found|rate limit"
+)
+_GITHUB_ERROR_TEXT_KINDS: dict[
+    str, Literal["auth", "not_found", "rate_limit", "other"]
+] = {
+    "401": "auth",
+    "403": "auth",
+    "404": "not_found",
+    "not found": "not_found",
+    "429": "rate_limit",
+    "rate limit": "rate_limit",
+}
+
+
+def _github_error_kind(
+    exc: Exception,
+) -> Literal["auth", "not_found", "rate_limit", "other"]:
+    """Classify a GitHub API error for logging.
+
+    Uses the structured PyGithub exception type and HTTP status when
+    available, falling back to the message text for other exceptions.
+    """
+    if type(exc).__name__ == "RateLimitExceededException" or isinstance(
+        exc, RateLimitExceededExceptionType
+    ):
+        return "rate_limit"
+
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        return _GITHUB_ERROR_KINDS.get(status, "other")
+
+    kinds = {
+        _GITHUB_ERROR_TEXT_KINDS[marker]
+        for marker in _GITHUB_ERROR_TEXT_RE.findall(str(exc).lower())
+    }
+    for kind in ("auth", "not_found", "rate_limit"):
+        if kind in kinds:
+            return kind
+    return "other"
+
+
 def close_pr_with_status(
     pr_url: str,
     gerrit_change_url: str | None,
@@ -420,8 +764,21 @@ def close_pr_with_status(
     owner, repo, pr_number = parsed
     log.debug("Found GitHub PR: %s/%s#%d", owner, repo, pr_number)
 
+    # Determine action based on Gerrit status and close_merged_prs setting.
+    # Abandoned changes are always reported on the PR; other statuses only
+    # close it when close_merged_prs is set, so skip GitHub entirely when
+    # there is nothing to do.
+    should_close = close_merged_prs
+    if gerrit_status != "ABANDONED" and not close_merged_prs:
+        # For MERGED, NEW, or UNKNOWN status, don't close either
+        log.info(
+            "Skipping PR closure (CLOSE_MERGED_PRS=false) for status: %s",
+            gerrit_status,
+        )
+        return False
+
     try:
-        client = build_client()
+        client = _github_client()
 
         # Get the specific repository (not from env, might be different)
         repo_obj = client.get_repo(f"{owner}/{repo}")
@@ -430,7 +787,7 @@ def close_pr_with_status(
             pr_obj = get_pull(repo_obj, pr_number)
         except Exception as exc:
             # PR not found or API error - log as info, not error
-            if "404" in str(exc) or "Not Found" in str(exc):
+            if _github_error_kind(exc) == "not_found":
                 log.info(
                     "GitHub PR #%d not found in %s/%s - may have been deleted",
                     pr_number,
@@ -456,38 +813,10 @@ def close_pr_with_status(
             return False
 
         pr_info = extract_pr_info_for_display(pr_obj, owner, repo, pr_number)
-        display_pr_info(
-            pr_info, context="Abandoned", progress_tracker=progress_tracker
-        )
-
-        # Determine action based on Gerrit status and close_merged_prs setting
-        should_close = False
-        comment = ""
-
-        if gerrit_status == "ABANDONED":
-            if close_merged_prs:
-                # Close PR with abandoned comment
-                should_close = True
-                comment = _build_abandoned_comment(gerrit_change_url)
-            else:
-                # Comment only, don't close
-                should_close = False
-                comment = _build_abandoned_notification_comment(
-                    gerrit_change_url
-                )
-        else:
-            # For MERGED, NEW, or UNKNOWN status with close_merged_prs=True
-            if close_merged_prs:
-                should_close = True
-                comment = _build_closure_comment(gerrit_change_url)
-            else:
-                # close_merged_prs=False, don't close for merged either
-                log.info(
-                    "Skipping PR closure (CLOSE_MERGED_PRS=false) for "
-                    "status: %s",
-                    gerrit_status,
-                )
-                return False
+        with _DISPLAY_LOCK:
+            display_pr_info(
+                pr_info, context="Abandoned", progress_tracker=progress_tracker
+            )
 
         if dry_run:
             if should_close:
@@ -498,6 +827,17 @@ def close_pr_with_status(
                 )
             return True
 
+        # Comment text is only needed when actually posting
+        if gerrit_status != "ABANDONED":
+            # For MERGED, NEW, or UNKNOWN status with close_merged_prs=True
+            comment = _build_closure_comment(gerrit_change_url)
+        elif should_close:
+            # Close PR with abandoned comment
+            comment = _build_abandoned_comment(gerrit_change_url)
+        else:
+            # Comment only, don't close
+            comment = _build_abandoned_notification_comment(gerrit_change_url)
+
         # Add comment and optionally close the PR
         if should_close:
             log.debug("Closing GitHub PR #%d...", pr_number)
@@ -506,9 +846,11 @@ def close_pr_with_status(
 
             gerrit_change_number = "unknown"
             if gerrit_change_url:
-                match = re.search(r"/c/[^/]+/\+/(\d+)", gerrit_change_url)
-                if match:
-                    gerrit_change_number = match.group(1)
+                parsed_change = extract_change_number_from_url(
+                    gerrit_change_url
+                )
+                if parsed_change:
+                    gerrit_change_number = parsed_change[1]
 
             # Console and log output for closed PR
             close_message = (
@@ -540,21 +882,22 @@ def close_pr_with_status(
         # Common cases: network issues, auth failures, API rate limits
         error_type = type(exc).__name__
         error_details = str(exc)
+        error_kind = _github_error_kind(exc)
 
-        if "401" in error_details or "403" in error_details:
+        if error_kind == "auth":
             log.exception(
                 "Authentication/authorization error while closing PR #%d: "
                 "%s - check GitHub token permissions",
                 pr_number,
                 error_details,
             )
-        elif "404" in error_details:
+        elif error_kind == "not_found":
             log.warning(
                 "PR #%d not found or repository inaccessible: %s",
                 pr_number,
                 error_details,
             )
-        elif "rate limit" in error_details.lower():
+        elif error_kind == "rate_limit":
             log.exception(
                 "GitHub API rate limit exceeded while processing PR #%d: %s",
                 pr_number,
@@ -577,6 +920,7 @@ def close_github_pr_for_merged_gerrit_change(
     commit_sha: str,
     gerrit_change_url: str | None = None,
     *,
+    commit_message: str | None = None,
     dry_run: bool = False,
     progress_tracker: Any = None,
     close_merged_prs: bool = True,
@@ -593,6 +937,7 @@ def close_github_pr_for_merged_gerrit_change(
     Args:
         commit_sha: Git commit SHA that was merged in Gerrit
         gerrit_change_url: Optional Gerrit change URL for the comment
+        commit_message: Commit message, if already known (skips git show)
         dry_run: If True, only display info without closing the PR
         progress_tracker: Optional progress tracker for display management
         close_merged_prs: If True, close PRs; if False, only comment on
@@ -601,7 +946,9 @@ def close_github_pr_for_merged_gerrit_change(
     Returns:
         True if PR was closed (or would be closed in dry-run), False otherwise
     """
-    log.info("Processing Gerrit change: %s", commit_sha[:8])
+    # Per-step details are logged at debug level; a single info line per
+    # commit reports the outcome
+    log.debug("Processing Gerrit change: %s", commit_sha[:8])
 
     gerrit_status: Literal["MERGED", "ABANDONED", "NEW", "UNKNOWN"] = "UNKNOWN"
     if gerrit_change_url:
@@ -613,12 +960,12 @@ def close_github_pr_for_merged_gerrit_change(
         # aislop-ignore-next-line python-repetitive-dispatch
         if gerrit_status == "ABANDONED":
             if close_merged_prs:
-                log.info(
+                log.debug(
                     "Gerrit change was ABANDONED; will close PR with "
                     "abandoned comment (CLOSE_MERGED_PRS=true)"
                 )
             else:
-                log.info(
+                log.debug(
                     "Gerrit change was ABANDONED; will comment on PR only "
                     "(CLOSE_MERGED_PRS=false)"
                 )
@@ -634,7 +981,7 @@ def close_github_pr_for_merged_gerrit_change(
         elif gerrit_status == "MERGED":
             log.debug("Gerrit change confirmed as MERGED")
 
-    pr_url = extract_pr_url_from_commit(commit_sha)
+    pr_url = extract_pr_url_from_commit(commit_sha, commit_message)
     if not pr_url:
         log.info(
             "No GitHub PR URL found in commit %s - skipping",
@@ -643,7 +990,7 @@ def close_github_pr_for_merged_gerrit_change(
         return False
 
     # Delegate to helper function for the actual closing logic
-    return close_pr_with_status(
+    closed = close_pr_with_status(
         pr_url=pr_url,
         gerrit_change_url=gerrit_change_url,
         gerrit_status=gerrit_status,
@@ -651,6 +998,57 @@ def close_github_pr_for_merged_gerrit_change(
         progress_tracker=progress_tracker,
         close_merged_prs=close_merged_prs,
     )
+    log.info("Commit %s -> %s: closed=%s", commit_sha[:8], pr_url, closed)
+    return closed
+
+
+# Fixed parts of the PR comments; only the optional Gerrit change URL line
+# varies between calls
+_CLOSURE_COMMENT_HEAD = (
+    "**Automated PR Closure**\n"
+    "\n"
+    "This pull request has been automatically closed by GitHub2Gerrit.\n"
+    "\n"
+)
+_CLOSURE_COMMENT_FOOTER = (
+    "---\n*This is an automated action performed by the GitHub2Gerrit tool.*"
+)
+_MERGED_COMMENT_STATUS = (
+    "The corresponding Gerrit change has been accepted and merged ✅\n\n"
+)
+_MERGED_COMMENT_TAIL = (
+    "The changes from this PR are now part of the main codebase in Gerrit.\n"
+    "\n" + _CLOSURE_COMMENT_FOOTER
+)
+_ABANDONED_COMMENT_STATUS = (
+    "The corresponding Gerrit change has been abandoned and rejected ⛔️\n\n"
+)
+_ABANDONED_COMMENT_TAIL = (
+    "The changes from this PR are NOT part of the main codebase in Gerrit.\n"
+    "\n" + _CLOSURE_COMMENT_FOOTER
+)
+_ABANDONED_NOTIFICATION_HEAD = (
+    "**Gerrit Change Abandoned** 🏳️\n"
+    "\n"
+    "The corresponding Gerrit change has been **abandoned**.\n"
+    "\n"
+)
+_ABANDONED_NOTIFICATION_TAIL = (
+    "This pull request remains open because `CLOSE_MERGED_PRS` is disabled.\n"
+    "\n"
+    "---\n"
+    "*This is an automated notification from the GitHub2Gerrit tool.*"
+)
+
+# Complete comment bodies are pre-joined: the "no URL" variant is returned
+# as is and the URL variant is the prefix + URL line + tail
+_CLOSURE_COMMENT_PREFIX = _CLOSURE_COMMENT_HEAD + _MERGED_COMMENT_STATUS
+_CLOSURE_COMMENT_NO_URL = _CLOSURE_COMMENT_PREFIX + _MERGED_COMMENT_TAIL
+_ABANDONED_COMMENT_PREFIX = _CLOSURE_COMMENT_HEAD + _ABANDONED_COMMENT_STATUS
+_ABANDONED_COMMENT_NO_URL = _ABANDONED_COMMENT_PREFIX + _ABANDONED_COMMENT_TAIL
+_ABANDONED_NOTIFICATION_NO_URL = (
+    _ABANDONED_NOTIFICATION_HEAD + _ABANDONED_NOTIFICATION_TAIL
+)
 
 
 def _build_closure_comment(gerrit_change_url: str | None = None) -> str:
@@ -663,53 +1061,13 @@ def _build_closure_comment(gerrit_change_url: str | None = None) -> str:
     Returns:
         Comment text
     """
-    comment_lines = [
-        "**Automated PR Closure**",
-        "",
-        "This pull request has been automatically closed by GitHub2Gerrit.",
-        "",
-    ]
-
-    if gerrit_change_url:
-        comment_lines.extend(
-            [
-                (
-                    "The corresponding Gerrit change has been accepted "
-                    "and merged ✅"
-                ),
-                "",
-                f"Gerrit change URL: {gerrit_change_url}",
-                "",
-            ]
-        )
-    else:
-        comment_lines.extend(
-            [
-                (
-                    "The corresponding Gerrit change has been accepted "
-                    "and merged ✅"
-                ),
-                "",
-            ]
-        )
-
-    comment_lines.extend(
-        [
-            (
-                "The changes from this PR are now part of the main codebase "
-                "in Gerrit."
-            ),
-            "",
-            "---",
-            (
-                "*This is an automated action performed by the "
-                "GitHub2Gerrit tool.*"
-            ),
-        ]
+    if not gerrit_change_url:
+        return _CLOSURE_COMMENT_NO_URL
+    return (
+        f"{_CLOSURE_COMMENT_PREFIX}Gerrit change URL: {gerrit_change_url}"
+        f"\n\n{_MERGED_COMMENT_TAIL}"
     )
 
-    return "\n".join(comment_lines)
-
 
 def _build_abandoned_comment(gerrit_change_url: str | None = None) -> str:
     """
@@ -722,53 +1080,13 @@ def _build_abandoned_comment(gerrit_change_url: str | None = None) -> str:
     Returns:
         Comment text
     """
-    comment_lines = [
-        "**Automated PR Closure**",
-        "",
-        "This pull request has been automatically closed by GitHub2Gerrit.",
-        "",
-    ]
-
-    if gerrit_change_url:
-        comment_lines.extend(
-            [
-                (
-                    "The corresponding Gerrit change has been abandoned "
-                    "and rejected ⛔️"
-                ),
-                "",
-                f"Gerrit change URL: {gerrit_change_url}",
-                "",
-            ]
-        )
-    else:
-        comment_lines.extend(
-            [
-                (
-                    "The corresponding Gerrit change has been abandoned "
-                    "and rejected ⛔️"
-                ),
-                "",
-            ]
-        )
-
-    comment_lines.extend(
-        [
-            (
-                "The changes from this PR are NOT part of the main codebase "
-                "in Gerrit."
-            ),
-            "",
-            "---",
-            (
-                "*This is an automated action performed by the "
-                "GitHub2Gerrit tool.*"
-            ),
-        ]
+    if not gerrit_change_url:
+        return _ABANDONED_COMMENT_NO_URL
+    return (
+        f"{_ABANDONED_COMMENT_PREFIX}Gerrit change URL: {gerrit_change_url}"
+        f"\n\n{_ABANDONED_COMMENT_TAIL}"
     )
 
-    return "\n".join(comment_lines)
-
 
 def _build_abandoned_notification_comment(
     gerrit_change_url: str | None = None,
@@ -783,39 +1101,15 @@ def _build_abandoned_notification_comment(
     Returns:
         Comment text
     """
-    comment_lines = [
-        "**Gerrit Change Abandoned** 🏳️",
-        "",
-        "The corresponding Gerrit change has been **abandoned**.",
-        "",
-    ]
-
-    if gerrit_change_url:
-        comment_lines.extend(
-            [
-                f"Gerrit change URL: {gerrit_change_url}",
-                "",
-            ]
-        )
-
-    comment_lines.extend(
-        [
-            (
-                "This pull request remains open because `CLOSE_MERGED_PRS` "
-                "is disabled."
-            ),
-            "",
-            "---",
-            (
-                "*This is an automated notification from the "
-                "GitHub2Gerrit tool.*"
-            ),
-        ]
+    if not gerrit_change_url:
+        return _ABANDONED_NOTIFICATION_NO_URL
+    return (
+        f"{_ABANDONED_NOTIFICATION_HEAD}Gerrit change URL: {gerrit_change_url}"
+        f"\n\n{_ABANDONED_NOTIFICATION_TAIL}"
     )
 
-    return "\n".join(comment_lines)
-
 
+@_gerrit_warning_batch()
 def process_recent_commits_for_pr_closure(
     commit_shas: list[str],
     *,
@@ -827,6 +1121,9 @@ def process_recent_commits_for_pr_closure(
     Process a list of recent commits and close any associated GitHub PRs.
 
     This is useful when multiple commits have been pushed from Gerrit.
+    Commits are independent, so they are processed concurrently by a small
+    thread pool of at most _PR_CLOSURE_MAX_WORKERS threads, which keeps
+    memory use flat for batches of hundreds of commits.
 
     Args:
         commit_shas: List of commit SHAs to process
@@ -844,17 +1141,63 @@ def process_recent_commits_for_pr_closure(
 
     log.info("Processing %d commit(s) for PR closure", len(commit_shas))
 
+    # Drop repeated SHAs, keeping the original order
+    unique_shas = list(dict.fromkeys(commit_shas))
+    if len(unique_shas) < len(commit_shas):
+        log.debug(
+            "Ignoring %d duplicate commit SHA(s)",
+            len(commit_shas) - len(unique_shas),
+        )
+
+    # Read all commit messages with one git invocation; commits missing
+    # from the result fall back to a per-commit git show
+    try:
+        messages = git_show_many(unique_shas)
+    except Exception as exc:
+        log.debug("Batch commit message lookup failed: %s", exc)
+        messages = {}
+
+    # Handle each GitHub PR once, even when several commits reference it
+    seen_pr_urls: set[str] = set()
+    shas_to_process: list[str] = []
+    for commit_sha in unique_shas:
+        message = messages.get(commit_sha)
+        if message is not None:
+            pr_url = extract_pr_url_from_commit(commit_sha, message)
+            if pr_url in seen_pr_urls:
+                log.info(
+                    "Commit %s references already handled PR %s - skipping",
+                    commit_sha[:8],
+                    pr_url,
+                )
+                continue
+            if pr_url:
+                seen_pr_urls.add(pr_url)
+        shas_to_process.append(commit_sha)
+
+    if not shas_to_process:
+        log.info("Closed 0 GitHub PR(s)")
+        return 0
+
     closed_count = 0
-    for commit_sha in commit_shas:
+    max_workers = min(_PR_CLOSURE_MAX_WORKERS, len(shas_to_process))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                close_github_pr_for_merged_gerrit_change,
+                commit_sha,
+                commit_message=messages.get(commit_sha),
+                dry_run=dry_run,
+                progress_tracker=progress_tracker,
+                close_merged_prs=close_merged_prs,
+            )
+            for commit_sha in shas_to_process
+        ]
         # The close function already handles errors gracefully and returns
         # False. No need for try/except here as it won't raise exceptions
-        if close_github_pr_for_merged_gerrit_change(
-            commit_sha,
-            dry_run=dry_run,
-            progress_tracker=progress_tracker,
-            close_merged_prs=close_merged_prs,
-        ):
-            closed_count += 1
+        for future in as_completed(futures):
+            if future.result():
+                closed_count += 1
 
     log.info("Closed %d GitHub PR(s)", closed_count)
     return closed_count
@@ -891,7 +1234,7 @@ def cleanup_abandoned_prs_single(
     safe_console_print("⛔️ Checking for abandoned Gerrit changes")
     log.debug("Checking Gerrit change: %s", gerrit_change_url)
 
-    status = check_gerrit_change_status(gerrit_change_url)
+    status, pr_url = fetch_change_status_and_pr_url(gerrit_change_url)
 
     if status != "ABANDONED":
         log.debug(
@@ -902,7 +1245,6 @@ def cleanup_abandoned_prs_single(
 
     log.info("Gerrit change is ABANDONED, looking for GitHub PR to close")
 
-    pr_url = extract_pr_url_from_gerrit_change(gerrit_change_url)
     if not pr_url:
         log.info(
             "No GitHub PR URL found in Gerrit change %s - skipping",
@@ -921,6 +1263,7 @@ def cleanup_abandoned_prs_single(
     )
 
 
+@_gerrit_warning_batch()
 def cleanup_abandoned_prs_bulk(
     owner: str,
     repo: str,
@@ -959,7 +1302,7 @@ def cleanup_abandoned_prs_bulk(
     )
 
     try:
-        client = build_client()
+        client = _github_client()
         repo_obj = client.get_repo(f"{owner}/{repo}")
 
         open_prs = list(iter_open_pulls(repo_obj))
@@ -984,7 +1327,7 @@ def cleanup_abandoned_prs_bulk(
                 for comment in comments:
                     body = getattr(comment, "body", "") or ""
                     # Look for Gerrit change URL pattern in comment
-                    match = re.search(GERRIT_CHANGE_URL_PATTERN, body)
+                    match = _GERRIT_CHANGE_RE.search(body)
                     if match:
                         gerrit_change_url = match.group(0)
                         log.debug(
@@ -1084,7 +1427,7 @@ def abandon_gerrit_change_for_closed_pr(
     )
 
     try:
-        gerrit_client = build_client_for_host(gerrit_server)
+        gerrit_client = _gerrit_client(gerrit_server)
 
         pr_url = f"https://github.com/{repository}/pull/{pr_number}"
 
@@ -1159,7 +1502,7 @@ def abandon_gerrit_change_for_closed_pr(
         )
 
         try:
-            client = build_client()
+            client = _github_client()
             repo_obj = client.get_repo(repository)
             pr_obj = get_pull(repo_obj, pr_number)
 
@@ -1404,17 +1747,14 @@ def cleanup_closed_github_prs(
                     )
                     continue
 
-                trailers = parse_trailers(commit_message)
-                pr_urls = trailers.get(GITHUB_PR_TRAILER, [])
-
-                if not pr_urls:
+                pr_url = _pr_url_from_message(commit_message)
+                if not pr_url:
                     log.debug(
                         "No GitHub-PR trailer in change %s - skipping",
                         change_number,
                     )
                     continue
 
-                pr_url = pr_urls[-1]  # Take the last one if multiple
                 log.debug(
                     "Found GitHub PR URL in change %s: %s",
                     change_number,
@@ -1433,7 +1773,7 @@ def cleanup_closed_github_prs(
                 owner, repo, pr_number = parsed
 
                 try:
-                    client = build_client()
+                    client = _github_client()
                     repo_obj = client.get_repo(f"{owner}/{repo}")
                     pr_obj = get_pull(repo_obj, pr_number)
 
@@ -1551,7 +1891,7 @@ def _build_gerrit_abandon_message(pr_obj: Any, pr_url: str) -> str:
         for comment in comments:
             body = getattr(comment, "body", "") or ""
             if "Superseded by" in body:
-                match = re.search(r"Superseded by #(\d+)", body)
+                match = _SUPERSEDED_BY_RE.search(body)
                 if match:
                     new_pr_number = match.group(1)
                     return (
@@ -38,6 +38,7 @@ __all__ = [
     "git_config_get_all",
     "git_last_commit_trailers",
     "git_show",
+    "git_show_many",
     "mask_text",
     "run_cmd",
     "run_cmd_with_retries",
@@ -710,6 +711,60 @@ def git_show(
         return res.stdout
 
 
+def git_show_many(
+    shas: Sequence[str],
+    *,
+    cwd: Path | None = None,
+) -> dict[str, str]:
+    """Return the commit messages of several commits in one git invocation.
+
+    Args:
+      shas: Commit SHAs (full or abbreviated).
+      cwd: Repository directory.
+
+    Returns:
+      Mapping of each requested SHA to its raw commit message (``%B``).
+    """
+    if not shas:
+        return {}
+    # Records are "<full sha>\0<message>\x1e"; --no-walk shows exactly the
+    # given commits without traversing their history.
+    args = ["log", "--no-walk=unsorted", "--format=%H%x00%B%x1e", *shas]
+    try:
+        res = git(args, cwd=cwd)
+    except CommandError as exc:
+        raise GitError(  # noqa: TRY003
+            f"git log for {len(shas)} commit(s) failed",
+            cmd=exc.cmd,
+            returncode=exc.returncode,
+            stdout=exc.stdout,
+            stderr=exc.stderr,
+        ) from exc
+
+    by_full_sha: dict[str, str] = {}
+    for record in res.stdout.split("\x1e"):
+        full_sha, sep, message = record.lstrip("\n").partition("\0")
+        if sep:
+            by_full_sha[full_sha] = message
+
+    messages: dict[str, str] = {}
+    for sha in shas:
+        found = by_full_sha.get(sha)
+        if found is None:
+            # Abbreviated SHA: match it against the full hashes
+            found = next(
+                (
+                    msg
+                    for full_sha, msg in by_full_sha.items()
+                    if full_sha.startswith(sha)
+                ),
+                None,
+            )
+        if found is not None:
+            messages[sha] = found
+    return messages
+
+
 def _parse_trailers(text: str) -> dict[str, list[str]]:
     """Parse trailers from a commit message footer only.
 
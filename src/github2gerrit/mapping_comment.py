@@ -9,6 +9,7 @@ local commits and Gerrit Change-IDs for reconciliation purposes.
 """
 
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
@@ -19,6 +20,16 @@ _MSG_INVALID_MODE = "Invalid mode"
 _MSG_NO_CHANGE_IDS = "At least one Change-ID is required"
 _MSG_INVALID_CHANGE_ID_FORMAT = "Invalid Change-ID format"
 
+# Fixed parts of a serialized mapping block
+_MAPPING_BLOCK_HEADER = "<!-- github2gerrit:change-id-map v1 -->\n"
+_MAPPING_BLOCK_FOOTER = (
+    "\n"
+    "_Note: This metadata is also included in the Gerrit commit message "
+    "for reconciliation._\n"
+    "\n"
+    "<!-- end github2gerrit:change-id-map -->"
+)
+
 
 @dataclass
 class ChangeIdMapping:
@@ -69,32 +80,46 @@ def serialize_mapping_comment(
     if not change_ids:
         raise ValueError(_MSG_NO_CHANGE_IDS)
 
-    lines = [
-        "<!-- github2gerrit:change-id-map v1 -->",
-        f"PR: {pr_url}",
-        f"Mode: {mode}",
-        f"Topic: {topic}",
-        "Change-Ids:",
-    ]
-
-    # Add indented Change-IDs
-    for cid in change_ids:
-        lines.append(f"  {cid}")
-
-    if digest:
-        lines.append(f"Digest: {digest}")
-
-    lines.extend(
-        [
-            f"GitHub-Hash: {github_hash}",
-            "",
-            "_Note: This metadata is also included in the Gerrit commit message for reconciliation._",  # noqa: E501
-            "",
-            "<!-- end github2gerrit:change-id-map -->",
-        ]
+    # Fixed schema: render the whole block in one f-string
+    change_id_lines = "\n".join(f"  {cid}" for cid in change_ids)
+    digest_line = f"Digest: {digest}\n" if digest else ""
+
+    return (
+        f"{_MAPPING_BLOCK_HEADER}"
+        f"PR: {pr_url}\n"
+        f"Mode: {mode}\n"
+        f"Topic: {topic}\n"
+        "Change-Ids:\n"
+        f"{change_id_lines}\n"
+        f"{digest_line}"
+        f"GitHub-Hash: {github_hash}\n"
+        f"{_MAPPING_BLOCK_FOOTER}"
     )
 
-    return "\n".join(lines)
+
+def serialize_mapping_comments(
+    mappings: Iterable[ChangeIdMapping],
+) -> list[str]:
+    """
+    Serialize several Change-ID mappings into structured PR comments.
+
+    Args:
+        mappings: Mappings to serialize (already validated on construction)
+
+    Returns:
+        Formatted comment bodies, in the same order as ``mappings``
+    """
+    return [
+        serialize_mapping_comment(
+            pr_url=mapping.pr_url,
+            mode=mapping.mode,
+            topic=mapping.topic,
+            change_ids=mapping.change_ids,
+            github_hash=mapping.github_hash,
+            digest=mapping.digest or None,
+        )
+        for mapping in mappings
+    ]
 
 
 def parse_mapping_comments(comment_bodies: list[str]) -> ChangeIdMapping | None:
@@ -115,17 +140,18 @@ def parse_mapping_comments(comment_bodies: list[str]) -> ChangeIdMapping | None:
     end_marker = "<!-- end github2gerrit:change-id-map -->"
 
     for body in comment_bodies:
-        if start_marker not in body or end_marker not in body:
+        # One forward scan per marker; the end marker is only searched for
+        # after the start marker.
+        start_idx = body.find(start_marker)
+        if start_idx == -1:
+            continue
+        block_start = start_idx + len(start_marker)
+        end_idx = body.find(end_marker, block_start)
+        if end_idx == -1:
             continue
 
         try:
-            start_idx = body.find(start_marker)
-            end_idx = body.find(end_marker)
-
-            if start_idx == -1 or end_idx == -1 or end_idx <= start_idx:
-                continue
-
-            block = body[start_idx + len(start_marker) : end_idx].strip()
+            block = body[block_start:end_idx].strip()
             mapping = _parse_mapping_block(block)
 
             if mapping:
@@ -160,8 +186,6 @@ def _parse_mapping_block(block: str) -> ChangeIdMapping | None:
     Returns:
         Parsed ChangeIdMapping or None if invalid
     """
-    lines = [line.strip() for line in block.split("\n")]
-
     pr_url = ""
     mode = ""
     topic = ""
@@ -171,7 +195,8 @@ def _parse_mapping_block(block: str) -> ChangeIdMapping | None:
 
     in_change_ids = False
 
-    for line in lines:
+    for raw_line in block.splitlines():
+        line = raw_line.strip()
         if not line:
             continue
 
@@ -302,13 +327,15 @@ def compute_mapping_digest(change_ids: list[str]) -> str:
         change_ids: Ordered list of Change-IDs
 
     Returns:
-        SHA-256 digest (first 12 hex chars) of the ordered Change-IDs
+        12 hex char BLAKE2b digest of the ordered Change-IDs
     """
     import hashlib
 
+    # A 6-byte BLAKE2b digest yields the 12 hex chars directly, without
+    # computing and truncating a full SHA-256 hex string.
     content = "\n".join(change_ids)
-    hash_obj = hashlib.sha256(content.encode("utf-8"))
-    return hash_obj.hexdigest()[:12]
+    hash_obj = hashlib.blake2b(content.encode("utf-8"), digest_size=6)
+    return hash_obj.hexdigest()
 
 
 def validate_mapping_consistency(
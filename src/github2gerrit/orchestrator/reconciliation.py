@@ -5,7 +5,8 @@ Phase 2: Reconciliation plan + orphan policy integration.
 
 Enhancements over Phase 1:
 - Introduces a first-class `ReconciliationPlan` data model
-- Computes deterministic digest (sha256 first 12 hex chars)
+- Computes a deterministic digest: `_compute_plan_digest` delegates to
+  `compute_mapping_digest` (6-byte BLAKE2b, 12 hex chars)
 - Applies a lightweight orphan policy (comment / abandon / ignore - stub)
 - Emits enriched JSON summary including digest
 - Maintains backward compatibility (still returns list[str] to caller)
@@ -43,6 +44,7 @@ from github2gerrit.gerrit_query import build_gerrit_topic
 from github2gerrit.gerrit_query import derive_project_github
 from github2gerrit.gerrit_query import query_changes_by_topic
 from github2gerrit.gitreview import GerritInfo
+from github2gerrit.mapping_comment import compute_mapping_digest
 from github2gerrit.mapping_comment import parse_mapping_comments
 from github2gerrit.mapping_comment import validate_mapping_consistency
 from github2gerrit.reconcile_matcher import LocalCommit
@@ -445,8 +447,7 @@ class OrphanActionLog:
 
 
 def _compute_plan_digest(change_ids: list[str]) -> str:
-    content = "\n".join(change_ids)
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    return compute_mapping_digest(change_ids)
 
 
 def _apply_orphan_policy(
@@ -32,14 +32,28 @@ Supported commands
     operation cannot locate an existing one.  This addresses the
     scenario where the original ``opened`` event failed and subsequent
     ``synchronize`` events cannot find a change to update.
+
+Performance notes
+─────────────────
+The hot path is a substring search for the mention followed by one
+compiled directive regex per hit, all in CPython's C-implemented
+``str`` and ``re`` code, over short comment bodies.  There are no
+numeric kernels here, so JIT compilers such as Numba or vectorised
+array code do not apply; speed-ups belong in the matcher (the
+directive pattern and phrase trie) and in caching its results.
 """
 
 from __future__ import annotations
 
 import logging
 import re
+import sys
+from collections.abc import Iterator
+from collections.abc import Mapping
 from dataclasses import dataclass
 from dataclasses import field
+from functools import lru_cache
+from typing import Any
 
 
 __all__ = [
@@ -60,20 +74,43 @@ log = logging.getLogger("github2gerrit.pr_commands")
 # ── Mention prefix ──────────────────────────────────────────────────
 # The canonical mention that triggers command parsing.
 MENTION_PREFIX = "@github2gerrit"
-
-# Compiled pattern: start of line (or after whitespace), the mention,
-# then at least one whitespace character followed by the command text.
-# We capture everything after the mention as the raw command string.
-_MENTION_RE = re.compile(
-    rf"(?:^|\s){re.escape(MENTION_PREFIX)}\s+(.+)",
-    re.IGNORECASE | re.MULTILINE,
+_MENTION_LOWER = MENTION_PREFIX.lower()
+_MENTION_LEN = len(MENTION_PREFIX)
+# Finds candidate mentions in C, skipping other @-mentions and e-mail
+# addresses without a Python-level loop. IGNORECASE also folds a few
+# non-ASCII letters (e.g. dotless i) onto ASCII, so candidates are
+# confirmed against ``_MENTION_LOWER``.
+_MENTION_RE = re.compile(re.escape(MENTION_PREFIX), re.IGNORECASE)
+
+# Directive pattern: the mention, then at least one whitespace character
+# followed by the command text. A directive starts at the beginning of a
+# line or after whitespace. Everything after the mention on that line is
+# the raw command string; the registered phrases, one named group each,
+# are spliced in by ``_command_matcher_for``. Text matching no phrase is
+# captured by the ``_UNKNOWN_GROUP`` branch. No group encloses another,
+# so ``lastgroup`` names the branch that matched.
+_UNKNOWN_GROUP = "unknown"
+_DIRECTIVE_TEMPLATE = (
+    rf"{re.escape(MENTION_PREFIX)}\s+"
+    rf"(?:(?:{{phrases}})[^\n]*|(?P<{_UNKNOWN_GROUP}>[^\n]+))"
 )
 
 
+def _canonical_name(name: str) -> str:
+    """Return the canonical (lower-case, stripped) form of a command name.
+
+    Names that are already canonical, such as ``CMD_CREATE_MISSING.name``,
+    are returned as is without allocating a copy.
+    """
+    if name.islower() and name == name.strip():
+        return name
+    return name.lower().strip()
+
+
 # ── Data models ─────────────────────────────────────────────────────
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CommandDefinition:
     """Definition of a recognised ``@github2gerrit`` command.
 
@@ -89,13 +126,23 @@ class CommandDefinition:
     aliases: tuple[str, ...] = ()
     description: str = ""
     hidden: bool = False
+    # Interned canonical name; matches share this one string object
+    _canonical: str = field(init=False, repr=False, compare=False)
+    # Name plus aliases, built once since the definition is immutable
+    _all_phrases: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_canonical", sys.intern(_canonical_name(self.name))
+        )
+        object.__setattr__(self, "_all_phrases", (self.name, *self.aliases))
 
     def all_phrases(self) -> tuple[str, ...]:
         """Return all phrases that match this command (canonical + aliases)."""
-        return (self.name, *self.aliases)
+        return self._all_phrases
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CommandMatch:
     """Result of matching a single command in a PR comment.
 
@@ -111,7 +158,7 @@ class CommandMatch:
     comment_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandParseResult:
     """Aggregated result from scanning all PR comments.
 
@@ -121,8 +168,15 @@ class CommandParseResult:
             did not match any registered command.
     """
 
-    matches: list[CommandMatch] = field(default_factory=list)
+    matches: tuple[CommandMatch, ...] = ()
     unrecognised: list[str] = field(default_factory=list)
+    # Canonical names in ``matches``, collected once for ``has()``
+    _matched_names: frozenset[str] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._matched_names = frozenset(m.command_name for m in self.matches)
 
     @property
     def has_matches(self) -> bool:
@@ -131,8 +185,7 @@ class CommandParseResult:
 
     def has(self, command_name: str) -> bool:
         """Check whether *command_name* appears in the matched commands."""
-        target = command_name.lower().strip()
-        return any(m.command_name == target for m in self.matches)
+        return _canonical_name(command_name) in self._matched_names
 
 
 # ── Command registry ────────────────────────────────────────────────
@@ -176,21 +229,34 @@ CMD_CREATE_MISSING = register_command(
 # ── Normalisation helpers ───────────────────────────────────────────
 
 
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+
+
 def _normalise_phrase(text: str) -> str:
-    """Collapse whitespace and lowercase for comparison."""
-    return " ".join(text.lower().split())
+    """Collapse whitespace and case-fold for comparison."""
+    collapsed = _WHITESPACE_RUN_RE.sub(" ", text).strip()
+    # lower() equals casefold() for ASCII text and is cheaper
+    return collapsed.lower() if collapsed.isascii() else collapsed.casefold()
 
 
-def _build_phrase_index() -> dict[str, str]:
+@lru_cache(maxsize=1)
+def _phrase_index_for(
+    registry: tuple[CommandDefinition, ...],
+) -> dict[str, str]:
     """Build a mapping from every known phrase to its canonical name.
 
+    The index is memoized on a snapshot of ``COMMAND_REGISTRY`` (callers
+    pass ``tuple(COMMAND_REGISTRY)``), so it is only rebuilt after the
+    registry changes (including direct edits to the list). The returned
+    dict is shared and must not be mutated.
+
     Returns:
         ``{normalised_phrase: canonical_name}`` for every registered
         command and all of its aliases.
     """
     index: dict[str, str] = {}
-    for defn in COMMAND_REGISTRY:
-        canonical = defn.name.lower().strip()
+    for defn in registry:
+        canonical = defn._canonical
         for phrase in defn.all_phrases():
             key = _normalise_phrase(phrase)
             if key in index and index[key] != canonical:
@@ -205,6 +271,88 @@ def _build_phrase_index() -> dict[str, str]:
     return index
 
 
+# Key holding a node's canonical command name in the phrase trie; it
+# cannot collide with the single-character child keys.
+_TRIE_TERMINAL = ""
+
+
+@lru_cache(maxsize=1)
+def _phrase_trie_for(registry: tuple[CommandDefinition, ...]) -> dict[str, Any]:
+    """Build a character trie over the phrase index of a registry snapshot.
+
+    Each node maps the next character to its child node; nodes that end
+    a registered phrase also carry the canonical name under
+    ``_TRIE_TERMINAL``.
+    """
+    root: dict[str, Any] = {}
+    for phrase, canonical in _phrase_index_for(registry).items():
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[_TRIE_TERMINAL] = canonical
+    return root
+
+
+@lru_cache(maxsize=1)
+def _command_matcher_for(
+    registry: tuple[CommandDefinition, ...],
+) -> tuple[re.Pattern[str], dict[str, str]]:
+    """Compile one directive regex recognising every registered phrase.
+
+    Each phrase gets its own named group, so the match identifies the
+    command directly: the second return value maps group names to
+    canonical command names. Phrases are tried longest-first so the
+    alternation keeps the longest-prefix semantics of ``_match_command``;
+    whitespace inside a phrase matches any run of spaces or tabs, as
+    normalisation would. The pattern ignores case and is anchored at a
+    mention found by ``_iter_directives``.
+    """
+    phrase_index = _phrase_index_for(registry)
+    group_names: dict[str, str] = {}
+    alternatives: list[str] = []
+    for i, phrase in enumerate(sorted(phrase_index, key=len, reverse=True)):
+        group = f"p{i}"
+        group_names[group] = phrase_index[phrase]
+        words = r"[^\S\n]+".join(re.escape(word) for word in phrase.split(" "))
+        alternatives.append(f"(?P<{group}>{words})")
+    # An empty registry gets an alternative that can never match
+    phrases = "|".join(alternatives) or "(?!)"
+    directive = _DIRECTIVE_TEMPLATE.replace("{phrases}", phrases)
+    return re.compile(directive, re.IGNORECASE), group_names
+
+
+def _iter_directives(
+    body: str, registry: tuple[CommandDefinition, ...]
+) -> Iterator[re.Match[str]]:
+    """Yield a match for each directive in *body*.
+
+    Only positions holding the mention, at the start of a line or after
+    whitespace, are tried, so prose between mentions is skipped by
+    ``_MENTION_RE``. Each match is limited to the end of the first
+    non-blank line after the mention.
+    """
+    directive, _ = _command_matcher_for(registry)
+    candidate = _MENTION_RE.search(body)
+    while candidate is not None:
+        match = None
+        pos = candidate.start()
+        at_boundary = pos == 0 or body[pos - 1].isspace()
+        if at_boundary and candidate.group().lower() == _MENTION_LOWER:
+            # The whitespace before the command may span lines
+            command_start = pos + _MENTION_LEN
+            while command_start < len(body) and body[command_start].isspace():
+                command_start += 1
+            line_end = body.find("\n", command_start)
+            if line_end == -1:
+                line_end = len(body)
+            match = directive.match(body, pos, line_end)
+        if match is not None:
+            yield match
+            candidate = _MENTION_RE.search(body, match.end())
+        else:
+            candidate = _MENTION_RE.search(body, pos + 1)
+
+
 # ── Public API ──────────────────────────────────────────────────────
 
 
@@ -215,6 +363,10 @@ def parse_commands(comment_bodies: list[str]) -> CommandParseResult:
     in multiple comments the *latest* occurrence is kept (deduplication
     by canonical command name).
 
+    The scan is memoized on the comment bodies and registry snapshot, so
+    repeated ``has_command`` / ``find_command`` calls over the same
+    comments do not rescan them.
+
     Args:
         comment_bodies: Ordered list of comment body strings
             (oldest → newest).
@@ -223,21 +375,56 @@ def parse_commands(comment_bodies: list[str]) -> CommandParseResult:
         A ``CommandParseResult`` containing de-duplicated matches and
         any unrecognised directives.
     """
-    phrase_index = _build_phrase_index()
+    matches, unrecognised, _ = _parse_commands_cached(
+        tuple(comment_bodies), tuple(COMMAND_REGISTRY)
+    )
+    _log_matches(matches)
+    # The matches tuple is immutable, so it is shared with the cache
+    return CommandParseResult(matches=matches, unrecognised=list(unrecognised))
+
+
+@lru_cache(maxsize=32)
+def _parse_commands_cached(
+    comment_bodies: tuple[str, ...],
+    registry: tuple[CommandDefinition, ...],
+) -> tuple[
+    tuple[CommandMatch, ...], tuple[str, ...], Mapping[str, CommandMatch]
+]:
+    """Memoized worker for parse_commands.
+
+    Returns the matches in comment order, the unrecognised directives and
+    the matches keyed by canonical name. The result is shared between
+    callers and must not be mutated.
+    """
+    _, group_names = _command_matcher_for(registry)
+    debug_enabled = log.isEnabledFor(logging.DEBUG)
     # Track latest match per canonical name (overwritten by newer comments).
     seen: dict[str, CommandMatch] = {}
     unrecognised: list[str] = []
 
     for idx, body in enumerate(comment_bodies):
-        if not body:
+        # Most comments never mention anyone; a plain substring check
+        # skips them faster than the case-insensitive mention search
+        if not body or "@" not in body:
             continue
-        for m in _MENTION_RE.finditer(body):
-            raw_command = m.group(1).strip()
-            normalised = _normalise_phrase(raw_command)
-
-            # Try exact match first, then progressively shorter prefixes
-            # to tolerate trailing punctuation or extra words.
-            matched_name = _match_command(normalised, phrase_index)
+        for m in _iter_directives(body, registry):
+            group = m.lastgroup or _UNKNOWN_GROUP
+            raw_command = body[m.start(group) : m.end()].strip()
+            if group != _UNKNOWN_GROUP:
+                matched_name: str | None = group_names[group]
+            elif raw_command.isascii():
+                # The regex already tried every phrase against this text;
+                # for ASCII, lowercasing and normalisation cannot change
+                # the outcome, so typos and noise exit here
+                matched_name = None
+            else:
+                # No registered phrase follows the mention; the prefix
+                # walk only differs for text that needs full case
+                # folding, which the regex does not do (e.g. "ß" to "ss")
+                matched_name = _match_command(
+                    _normalise_phrase(raw_command),
+                    _phrase_trie_for(registry),
+                )
 
             if matched_name is not None:
                 match = CommandMatch(
@@ -246,37 +433,39 @@ def parse_commands(comment_bodies: list[str]) -> CommandParseResult:
                     comment_index=idx,
                 )
                 seen[matched_name] = match
-                log.debug(
-                    "Matched command '%s' (raw: '%s') in comment #%d",
-                    matched_name,
-                    raw_command,
-                    idx,
-                )
+                if debug_enabled:
+                    log.debug(
+                        "Matched command '%s' (raw: '%s') in comment #%d",
+                        matched_name,
+                        raw_command,
+                        idx,
+                    )
             else:
                 unrecognised.append(raw_command)
-                log.debug(
-                    "Unrecognised @github2gerrit directive: '%s' "
-                    "in comment #%d",
-                    raw_command,
-                    idx,
-                )
-
-    result = CommandParseResult(
-        # Sort by the comment index of the *winning* occurrence so that
-        # results are in comment order (oldest → newest) as documented.
-        matches=sorted(seen.values(), key=lambda m: m.comment_index),
-        unrecognised=unrecognised,
-    )
-
-    if result.has_matches:
+                if debug_enabled:
+                    log.debug(
+                        "Unrecognised @github2gerrit directive: '%s' "
+                        "in comment #%d",
+                        raw_command,
+                        idx,
+                    )
+
+    # Sort by the comment index of the *winning* occurrence so that
+    # results are in comment order (oldest → newest) as documented.
+    matches = tuple(sorted(seen.values(), key=lambda m: m.comment_index))
+    return matches, tuple(unrecognised), seen
+
+
+def _log_matches(matches: tuple[CommandMatch, ...]) -> None:
+    """Log the commands found, on every scan including cached ones."""
+    # The name list is only joined when the record will be emitted
+    if matches and log.isEnabledFor(logging.INFO):
         log.info(
             "Found %d @github2gerrit command(s) in PR comments: %s",
-            len(result.matches),
-            ", ".join(m.command_name for m in result.matches),
+            len(matches),
+            ", ".join(m.command_name for m in matches),
         )
 
-    return result
-
 
 def has_command(comment_bodies: list[str], command_name: str) -> bool:
     """Check whether a specific command exists in the PR comments.
@@ -291,8 +480,7 @@ def has_command(comment_bodies: list[str], command_name: str) -> bool:
     Returns:
         ``True`` if the command was found in at least one comment.
     """
-    result = parse_commands(comment_bodies)
-    return result.has(command_name)
+    return find_command(comment_bodies, command_name) is not None
 
 
 def find_command(
@@ -308,12 +496,11 @@ def find_command(
     Returns:
         The ``CommandMatch`` if found, otherwise ``None``.
     """
-    result = parse_commands(comment_bodies)
-    target = command_name.lower().strip()
-    for m in result.matches:
-        if m.command_name == target:
-            return m
-    return None
+    matches, _, by_name = _parse_commands_cached(
+        tuple(comment_bodies), tuple(COMMAND_REGISTRY)
+    )
+    _log_matches(matches)
+    return by_name.get(_canonical_name(command_name))
 
 
 def list_commands() -> list[CommandDefinition]:
@@ -329,27 +516,23 @@ def list_commands() -> list[CommandDefinition]:
 
 def _match_command(
     normalised: str,
-    phrase_index: dict[str, str],
+    phrase_trie: dict[str, Any],
 ) -> str | None:
-    """Attempt to match *normalised* text against the phrase index.
+    """Attempt to match *normalised* text against the phrase trie.
 
-    Tries an exact match first, then checks whether any registered
-    phrase is a prefix of the normalised text (to tolerate trailing
-    punctuation like periods or extra context).
+    Finds the longest registered phrase that is a prefix of the
+    normalised text (an exact match being the longest possible), which
+    tolerates trailing punctuation like periods or extra context.
 
     Returns:
         The canonical command name on match, or ``None``.
     """
-    # Exact match
-    if normalised in phrase_index:
-        return phrase_index[normalised]
-
-    # Prefix match — longest phrase wins to avoid ambiguity.
-    best_match: str | None = None
-    best_length = 0
-    for phrase, canonical in phrase_index.items():
-        if normalised.startswith(phrase) and len(phrase) > best_length:
-            best_match = canonical
-            best_length = len(phrase)
-
+    node = phrase_trie
+    best_match: str | None = node.get(_TRIE_TERMINAL)
+    for char in normalised:
+        child = node.get(char)
+        if child is None:
+            break
+        node = child
+        best_match = node.get(_TRIE_TERMINAL, best_match)
     return best_match
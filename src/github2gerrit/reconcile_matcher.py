@@ -13,11 +13,12 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .gerrit_query import GerritChange
+from .trailers import compute_bitset_jaccard_similarities
 from .trailers import compute_file_signature
-from .trailers import compute_jaccard_similarity
 from .trailers import extract_change_ids
 from .trailers import extract_subject_tokens
 from .trailers import normalize_subject_for_matching
+from .trailers import tokens_to_bitset
 
 
 log = logging.getLogger(__name__)
@@ -418,23 +419,40 @@ class ReconciliationMatcher:
             for change in gerrit_changes
             if change.change_id not in used_changes
         ]
+        # Tokenize each candidate subject once rather than once per commit,
+        # encoding token sets as bitsets over a shared vocabulary so each
+        # comparison is a couple of integer operations.
+        vocabulary: dict[str, int] = {}
+        change_bits_by_id = {
+            change.change_id: tokens_to_bitset(
+                extract_subject_tokens(change.subject), vocabulary
+            )
+            for change in available_changes
+        }
 
         for commit in commits:
-            commit_tokens = extract_subject_tokens(commit.subject)
-            if not commit_tokens:
+            commit_bits = tokens_to_bitset(
+                extract_subject_tokens(commit.subject), vocabulary
+            )
+            if not commit_bits:
                 remaining.append(commit)
                 continue
 
             best_match: tuple[GerritChange, float] | None = None
 
-            for change in available_changes:
-                change_tokens = extract_subject_tokens(change.subject)
-                if not change_tokens:
+            candidate_bits = [
+                change_bits_by_id[change.change_id]
+                for change in available_changes
+            ]
+            similarities = compute_bitset_jaccard_similarities(
+                commit_bits, candidate_bits
+            )
+            for change, change_bits, similarity in zip(
+                available_changes, candidate_bits, similarities, strict=True
+            ):
+                if not change_bits:
                     continue
 
-                similarity = compute_jaccard_similarity(
-                    commit_tokens, change_tokens
-                )
                 if similarity >= self.similarity_threshold and (
                     best_match is None or similarity > best_match[1]
                 ):
@@ -16,10 +16,12 @@ calls are the deliberate output path when Rich is not installed.
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
 from typing import Any
+from typing import Protocol
 
 import typer
 
@@ -29,7 +31,6 @@ from .rich_logging import setup_rich_aware_logging
 
 try:
     from rich.console import Console  # pyright: ignore[reportAssignmentType]
-    from rich.live import Live  # pyright: ignore[reportAssignmentType]
     from rich.table import Table  # pyright: ignore[reportAssignmentType]
     from rich.text import Text  # pyright: ignore[reportAssignmentType]
 
@@ -37,19 +38,6 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
-    class Live:  # type: ignore[no-redef]
-        def __init__(self, *args: Any, **kwargs: Any) -> None:
-            pass
-
-        def start(self) -> None:
-            pass
-
-        def stop(self) -> None:
-            pass
-
-        def update(self, *args: Any) -> None:
-            pass
-
     class Text:  # type: ignore[no-redef]
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             pass
@@ -160,8 +148,14 @@ def safe_typer_echo(
                 progress_tracker.resume()
 
 
+class DisplayRows(Protocol):
+    """Anything exposing (label, value) rows, e.g. a dict or PRInfo."""
+
+    def items(self) -> Iterable[tuple[str, Any]]: ...
+
+
 def display_pr_info(
-    pr_info: dict[str, Any],
+    pr_info: DisplayRows,
     title: str = "",
     context: str = "",
     progress_tracker: Any = None,
@@ -169,7 +163,7 @@ def display_pr_info(
     """Display pull request information in a formatted table.
 
     Args:
-        pr_info: Dictionary containing PR information
+        pr_info: PR information as (label, value) rows (dict or PRInfo)
         title: Optional table title (deprecated, use context instead)
         context: Context prefix (e.g., "New", "Abandoned", "Updated")
         progress_tracker: Optional progress tracker to suspend/resume
@@ -234,8 +228,8 @@ class ProgressTracker:
         self.errors_count = 0
         self.warnings_count = 0
 
-        # Rich Live display
-        self.live: Live | None = None
+        # Display is event-driven: each update prints once, there is no
+        # background refresh loop
         self.rich_available = RICH_AVAILABLE
         self._rich_initially_available = RICH_AVAILABLE
         self.paused = False
@@ -9,6 +9,9 @@ trailers, particularly GitHub PR metadata trailers used for reconciliation.
 
 import logging
 import re
+from collections.abc import Iterable
+from collections.abc import Sequence
+from functools import lru_cache
 
 
 log = logging.getLogger(__name__)
@@ -27,6 +30,72 @@ KNOWN_TRAILER_KEYS = {
     SIGNED_OFF_BY_TRAILER,
 }
 
+# Subject tokenization: delimiters to split on, and generic words that carry
+# no signal for similarity matching
+_SUBJECT_TOKEN_SPLIT_RE = re.compile(r"[\s\-_\.,:;/\\]+")
+_SUBJECT_STOP_WORDS = frozenset(
+    {
+        "the",
+        "and",
+        "for",
+        "are",
+        "but",
+        "not",
+        "you",
+        "all",
+        "can",
+        "had",
+        "has",
+        "was",
+        "one",
+        "our",
+        "out",
+        "day",
+        "get",
+        "use",
+        "man",
+        "new",
+        "now",
+        "old",
+        "see",
+        "two",
+        "way",
+        "who",
+        "its",
+        "did",
+        "yes",
+        "his",
+        "her",
+        "him",
+        "how",
+        "may",
+        "say",
+        "she",
+        "add",
+        "fix",
+        "set",
+        "put",
+        "run",
+        "try",
+        "let",
+        "end",
+    }
+)
+
+# Bound on memoized per-message extraction results (commit messages are
+# typically well under 8 KiB, so the caches stay small)
+_TRAILER_CACHE_SIZE = 1024
+
+# "Key: value" trailer line; the key is everything before the first colon
+_TRAILER_LINE_RE = re.compile(r"^\s*([^:\s][^:]*?)\s*:\s*(.*?)\s*$")
+
+# Subject normalization patterns: version tags like "[v1.2]" / "(2.0)" and
+# work-in-progress prefixes like "WIP:"
+_SUBJECT_VERSION_TAG_RE = re.compile(r"\s*[\[\(][vV]?\d+[\.\d]*[\]\)]\s*")
+_SUBJECT_WIP_PREFIX_RE = re.compile(
+    r"^\s*(WIP|DRAFT|TODO|FIXME|HACK):\s*", re.IGNORECASE
+)
+
 
 def parse_trailers(commit_message: str) -> dict[str, list[str]]:
     """
@@ -55,17 +124,11 @@ def parse_trailers(commit_message: str) -> dict[str, list[str]]:
             trailer_start = i + 1
             break
 
-    for raw_line in lines[trailer_start:]:
-        line = raw_line.strip()
-        if ":" in line:
-            key, value = line.split(":", 1)
-            key = key.strip()
-            value = value.strip()
-
-            if key:
-                if key not in trailers:
-                    trailers[key] = []
-                trailers[key].append(value)
+    for line in lines[trailer_start:]:
+        match = _TRAILER_LINE_RE.match(line)
+        if match:
+            key, value = match.groups()
+            trailers.setdefault(key, []).append(value)
 
     return trailers
 
@@ -80,16 +143,21 @@ def extract_github_metadata(commit_message: str) -> dict[str, str]:
     Returns:
         Dictionary with GitHub-* trailer values (single values, not lists)
     """
-    trailers = parse_trailers(commit_message)
-    metadata = {}
+    return dict(_extract_github_metadata_cached(commit_message))
 
-    for key in [GITHUB_PR_TRAILER, GITHUB_HASH_TRAILER]:
-        values = trailers.get(key, [])
-        if values:
-            # Take the last value if multiple exist
-            metadata[key] = values[-1]
 
-    return metadata
+@lru_cache(maxsize=_TRAILER_CACHE_SIZE)
+def _extract_github_metadata_cached(
+    commit_message: str,
+) -> tuple[tuple[str, str], ...]:
+    """Memoized worker for extract_github_metadata (immutable result)."""
+    trailers = parse_trailers(commit_message)
+    # Take the last value if multiple exist
+    return tuple(
+        (key, trailers[key][-1])
+        for key in (GITHUB_PR_TRAILER, GITHUB_HASH_TRAILER)
+        if trailers.get(key)
+    )
 
 
 def extract_change_ids(commit_message: str) -> list[str]:
@@ -102,8 +170,13 @@ def extract_change_ids(commit_message: str) -> list[str]:
     Returns:
         List of Change-Id values found
     """
-    trailers = parse_trailers(commit_message)
-    return trailers.get(CHANGE_ID_TRAILER, [])
+    return list(_extract_change_ids_cached(commit_message))
+
+
+@lru_cache(maxsize=_TRAILER_CACHE_SIZE)
+def _extract_change_ids_cached(commit_message: str) -> tuple[str, ...]:
+    """Memoized worker for extract_change_ids (immutable result)."""
+    return tuple(parse_trailers(commit_message).get(CHANGE_ID_TRAILER, []))
 
 
 def has_trailer(
@@ -131,6 +204,41 @@ def has_trailer(
     return value in trailers[key]
 
 
+def which_trailers_present(
+    commit_message: str, keys: Iterable[str]
+) -> frozenset[str]:
+    """
+    Check several trailer keys at once with a single parse of the message.
+
+    Args:
+        commit_message: Full commit message text
+        keys: Trailer keys to check for
+
+    Returns:
+        The subset of ``keys`` present in the message
+    """
+    return frozenset(keys).intersection(parse_trailers(commit_message))
+
+
+def which_trailer_values_present(
+    commit_message: str, items: Iterable[tuple[str, str]]
+) -> frozenset[tuple[str, str]]:
+    """
+    Check several (key, value) trailer pairs at once with a single parse.
+
+    Args:
+        commit_message: Full commit message text
+        items: (key, value) pairs to check for
+
+    Returns:
+        The subset of ``items`` present in the message
+    """
+    trailers = parse_trailers(commit_message)
+    return frozenset(
+        (key, value) for key, value in items if value in trailers.get(key, ())
+    )
+
+
 def add_trailers(commit_message: str, new_trailers: dict[str, str]) -> str:
     """
     Add trailers to a commit message, avoiding duplicates.
@@ -154,14 +262,13 @@ def add_trailers(commit_message: str, new_trailers: dict[str, str]) -> str:
         if key not in existing_trailers or value not in existing_trailers[key]:
             to_add.append(f"{key}: {value}")
 
-    if to_add:
-        if msg and not msg.endswith("\n"):
-            msg += "\n"
-        if not msg.endswith("\n\n"):
-            msg += "\n"
-        msg += "\n".join(to_add) + "\n"
+    if not to_add:
+        return msg
 
-    return msg
+    # Separate the new trailers from the body with a blank line and build
+    # the result in a single join.
+    separator = "\n\n" if msg else "\n"
+    return "".join([msg, separator, "\n".join(to_add), "\n"])
 
 
 def normalize_subject_for_matching(subject: str) -> str:
@@ -180,24 +287,15 @@ def normalize_subject_for_matching(subject: str) -> str:
     if not subject:
         return ""
 
-    normalized = subject.strip()
+    normalized = _SUBJECT_VERSION_TAG_RE.sub(" ", subject.strip())
+    normalized = _SUBJECT_WIP_PREFIX_RE.sub("", normalized)
 
-    normalized = re.sub(r"\s*[\[\(][vV]?\d+[\.\d]*[\]\)]\s*", " ", normalized)
+    # Drop trailing sentence punctuation
+    normalized = normalized.rstrip().rstrip(".!")
 
-    normalized = re.sub(
-        r"^\s*(WIP|DRAFT|TODO|FIXME|HACK):\s*",
-        "",
-        normalized,
-        flags=re.IGNORECASE,
-    )
-
-    normalized = re.sub(r"[.!]+\s*$", "", normalized)
-
-    # Normalize whitespace
-    normalized = re.sub(r"\s+", " ", normalized).strip()
-
-    # Convert to lowercase for case-insensitive matching
-    return normalized.lower()
+    # Normalize whitespace and convert to lowercase for case-insensitive
+    # matching
+    return " ".join(normalized.split()).lower()
 
 
 def compute_file_signature(file_paths: list[str]) -> str:
@@ -205,7 +303,10 @@ def compute_file_signature(file_paths: list[str]) -> str:
     Compute a normalized signature for a set of file paths.
 
     This creates a deterministic hash of the files touched by a commit,
-    useful for matching commits that affect the same files.
+    useful for matching commits that affect the same files. Each distinct
+    normalized path gets a 64-bit fingerprint and the fingerprints are
+    XOR-combined, so the result is independent of input order without
+    sorting or concatenating the paths.
 
     Args:
         file_paths: List of file paths
@@ -218,20 +319,19 @@ def compute_file_signature(file_paths: list[str]) -> str:
     if not file_paths:
         return ""
 
-    # Normalize paths: lowercase, remove leading/trailing slashes
-    normalized_paths = []
-    for path in file_paths:
-        normalized = path.strip().lower()
-        normalized = normalized.strip("/")
-        if normalized:
-            normalized_paths.append(normalized)
+    # Normalize paths: lowercase, remove leading/trailing slashes. A set
+    # keeps duplicate entries from cancelling out under XOR.
+    normalized_paths = {path.strip().lower().strip("/") for path in file_paths}
+    normalized_paths.discard("")
+    if not normalized_paths:
+        return ""
 
-    # Sort for deterministic ordering
-    normalized_paths.sort()
+    signature = 0
+    for path in normalized_paths:
+        fingerprint = hashlib.blake2b(path.encode("utf-8"), digest_size=8)
+        signature ^= int.from_bytes(fingerprint.digest(), "big")
 
-    content = "\n".join(normalized_paths)
-    hash_obj = hashlib.sha256(content.encode("utf-8"))
-    return hash_obj.hexdigest()[:12]  # 12 hex chars = 48 bits
+    return f"{signature:016x}"[:12]  # 12 hex chars = 48 bits
 
 
 def extract_subject_tokens(subject: str) -> set[str]:
@@ -250,65 +350,14 @@ def extract_subject_tokens(subject: str) -> set[str]:
     # Normalize the subject
     normalized = normalize_subject_for_matching(subject)
 
-    # Split on common delimiters and filter out short/common words
-    tokens = re.split(r"[\s\-_\.,:;/\\]+", normalized)
-
-    # Filter tokens: must be at least 3 chars and not common stop words
-    stop_words = {
-        "the",
-        "and",
-        "for",
-        "are",
-        "but",
-        "not",
-        "you",
-        "all",
-        "can",
-        "had",
-        "has",
-        "was",
-        "one",
-        "our",
-        "out",
-        "day",
-        "get",
-        "use",
-        "man",
-        "new",
-        "now",
-        "old",
-        "see",
-        "two",
-        "way",
-        "who",
-        "its",
-        "did",
-        "yes",
-        "his",
-        "her",
-        "him",
-        "how",
-        "may",
-        "say",
-        "she",
-        "add",
-        "fix",
-        "set",
-        "put",
-        "run",
-        "try",
-        "let",
-        "end",
+    # Split on common delimiters and keep tokens of at least 3 chars that
+    # are not common stop words
+    return {
+        token
+        for token in _SUBJECT_TOKEN_SPLIT_RE.split(normalized)
+        if len(token) >= 3 and token not in _SUBJECT_STOP_WORDS
     }
 
-    meaningful_tokens = set()
-    for raw_token in tokens:
-        token = raw_token.strip()
-        if len(token) >= 3 and token not in stop_words:
-            meaningful_tokens.add(token)
-
-    return meaningful_tokens
-
 
 def compute_jaccard_similarity(set1: set[str], set2: set[str]) -> float:
     """
@@ -327,7 +376,83 @@ def compute_jaccard_similarity(set1: set[str], set2: set[str]) -> float:
     if not set1 or not set2:
         return 0.0
 
-    intersection = len(set1.intersection(set2))
-    union = len(set1.union(set2))
+    # |A | B| = |A| + |B| - |A & B|, so the union set never needs to be
+    # materialized.
+    intersection = len(set1 & set2)
+    union = len(set1) + len(set2) - intersection
+
+    return intersection / union if union > 0 else 0.0
+
+
+def tokens_to_bitset(tokens: set[str], vocabulary: dict[str, int]) -> int:
+    """
+    Encode a token set as an integer bitset over a shared vocabulary.
+
+    Tokens not yet present in the vocabulary are assigned the next free
+    bit index, so one vocabulary can be reused across a batch of subjects.
+
+    Args:
+        tokens: Set of tokens (as returned by extract_subject_tokens)
+        vocabulary: Mutable token -> bit index mapping shared by the batch
+
+    Returns:
+        Integer with one bit set per token
+    """
+    bits = 0
+    for token in tokens:
+        index = vocabulary.setdefault(token, len(vocabulary))
+        bits |= 1 << index
+    return bits
+
+
+def compute_bitset_jaccard_similarity(bits1: int, bits2: int) -> float:
+    """
+    Compute Jaccard similarity between two token bitsets.
+
+    Equivalent to compute_jaccard_similarity() on the underlying token
+    sets, provided both bitsets were built from the same vocabulary.
+
+    Args:
+        bits1: First token bitset
+        bits2: Second token bitset
+
+    Returns:
+        Jaccard similarity coefficient (0.0 to 1.0)
+    """
+    if not bits1 and not bits2:
+        return 1.0
+
+    if not bits1 or not bits2:
+        return 0.0
+
+    intersection = (bits1 & bits2).bit_count()
+    union = bits1.bit_count() + bits2.bit_count() - intersection
 
     return intersection / union if union > 0 else 0.0
+
+
+def compute_bitset_jaccard_similarities(
+    bits: int, candidates: Sequence[int]
+) -> list[float]:
+    """
+    Compute Jaccard similarity of one token bitset against many candidates.
+
+    The query popcount is computed once, so each candidate costs a single
+    AND plus two popcounts.
+
+    Args:
+        bits: Query token bitset
+        candidates: Candidate token bitsets built from the same vocabulary
+
+    Returns:
+        Similarity coefficients in the same order as ``candidates``
+    """
+    count = bits.bit_count()
+    if not count:
+        return [0.0 if other else 1.0 for other in candidates]
+
+    scores = []
+    for other in candidates:
+        intersection = (bits & other).bit_count()
+        scores.append(intersection / (count + other.bit_count() - intersection))
+    return scores
@@ -202,6 +202,22 @@ def disable_github_ci_mode(
         monkeypatch.setenv("G2G_AUTO_SAVE_CONFIG", "false")
 
 
+@pytest.fixture(autouse=True)
+def clear_gerrit_pr_closer_caches() -> None:
+    """
+    Start every test with empty PR closer caches.
+
+    Tests mock different REST clients and responses for the same hosts and
+    change URLs, so cached clients and responses must not carry over from
+    one test to the next.
+    """
+    from github2gerrit.gerrit_pr_closer import clear_change_detail_cache
+    from github2gerrit.gerrit_pr_closer import clear_client_cache
+
+    clear_change_detail_cache()
+    clear_client_cache()
+
+
 @pytest.fixture(autouse=True)
 def isolate_git_environment(monkeypatch: pytest.MonkeyPatch) -> None:
     """
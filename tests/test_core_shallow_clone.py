@@ -5,13 +5,21 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import Sequence
+from itertools import chain
+from itertools import repeat
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
 
 import pytest
 
 from github2gerrit.core import Orchestrator
+from github2gerrit.core import _is_missing_commit_error
+from github2gerrit.core import _is_unrelated_history_error
 from github2gerrit.gitutils import CommandError
 from github2gerrit.gitutils import CommandResult
 
@@ -19,115 +27,344 @@ from github2gerrit.gitutils import CommandResult
 # Default deepen depth used in graduated deepening
 DEEPEN_DEPTH = 100
 
+# git checkout errors that indicate a commit missing from a shallow clone
+MISSING_COMMIT_ERRORS = [
+    "fatal: 'abc123' is not a commit",
+    "cannot be created from it",
+    "fatal: bad revision 'abc123'",
+    "unknown revision or path not in the working tree",
+    "invalid reference: abc123",
+]
+
+UNRELATED_HISTORIES = "fatal: refusing to merge unrelated histories"
+
+
+# Every reachable path through the checkout recovery. Columns: outcome of
+# each checkout attempt in order, whether deepen and unshallow succeed
+# (None when the step never runs), the checkout attempt whose error
+# surfaces (None on success), then the expected checkout, deepen and
+# unshallow call counts.
+RECOVERY_PATHS = [
+    pytest.param(
+        (True,), None, None, None, 1, 0, 0, id="first-checkout-succeeds"
+    ),
+    pytest.param(
+        (False, True), True, None, None, 2, 1, 0, id="deepen-then-succeeds"
+    ),
+    pytest.param(
+        (False, False, True),
+        True,
+        True,
+        None,
+        3,
+        1,
+        1,
+        id="deepen-insufficient-unshallow-succeeds",
+    ),
+    pytest.param(
+        (False, False, False),
+        True,
+        True,
+        3,
+        3,
+        1,
+        1,
+        id="deepen-insufficient-unshallow-checkout-fails",
+    ),
+    pytest.param(
+        (False, False),
+        True,
+        False,
+        1,
+        2,
+        1,
+        1,
+        id="deepen-insufficient-unshallow-fails",
+    ),
+    pytest.param(
+        (False, True),
+        False,
+        True,
+        None,
+        2,
+        1,
+        1,
+        id="deepen-fails-unshallow-succeeds",
+    ),
+    pytest.param(
+        (False, False),
+        False,
+        True,
+        2,
+        2,
+        1,
+        1,
+        id="deepen-fails-unshallow-checkout-fails",
+    ),
+    pytest.param(
+        (False,), False, False, 1, 1, 1, 1, id="deepen-and-unshallow-fail"
+    ),
+]
+
+# Keep the module on one xdist worker (with --dist=loadgroup) so the
+# session-scoped repository fixtures below are built once per run
+pytestmark = pytest.mark.xdist_group("shallow_clone")
+
+
+# The helpers under test only read the .git skeleton (they never write to
+# the workspace), so one directory per flavour is shared by the session.
+@pytest.fixture(scope="session")
+def shallow_repo_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Workspace whose .git directory contains a shallow marker file."""
+    path = tmp_path_factory.mktemp("shallow")
+    (path / ".git").mkdir()
+    (path / ".git" / "shallow").touch()
+    return path
+
+
+@pytest.fixture(scope="session")
+def nonshallow_repo_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Workspace with a bare .git directory and no shallow marker."""
+    path = tmp_path_factory.mktemp("nonshallow")
+    (path / ".git").mkdir()
+    return path
+
+
+# Flags that get their own bucket in CmdRecorder besides the subcommand
+_RECORDED_FLAGS = ("--unshallow", "--squash", "--abort")
+
+
+class CmdRecorder:
+    """Count fake git invocations by subcommand and notable flag.
+
+    Each command increments its ``(program, subcommand)`` bucket plus one
+    bucket per flag of interest (``--deepen`` covers ``--deepen=N``), and
+    the latest full command is kept per bucket. ``calls`` keeps every
+    command in order for tests that assert on sequencing.
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter[tuple[str, ...] | str] = Counter()
+        self.last: dict[tuple[str, ...] | str, list[str]] = {}
+        self.calls: list[list[str]] = []
+
+    def record(self, cmd: list[str]) -> None:
+        self.calls.append(list(cmd))
+        keys: list[tuple[str, ...] | str] = [tuple(cmd[:2])]
+        keys.extend(flag for flag in _RECORDED_FLAGS if flag in cmd)
+        if any(arg.startswith("--deepen=") for arg in cmd):
+            keys.append("--deepen")
+        for key in keys:
+            self.counts[key] += 1
+            self.last[key] = list(cmd)
+
+
+@pytest.fixture
+def recorder() -> CmdRecorder:
+    """Fresh command recorder for a single test."""
+    return CmdRecorder()
+
+
+# What a fake git call does: return the result or raise the error
+Outcome = CommandResult | CommandError
+
+# Shared fake results; CommandResult is a frozen dataclass, so reusing one
+# instance across calls and tests is safe
+OK = CommandResult(returncode=0, stdout="", stderr="")
+TRUE_SHALLOW = CommandResult(returncode=0, stdout="true\n", stderr="")
+FALSE_SHALLOW = CommandResult(returncode=0, stdout="false\n", stderr="")
+
+
+def _signature(cmd: list[str]) -> str:
+    """Map a git command onto the dispatch key used by make_fake."""
+    match tuple(cmd):
+        case ("git", "checkout", *_):
+            return "checkout"
+        case ("git", "merge", "--abort", *_):
+            return "merge-abort"
+        case ("git", "merge", *_):
+            return "merge"
+        case ("git", "fetch", "--unshallow", *_):
+            return "unshallow"
+        case ("git", "fetch", flag, *_) if flag.startswith("--deepen="):
+            return "deepen"
+        case ("git", "rev-parse", "--is-shallow-repository", *_):
+            return "is-shallow"
+        case _:
+            return "other"
+
+
+def make_fake(
+    overrides: Mapping[str, Outcome | Sequence[Outcome]] | None = None,
+    recorder: CmdRecorder | None = None,
+) -> Callable[..., CommandResult]:
+    """Build a fake run_cmd that dispatches on the command signature.
+
+    A sequence of outcomes is consumed one per call, repeating its last
+    entry once exhausted. Signatures without an override succeed with
+    empty output.
+    """
+    # Each signature gets an endless iterator: the listed outcomes in
+    # order, then the last one repeated
+    plan: dict[str, Iterator[Outcome]] = {}
+    for sig, outcome in (overrides or {}).items():
+        if isinstance(outcome, CommandResult | CommandError):
+            plan[sig] = repeat(outcome)
+        else:
+            plan[sig] = chain(outcome, repeat(outcome[-1]))
+
+    def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
+        if recorder is not None:
+            recorder.record(cmd)
+        outcomes = plan.get(_signature(cmd))
+        if outcomes is None:
+            return OK
+        outcome = next(outcomes)
+        if isinstance(outcome, CommandError):
+            raise outcome
+        return outcome
+
+    return fake_run_cmd
+
+
+def _orchestrator(
+    monkeypatch: pytest.MonkeyPatch,
+    workspace: Path,
+    fake_run_cmd: Callable[..., CommandResult],
+) -> Orchestrator:
+    """Build an Orchestrator whose git commands go to ``fake_run_cmd``."""
+    monkeypatch.setattr("github2gerrit.core.run_cmd", fake_run_cmd)
+    return Orchestrator(workspace=workspace)
+
+
+def _unrelated_histories_error() -> CommandError:
+    return CommandError(
+        UNRELATED_HISTORIES, returncode=128, stderr=UNRELATED_HISTORIES
+    )
+
+
+def _merge_conflict_error() -> CommandError:
+    return CommandError(
+        "Merge conflict in file.txt",
+        returncode=1,
+        stderr="CONFLICT (content): Merge conflict in file.txt",
+    )
+
 
 class TestIsShallowClone:
     """Tests for _is_shallow_clone method."""
 
-    def test_shallow_file_exists(self, tmp_path: Path) -> None:
+    def test_shallow_file_exists(self, shallow_repo_dir: Path) -> None:
         """Detect shallow clone when .git/shallow file exists."""
-        # Create .git/shallow file
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        shallow_file = git_dir / "shallow"
-        shallow_file.touch()
-
-        orch = Orchestrator(workspace=tmp_path)
+        orch = Orchestrator(workspace=shallow_repo_dir)
         assert orch._is_shallow_clone() is True
 
-    def test_shallow_file_not_exists(self, tmp_path: Path) -> None:
+    def test_shallow_file_not_exists(
+        self, nonshallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Not shallow when .git/shallow file doesn't exist."""
-        # Create .git directory but no shallow file
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-
-        # Test with mocked git command
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="false\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
+        fake_run_cmd = make_fake({"is-shallow": FALSE_SHALLOW})
 
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            assert orch._is_shallow_clone() is False
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        assert orch._is_shallow_clone() is False
 
-    def test_git_command_fallback(self, tmp_path: Path) -> None:
+    def test_git_command_fallback(
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Use git command as fallback when .git/shallow doesn't exist."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        # No shallow file - will use git command fallback
-
-        orch = Orchestrator(workspace=tmp_path)
+        fake_run_cmd = make_fake(
+            {"is-shallow": TRUE_SHALLOW}, recorder=recorder
+        )
 
-        # Mock the git command to return true
-        with patch("github2gerrit.core.run_cmd") as mock_run:
-            mock_run.return_value = CommandResult(
-                returncode=0, stdout="true\n", stderr=""
-            )
-            result = orch._is_shallow_clone()
+        # No shallow file - will use git command fallback
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        result = orch._is_shallow_clone()
 
         assert result is True
         # Verify git rev-parse --is-shallow-repository was called
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert "--is-shallow-repository" in call_args
+        assert recorder.counts[("git", "rev-parse")] == 1
+        assert "--is-shallow-repository" in recorder.last[("git", "rev-parse")]
+
+    def test_result_is_cached(
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Repeated checks reuse the cached result without re-running git."""
+        fake_run_cmd = make_fake(
+            {"is-shallow": TRUE_SHALLOW}, recorder=recorder
+        )
+
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        assert orch._is_shallow_clone() is True
+        assert orch._is_shallow_clone() is True
+
+        assert orch._shallow_cache is True
+        assert recorder.counts[("git", "rev-parse")] == 1
+
+    def test_cache_reset_after_deepen(
+        self, shallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Deepening clears the cache so the next check re-inspects."""
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, make_fake())
+        assert orch._deepen_repository() is True
+        assert orch._shallow_cache is None
+
+    def test_cache_cleared_after_unshallow(
+        self, shallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A successful unshallow marks the repository as not shallow."""
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, make_fake())
+        assert orch._unshallow_repository() is True
+        assert orch._shallow_cache is False
+        assert orch._is_shallow_clone() is False
 
 
 class TestDeepenRepository:
     """Tests for _deepen_repository method."""
 
-    def test_deepen_success(self, tmp_path: Path) -> None:
+    def test_deepen_success(
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Successfully deepen a shallow repository."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
+        fake_run_cmd = make_fake(recorder=recorder)
 
-        call_log: list[list[str]] = []
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            result = orch._deepen_repository(depth=100)
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        result = orch._deepen_repository(depth=100)
 
         assert result is True
         # Verify deepen command was called
-        deepen_calls = [c for c in call_log if "--deepen=" in str(c)]
-        assert len(deepen_calls) == 1
-        assert f"--deepen={DEEPEN_DEPTH}" in deepen_calls[0]
+        assert recorder.counts["--deepen"] == 1
+        assert f"--deepen={DEEPEN_DEPTH}" in recorder.last["--deepen"]
 
-    def test_deepen_not_needed(self, tmp_path: Path) -> None:
+    def test_deepen_not_needed(
+        self, nonshallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Return True when repository is not shallow."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        # No shallow file
+        fake_run_cmd = make_fake({"is-shallow": FALSE_SHALLOW})
 
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="false\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            result = orch._deepen_repository()
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        result = orch._deepen_repository()
 
         assert result is True
 
-    def test_deepen_failure(self, tmp_path: Path) -> None:
+    def test_deepen_failure(
+        self, shallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Return False when deepen command fails."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if "--deepen=" in str(cmd):
-                raise CommandError("git fetch --deepen failed", returncode=1)
-            return CommandResult(returncode=0, stdout="", stderr="")
+        fake_run_cmd = make_fake(
+            {"deepen": CommandError("git fetch --deepen failed", returncode=1)}
+        )
 
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            result = orch._deepen_repository()
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        result = orch._deepen_repository()
 
         assert result is False
 
@@ -135,64 +372,51 @@ class TestDeepenRepository:
 class TestUnshallowRepository:
     """Tests for _unshallow_repository method."""
 
-    def test_unshallow_success(self, tmp_path: Path) -> None:
+    def test_unshallow_success(
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Successfully unshallow a shallow repository."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        call_log: list[list[str]] = []
+        fake_run_cmd = make_fake(
+            {"is-shallow": TRUE_SHALLOW},
+            recorder=recorder,
+        )
 
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            if cmd[:3] == ["git", "fetch", "--unshallow"]:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            result = orch._unshallow_repository()
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        result = orch._unshallow_repository()
 
         assert result is True
         # Verify unshallow command was called
-        unshallow_calls = [c for c in call_log if "--unshallow" in c]
-        assert len(unshallow_calls) == 1
+        assert recorder.counts["--unshallow"] == 1
 
-    def test_unshallow_not_needed(self, tmp_path: Path) -> None:
+    def test_unshallow_not_needed(
+        self, nonshallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Return True when repository is not shallow."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        # No shallow file
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="false\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
+        fake_run_cmd = make_fake({"is-shallow": FALSE_SHALLOW})
 
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            result = orch._unshallow_repository()
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        result = orch._unshallow_repository()
 
         assert result is True
 
-    def test_unshallow_failure(self, tmp_path: Path) -> None:
+    def test_unshallow_failure(
+        self, shallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Return False when unshallow command fails."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:3] == ["git", "fetch", "--unshallow"]:
-                raise CommandError("git fetch --unshallow failed", returncode=1)
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            result = orch._unshallow_repository()
+        fake_run_cmd = make_fake(
+            {
+                "unshallow": CommandError(
+                    "git fetch --unshallow failed", returncode=1
+                ),
+                "is-shallow": TRUE_SHALLOW,
+            }
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        result = orch._unshallow_repository()
 
         assert result is False
 
@@ -200,29 +424,25 @@ class TestUnshallowRepository:
 class TestCheckoutWithUnshallowFallback:
     """Tests for _checkout_with_unshallow_fallback method."""
 
-    def test_checkout_success_first_attempt(self, tmp_path: Path) -> None:
+    def test_checkout_success_first_attempt(
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Checkout succeeds on first attempt without unshallow."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-
-        call_log: list[list[str]] = []
+        fake_run_cmd = make_fake(recorder=recorder)
 
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._checkout_with_unshallow_fallback(
-                branch_name="test_branch",
-                start_point="abc123",
-                create_branch=True,
-            )
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        orch._checkout_with_unshallow_fallback(
+            branch_name="test_branch",
+            start_point="abc123",
+            create_branch=True,
+        )
 
         # Only checkout command should be called
-        checkout_calls = [c for c in call_log if c[:2] == ["git", "checkout"]]
-        assert len(checkout_calls) == 1
-        assert checkout_calls[0] == [
+        assert recorder.counts[("git", "checkout")] == 1
+        assert recorder.last[("git", "checkout")] == [
             "git",
             "checkout",
             "-b",
@@ -230,477 +450,490 @@ class TestCheckoutWithUnshallowFallback:
             "abc123",
         ]
 
-    def test_checkout_fails_then_deepen_succeeds(self, tmp_path: Path) -> None:
+    def test_checkout_fails_then_deepen_succeeds(
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Checkout fails due to missing SHA, deepen fixes it."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        checkout_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "checkout"]:
-                checkout_attempts[0] += 1
-                if checkout_attempts[0] == 1:
-                    # First attempt fails with "not a commit" error
-                    raise CommandError(
+        fake_run_cmd = make_fake(
+            {
+                # First attempt fails with "not a commit" error, the second
+                # (after deepen) succeeds
+                "checkout": [
+                    CommandError(
                         "fatal: 'abc123' is not a commit and a branch "
                         "'test_branch' cannot be created from it",
                         returncode=128,
-                    )
-                # Second attempt (after deepen) succeeds
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            # Should not raise
-            orch._checkout_with_unshallow_fallback(
-                branch_name="test_branch",
-                start_point="abc123",
-                create_branch=True,
-            )
+                    ),
+                    OK,
+                ],
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        # Should not raise
+        orch._checkout_with_unshallow_fallback(
+            branch_name="test_branch",
+            start_point="abc123",
+            create_branch=True,
+        )
 
         # Should have attempted checkout twice (before and after deepen)
-        assert checkout_attempts[0] == 2
+        assert recorder.counts[("git", "checkout")] == 2
 
     def test_checkout_fails_deepen_insufficient_unshallow_succeeds(
-        self, tmp_path: Path
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Checkout fails, deepen insufficient, full unshallow fixes it."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        checkout_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "checkout"]:
-                checkout_attempts[0] += 1
-                if checkout_attempts[0] <= 2:
-                    # First and second attempts fail
-                    raise CommandError(
-                        "fatal: 'abc123' is not a commit",
-                        returncode=128,
-                    )
-                # Third attempt (after full unshallow) succeeds
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                # Deepen succeeds but doesn't help
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if cmd[:3] == ["git", "fetch", "--unshallow"]:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._checkout_with_unshallow_fallback(
-                branch_name="test_branch",
-                start_point="abc123",
-                create_branch=True,
-            )
+        not_a_commit = CommandError(
+            "fatal: 'abc123' is not a commit", returncode=128
+        )
+        fake_run_cmd = make_fake(
+            {
+                # First and second attempts fail, the third (after full
+                # unshallow) succeeds; deepen succeeds but doesn't help
+                "checkout": [not_a_commit, not_a_commit, OK],
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        orch._checkout_with_unshallow_fallback(
+            branch_name="test_branch",
+            start_point="abc123",
+            create_branch=True,
+        )
 
         # Should have attempted checkout 3 times:
         # 1. Initial (fail), 2. After deepen (fail), 3. After unshallow (success)
-        assert checkout_attempts[0] == 3
+        assert recorder.counts[("git", "checkout")] == 3
 
     def test_checkout_fails_non_shallow_error_raises(
-        self, tmp_path: Path
+        self, nonshallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Checkout fails with non-shallow error, raises immediately."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "checkout"]:
-                # Fail with a different error (not related to missing commit)
-                raise CommandError(
+        # Fail with a different error (not related to missing commit)
+        fake_run_cmd = make_fake(
+            {
+                "checkout": CommandError(
                     "fatal: A branch named 'test_branch' already exists",
                     returncode=128,
                 )
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            with pytest.raises(CommandError) as exc_info:
-                orch._checkout_with_unshallow_fallback(
-                    branch_name="test_branch",
-                    start_point="abc123",
-                    create_branch=True,
-                )
+            }
+        )
+
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        with pytest.raises(CommandError) as exc_info:
+            orch._checkout_with_unshallow_fallback(
+                branch_name="test_branch",
+                start_point="abc123",
+                create_branch=True,
+            )
 
         assert "already exists" in str(exc_info.value)
 
+    def test_checkout_missing_commit_not_shallow_raises(
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Missing commit in a complete clone raises without deepening."""
+        fake_run_cmd = make_fake(
+            {
+                "checkout": CommandError(
+                    MISSING_COMMIT_ERRORS[0], returncode=128
+                ),
+                "is-shallow": FALSE_SHALLOW,
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        with pytest.raises(CommandError) as exc_info:
+            orch._checkout_with_unshallow_fallback(
+                branch_name="test_branch",
+                start_point="abc123",
+                create_branch=True,
+            )
+
+        assert "not a commit" in str(exc_info.value)
+        assert recorder.counts[("git", "checkout")] == 1
+        assert recorder.counts["--deepen"] == 0
+        assert recorder.counts["--unshallow"] == 0
+
     def test_checkout_fails_all_recovery_fails_raises(
-        self, tmp_path: Path
+        self, shallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Checkout fails, deepen and unshallow both fail, raises original error."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "checkout"]:
-                raise CommandError(
-                    "fatal: 'abc123' is not a commit",
-                    returncode=128,
-                )
-            if "--deepen=" in str(cmd):
-                raise CommandError("deepen failed", returncode=1)
-            if cmd[:3] == ["git", "fetch", "--unshallow"]:
-                raise CommandError("unshallow failed", returncode=1)
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            with pytest.raises(CommandError) as exc_info:
-                orch._checkout_with_unshallow_fallback(
-                    branch_name="test_branch",
-                    start_point="abc123",
-                    create_branch=True,
-                )
+        fake_run_cmd = make_fake(
+            {
+                "checkout": CommandError(
+                    "fatal: 'abc123' is not a commit", returncode=128
+                ),
+                "deepen": CommandError("deepen failed", returncode=1),
+                "unshallow": CommandError("unshallow failed", returncode=1),
+            }
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        with pytest.raises(CommandError) as exc_info:
+            orch._checkout_with_unshallow_fallback(
+                branch_name="test_branch",
+                start_point="abc123",
+                create_branch=True,
+            )
 
         assert "not a commit" in str(exc_info.value)
 
+    def test_recognizes_missing_commit_error(
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A missing commit error triggers graduated deepening."""
+        fake_run_cmd = make_fake(
+            {
+                # Second attempt after deepen succeeds
+                "checkout": [
+                    CommandError(MISSING_COMMIT_ERRORS[0], returncode=128),
+                    OK,
+                ],
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        orch._checkout_with_unshallow_fallback(
+            branch_name="test_branch",
+            start_point="abc123",
+            create_branch=True,
+        )
+
+        # Should have attempted checkout twice (before and after deepen)
+        assert recorder.counts[("git", "checkout")] == 2
+
+
+class TestCheckoutRecoveryPaths:
+    """Exhaustive outcomes of the graduated checkout recovery."""
+
     @pytest.mark.parametrize(
-        "error_message",
-        [
-            "fatal: 'abc123' is not a commit",
-            "cannot be created from it",
-            "fatal: bad revision 'abc123'",
-            "unknown revision or path not in the working tree",
-            "invalid reference: abc123",
-        ],
+        "checkout_results,deepen_ok,unshallow_ok,failed_attempt,"
+        "checkouts,deepens,unshallows",
+        RECOVERY_PATHS,
     )
-    def test_recognizes_missing_commit_errors(
-        self, tmp_path: Path, error_message: str
+    def test_recovery_path(
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        checkout_results: tuple[bool, ...],
+        deepen_ok: bool | None,
+        unshallow_ok: bool | None,
+        failed_attempt: int | None,
+        checkouts: int,
+        deepens: int,
+        unshallows: int,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        """All variations of missing commit errors trigger unshallow."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        checkout_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "checkout"]:
-                checkout_attempts[0] += 1
-                if checkout_attempts[0] == 1:
-                    raise CommandError(error_message, returncode=128)
-                # Second attempt after deepen succeeds
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
+        """Each step runs only when needed and the right error surfaces."""
+        fake_run_cmd = make_fake(
+            {
+                "checkout": [
+                    OK
+                    if ok
+                    else CommandError(
+                        f"fatal: 'abc123' is not a commit (attempt {n})",
+                        returncode=128,
+                    )
+                    for n, ok in enumerate(checkout_results, start=1)
+                ],
+                "deepen": OK
+                if deepen_ok is not False
+                else CommandError("deepen failed", returncode=1),
+                "unshallow": OK
+                if unshallow_ok is not False
+                else CommandError("unshallow failed", returncode=1),
+            },
+            recorder=recorder,
+        )
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+
+        def run() -> None:
             orch._checkout_with_unshallow_fallback(
                 branch_name="test_branch",
                 start_point="abc123",
                 create_branch=True,
             )
 
-        # Should have attempted checkout twice (before and after deepen)
-        assert checkout_attempts[0] == 2
+        if failed_attempt is None:
+            run()
+        else:
+            with pytest.raises(CommandError, match=f"attempt {failed_attempt}"):
+                run()
 
+        assert recorder.counts[("git", "checkout")] == checkouts
+        assert recorder.counts["--deepen"] == deepens
+        assert recorder.counts["--unshallow"] == unshallows
 
-class TestEnsureWorkspacePrepared:
-    """Tests for _ensure_workspace_prepared - simple fetch only."""
 
-    def test_shallow_clone_does_normal_fetch(self, tmp_path: Path) -> None:
-        """Shallow clone does NOT proactively unshallow (performance)."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
+class TestIsMissingCommitError:
+    """Tests for the _is_missing_commit_error classifier."""
 
-        call_log: list[list[str]] = []
+    @pytest.mark.parametrize("error_message", MISSING_COMMIT_ERRORS)
+    def test_recognizes_missing_commit_errors(self, error_message: str) -> None:
+        """All variations of missing commit errors are recognized."""
+        assert _is_missing_commit_error(error_message) is True
 
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            return CommandResult(returncode=0, stdout="", stderr="")
+    def test_ignores_unrelated_errors(self) -> None:
+        """Errors unrelated to missing history are not recognized."""
+        assert (
+            _is_missing_commit_error(
+                "fatal: A branch named 'test_branch' already exists"
+            )
+            is False
+        )
 
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._ensure_workspace_prepared("master")
 
-        # Should NOT have called fetch --unshallow (performance optimization)
-        unshallow_calls = [c for c in call_log if "--unshallow" in c]
-        assert len(unshallow_calls) == 0
+class TestIsUnrelatedHistoryError:
+    """Tests for the _is_unrelated_history_error classifier."""
 
-        # Should have called normal fetch
-        fetch_calls = [c for c in call_log if c[:2] == ["git", "fetch"]]
-        assert len(fetch_calls) == 1
-        assert fetch_calls[0] == ["git", "fetch", "origin", "master"]
+    @pytest.mark.parametrize(
+        "error_message,stderr_message",
+        [
+            (UNRELATED_HISTORIES, ""),
+            ("Command failed", "fatal: Refusing to merge Unrelated Histories"),
+            ("merge failed", "fatal: no common ancestor"),
+        ],
+        ids=["message", "stderr-mixed-case", "no-ancestor"],
+    )
+    def test_recognizes_unrelated_history_errors(
+        self, error_message: str, stderr_message: str
+    ) -> None:
+        """The markers are matched in the message or stderr, any case."""
+        exc = CommandError(error_message, returncode=128, stderr=stderr_message)
+        assert _is_unrelated_history_error(exc) is True
+
+    def test_ignores_merge_conflicts(self) -> None:
+        """A genuine merge conflict is not a shallow-history problem."""
+        assert _is_unrelated_history_error(_merge_conflict_error()) is False
 
-    def test_non_shallow_clone_normal_fetch(self, tmp_path: Path) -> None:
-        """Non-shallow clone uses normal fetch."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        # No shallow file
 
-        call_log: list[list[str]] = []
+class TestEnsureWorkspacePrepared:
+    """Tests for _ensure_workspace_prepared - simple fetch only."""
+
+    @pytest.mark.parametrize(
+        "repo_fixture", ["shallow_repo_dir", "nonshallow_repo_dir"]
+    )
+    def test_ensure_workspace_uses_normal_fetch(
+        self,
+        request: pytest.FixtureRequest,
+        recorder: CmdRecorder,
+        repo_fixture: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Shallow or not, only a normal fetch runs (no proactive unshallow)."""
+        workspace: Path = request.getfixturevalue(repo_fixture)
+        fake_run_cmd = make_fake(recorder=recorder)
 
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            return CommandResult(returncode=0, stdout="", stderr="")
+        orch = _orchestrator(monkeypatch, workspace, fake_run_cmd)
+        orch._ensure_workspace_prepared("master")
 
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._ensure_workspace_prepared("master")
+        # Should NOT have called fetch --unshallow (performance optimization)
+        assert recorder.counts["--unshallow"] == 0
 
         # Should have called normal fetch
-        fetch_calls = [c for c in call_log if c[:2] == ["git", "fetch"]]
-        assert len(fetch_calls) == 1
-        assert fetch_calls[0] == ["git", "fetch", "origin", "master"]
+        assert recorder.counts[("git", "fetch")] == 1
+        assert recorder.last[("git", "fetch")] == [
+            "git",
+            "fetch",
+            "origin",
+            "master",
+        ]
 
     def test_workspace_prepared_flag_prevents_refetch(
-        self, tmp_path: Path
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Once prepared, subsequent calls don't refetch."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-
-        call_log: list[list[str]] = []
+        fake_run_cmd = make_fake(recorder=recorder)
 
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._ensure_workspace_prepared("master")
-            orch._ensure_workspace_prepared("master")  # Second call
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        orch._ensure_workspace_prepared("master")
+        orch._ensure_workspace_prepared("master")  # Second call
 
         # Should only have fetched once
-        fetch_calls = [c for c in call_log if c[:2] == ["git", "fetch"]]
-        assert len(fetch_calls) == 1
+        assert recorder.counts[("git", "fetch")] == 1
 
 
 class TestMergeSquashWithUnshallowFallback:
     """Tests for _merge_squash_with_unshallow_fallback method."""
 
-    def test_merge_success_first_attempt(self, tmp_path: Path) -> None:
+    def test_merge_success_first_attempt(
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Merge succeeds on first attempt without any deepening."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
+        fake_run_cmd = make_fake(recorder=recorder)
 
-        call_log: list[list[str]] = []
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(cmd)
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         # Should have called merge --squash exactly once
-        merge_calls = [c for c in call_log if "merge" in c and "--squash" in c]
-        assert len(merge_calls) == 1
-        assert merge_calls[0] == ["git", "merge", "--squash", "abc123"]
+        assert recorder.counts["--squash"] == 1
+        assert recorder.last["--squash"] == [
+            "git",
+            "merge",
+            "--squash",
+            "abc123",
+        ]
 
         # No deepen or unshallow calls
-        deepen_calls = [c for c in call_log if "--deepen=" in str(c)]
-        assert len(deepen_calls) == 0
-        unshallow_calls = [c for c in call_log if "--unshallow" in c]
-        assert len(unshallow_calls) == 0
+        assert recorder.counts["--deepen"] == 0
+        assert recorder.counts["--unshallow"] == 0
 
     def test_merge_fails_unrelated_histories_deepen_succeeds(
-        self, tmp_path: Path
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Merge fails with unrelated histories, deepen fixes it."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        merge_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                merge_attempts[0] += 1
-                if merge_attempts[0] == 1:
-                    raise CommandError(
-                        "fatal: refusing to merge unrelated histories",
-                        returncode=128,
-                        stderr="fatal: refusing to merge unrelated histories",
-                    )
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if cmd[:2] == ["git", "merge"] and "--abort" in cmd:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        fake_run_cmd = make_fake(
+            {
+                "merge": [_unrelated_histories_error(), OK],
+                "is-shallow": TRUE_SHALLOW,
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         # Should have attempted merge twice (before and after deepen)
-        assert merge_attempts[0] == 2
+        assert recorder.counts["--squash"] == 2
+
+    def test_shallow_state_queried_once_across_retry(
+        self,
+        nonshallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """The git shallow check runs once even though deepen consults it."""
+        fake_run_cmd = make_fake(
+            {
+                "merge": [_unrelated_histories_error(), OK],
+                "is-shallow": TRUE_SHALLOW,
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+
+        assert recorder.counts["--squash"] == 2
+        assert recorder.counts["--deepen"] == 1
+        assert recorder.counts[("git", "rev-parse")] == 1
 
     def test_merge_fails_unrelated_histories_deepen_insufficient_unshallow_succeeds(
-        self, tmp_path: Path
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Merge fails, deepen insufficient, full unshallow fixes it."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        merge_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                merge_attempts[0] += 1
-                if merge_attempts[0] <= 2:
-                    raise CommandError(
-                        "fatal: refusing to merge unrelated histories",
-                        returncode=128,
-                        stderr="fatal: refusing to merge unrelated histories",
-                    )
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if cmd[:2] == ["git", "merge"] and "--abort" in cmd:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if cmd[:3] == ["git", "fetch", "--unshallow"]:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        unrelated = _unrelated_histories_error()
+        fake_run_cmd = make_fake(
+            {
+                "merge": [unrelated, unrelated, OK],
+                "is-shallow": TRUE_SHALLOW,
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         # Should have attempted merge 3 times:
         # 1. Initial (fail), 2. After deepen (fail), 3. After unshallow (success)
-        assert merge_attempts[0] == 3
+        assert recorder.counts["--squash"] == 3
 
     def test_merge_fails_non_shallow_error_raises_immediately(
-        self, tmp_path: Path
+        self, nonshallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Merge fails with non-shallow error, raises immediately."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                raise CommandError(
-                    "Merge conflict in file.txt",
-                    returncode=1,
-                    stderr="CONFLICT (content): Merge conflict in file.txt",
-                )
-            return CommandResult(returncode=0, stdout="", stderr="")
+        fake_run_cmd = make_fake({"merge": _merge_conflict_error()})
 
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            with pytest.raises(CommandError) as exc_info:
-                orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        with pytest.raises(CommandError) as exc_info:
+            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         assert "conflict" in str(exc_info.value).lower()
 
     def test_merge_fails_unrelated_histories_not_shallow_raises(
-        self, tmp_path: Path
+        self, nonshallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Unrelated histories in a non-shallow clone raises immediately."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        # No shallow file — not a shallow clone
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                raise CommandError(
-                    "fatal: refusing to merge unrelated histories",
-                    returncode=128,
-                    stderr="fatal: refusing to merge unrelated histories",
-                )
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="false\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            with pytest.raises(CommandError) as exc_info:
-                orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        fake_run_cmd = make_fake(
+            {
+                "merge": _unrelated_histories_error(),
+                "is-shallow": FALSE_SHALLOW,
+            }
+        )
+
+        orch = _orchestrator(monkeypatch, nonshallow_repo_dir, fake_run_cmd)
+        with pytest.raises(CommandError) as exc_info:
+            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         assert "unrelated histories" in str(exc_info.value).lower()
 
     def test_merge_fails_all_recovery_fails_raises(
-        self, tmp_path: Path
+        self, shallow_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Merge fails, deepen and unshallow both fail, raises original error."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                raise CommandError(
-                    "fatal: refusing to merge unrelated histories",
-                    returncode=128,
-                    stderr="fatal: refusing to merge unrelated histories",
-                )
-            if cmd[:2] == ["git", "merge"] and "--abort" in cmd:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                raise CommandError("deepen failed", returncode=1)
-            if cmd[:3] == ["git", "fetch", "--unshallow"]:
-                raise CommandError("unshallow failed", returncode=1)
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            with pytest.raises(CommandError) as exc_info:
-                orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        fake_run_cmd = make_fake(
+            {
+                "merge": _unrelated_histories_error(),
+                "deepen": CommandError("deepen failed", returncode=1),
+                "unshallow": CommandError("unshallow failed", returncode=1),
+                "is-shallow": TRUE_SHALLOW,
+            }
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        with pytest.raises(CommandError) as exc_info:
+            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         assert "unrelated histories" in str(exc_info.value).lower()
 
-    def test_merge_abort_called_before_retry(self, tmp_path: Path) -> None:
+    def test_merge_abort_called_before_retry(
+        self,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Ensure git merge --abort is called before retrying merge."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        call_log: list[list[str]] = []
-        merge_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(list(cmd))
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                merge_attempts[0] += 1
-                if merge_attempts[0] == 1:
-                    raise CommandError(
-                        "fatal: refusing to merge unrelated histories",
-                        returncode=128,
-                        stderr="fatal: refusing to merge unrelated histories",
-                    )
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if cmd[:2] == ["git", "merge"] and "--abort" in cmd:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
+        fake_run_cmd = make_fake(
+            {
+                "merge": [_unrelated_histories_error(), OK],
+                "is-shallow": TRUE_SHALLOW,
+            },
+            recorder,
+        )
+        call_log = recorder.calls
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
         # Find the position of the abort call and the second merge call
         abort_indices = [
@@ -719,108 +952,67 @@ class TestMergeSquashWithUnshallowFallback:
         assert abort_indices[0] < second_merge_indices[1]
 
     @pytest.mark.parametrize(
-        "error_message,stderr_message",
+        "first_error,retry_outcome,expected_error",
         [
             (
-                "fatal: refusing to merge unrelated histories",
-                "fatal: refusing to merge unrelated histories",
+                CommandError(
+                    UNRELATED_HISTORIES,
+                    returncode=128,
+                    stderr=UNRELATED_HISTORIES,
+                ),
+                OK,
+                None,
             ),
             (
-                "merge failed: unrelated histories",
-                "unrelated histories detected",
+                CommandError(
+                    "merge failed: unrelated histories",
+                    returncode=128,
+                    stderr="unrelated histories detected",
+                ),
+                OK,
+                None,
             ),
             (
-                "no common ancestor found",
-                "fatal: no common ancestor",
+                CommandError(
+                    "no common ancestor found",
+                    returncode=128,
+                    stderr="fatal: no common ancestor",
+                ),
+                OK,
+                None,
             ),
+            # After deepen the error turns into a real merge conflict, which
+            # an expensive full unshallow cannot fix
+            (_unrelated_histories_error(), _merge_conflict_error(), "conflict"),
         ],
+        ids=["refuses", "merge-failed", "no-ancestor", "deepen-to-conflict"],
     )
-    def test_recognizes_unrelated_history_errors(
+    def test_unrelated_history_retries_once_after_deepen(
         self,
-        tmp_path: Path,
-        error_message: str,
-        stderr_message: str,
+        shallow_repo_dir: Path,
+        recorder: CmdRecorder,
+        first_error: CommandError,
+        retry_outcome: Outcome,
+        expected_error: str | None,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        """All variations of unrelated history errors trigger deepening."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        merge_attempts = [0]
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                merge_attempts[0] += 1
-                if merge_attempts[0] == 1:
-                    raise CommandError(
-                        error_message,
-                        returncode=128,
-                        stderr=stderr_message,
-                    )
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if cmd[:2] == ["git", "merge"] and "--abort" in cmd:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
+        """Unrelated history errors trigger one deepen-and-retry; a retry
+        that fails differently propagates without unshallowing."""
+        fake_run_cmd = make_fake(
+            {
+                "merge": [first_error, retry_outcome],
+                "is-shallow": TRUE_SHALLOW,
+            },
+            recorder=recorder,
+        )
+
+        orch = _orchestrator(monkeypatch, shallow_repo_dir, fake_run_cmd)
+        if expected_error is None:
             orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
-
-        # Should have attempted merge twice (before and after deepen)
-        assert merge_attempts[0] == 2
-
-    def test_deepen_changes_error_to_conflict_raises_without_unshallow(
-        self, tmp_path: Path
-    ) -> None:
-        """After deepen, if error changes from unrelated histories to a merge
-        conflict, raise immediately instead of attempting expensive unshallow."""
-        git_dir = tmp_path / ".git"
-        git_dir.mkdir()
-        (git_dir / "shallow").touch()
-
-        merge_attempts = [0]
-        call_log: list[list[str]] = []
-
-        def fake_run_cmd(cmd: list[str], **kwargs: Any) -> CommandResult:
-            call_log.append(list(cmd))
-            if cmd[:2] == ["git", "merge"] and "--squash" in cmd:
-                merge_attempts[0] += 1
-                if merge_attempts[0] == 1:
-                    # First attempt: unrelated histories (shallow clone issue)
-                    raise CommandError(
-                        "fatal: refusing to merge unrelated histories",
-                        returncode=128,
-                        stderr="fatal: refusing to merge unrelated histories",
-                    )
-                # Second attempt after deepen: now a real merge conflict
-                raise CommandError(
-                    "Merge conflict in file.txt",
-                    returncode=1,
-                    stderr="CONFLICT (content): Merge conflict in file.txt",
-                )
-            if cmd[:2] == ["git", "merge"] and "--abort" in cmd:
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "--deepen=" in str(cmd):
-                return CommandResult(returncode=0, stdout="", stderr="")
-            if "is-shallow-repository" in cmd:
-                return CommandResult(returncode=0, stdout="true\n", stderr="")
-            return CommandResult(returncode=0, stdout="", stderr="")
-
-        with patch("github2gerrit.core.run_cmd", side_effect=fake_run_cmd):
-            orch = Orchestrator(workspace=tmp_path)
-            with pytest.raises(CommandError) as exc_info:
+        else:
+            with pytest.raises(CommandError, match=expected_error):
                 orch._merge_squash_with_unshallow_fallback(head_sha="abc123")
 
-        # Should have raised the conflict error, not the original
-        assert "conflict" in str(exc_info.value).lower()
-
-        # Should have attempted merge twice only (no third attempt after unshallow)
-        assert merge_attempts[0] == 2
-
-        # Should NOT have attempted unshallow
-        unshallow_calls = [c for c in call_log if "--unshallow" in c]
-        assert len(unshallow_calls) == 0
+        # Merged once before and once after deepen, never after unshallow
+        assert recorder.counts["--squash"] == 2
+        assert recorder.counts["--unshallow"] == 0
@@ -73,18 +73,18 @@ def mock_github_context():
 class TestForceFlag:
     """Tests for --force flag behavior with Gerrit change URLs."""
 
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
-    @patch("github2gerrit.cli.check_gerrit_change_status")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_merged_change_without_force_raises_error(
         self,
-        mock_check_status,
-        mock_extract_pr,
+        mock_fetch,
         mock_inputs,
         mock_github_context,
     ):
         """Test that MERGED change without --force raises an error."""
-        mock_check_status.return_value = "MERGED"
-        mock_extract_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_fetch.return_value = (
+            "MERGED",
+            "https://github.com/owner/repo/pull/123",
+        )
         gerrit_url = "https://gerrit.example.org/c/project/+/12345"
 
         with pytest.raises(GitHub2GerritError) as exc_info:
@@ -99,18 +99,18 @@ class TestForceFlag:
         assert "already MERGED" in str(exc_info.value.message)
         assert "--force" in str(exc_info.value.message)
 
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
-    @patch("github2gerrit.cli.check_gerrit_change_status")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_abandoned_change_without_force_raises_error(
         self,
-        mock_check_status,
-        mock_extract_pr,
+        mock_fetch,
         mock_inputs,
         mock_github_context,
     ):
         """Test that ABANDONED change without --force raises an error."""
-        mock_check_status.return_value = "ABANDONED"
-        mock_extract_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_fetch.return_value = (
+            "ABANDONED",
+            "https://github.com/owner/repo/pull/123",
+        )
         gerrit_url = "https://gerrit.example.org/c/project/+/12345"
 
         with pytest.raises(GitHub2GerritError) as exc_info:
@@ -127,20 +127,20 @@ class TestForceFlag:
 
     @patch("github2gerrit.cli.close_pr_with_status")
     @patch("github2gerrit.cli.parse_pr_url")
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
-    @patch("github2gerrit.cli.check_gerrit_change_status")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_merged_change_with_force_proceeds(
         self,
-        mock_check_status,
-        mock_extract_pr,
+        mock_fetch,
         mock_parse_pr,
         mock_close_pr,
         mock_inputs,
         mock_github_context,
     ):
         """Test that MERGED change with --force proceeds successfully."""
-        mock_check_status.return_value = "MERGED"
-        mock_extract_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_fetch.return_value = (
+            "MERGED",
+            "https://github.com/owner/repo/pull/123",
+        )
         mock_parse_pr.return_value = ("owner", "repo", 123)
         mock_close_pr.return_value = None
 
@@ -159,20 +159,20 @@ class TestForceFlag:
 
     @patch("github2gerrit.cli.close_pr_with_status")
     @patch("github2gerrit.cli.parse_pr_url")
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
-    @patch("github2gerrit.cli.check_gerrit_change_status")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_abandoned_change_with_force_proceeds(
         self,
-        mock_check_status,
-        mock_extract_pr,
+        mock_fetch,
         mock_parse_pr,
         mock_close_pr,
         mock_inputs,
         mock_github_context,
     ):
         """Test that ABANDONED change with --force proceeds successfully."""
-        mock_check_status.return_value = "ABANDONED"
-        mock_extract_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_fetch.return_value = (
+            "ABANDONED",
+            "https://github.com/owner/repo/pull/123",
+        )
         mock_parse_pr.return_value = ("owner", "repo", 123)
         mock_close_pr.return_value = None
 
@@ -191,20 +191,20 @@ class TestForceFlag:
 
     @patch("github2gerrit.cli.close_pr_with_status")
     @patch("github2gerrit.cli.parse_pr_url")
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
-    @patch("github2gerrit.cli.check_gerrit_change_status")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_new_change_proceeds_without_force(
         self,
-        mock_check_status,
-        mock_extract_pr,
+        mock_fetch,
         mock_parse_pr,
         mock_close_pr,
         mock_inputs,
         mock_github_context,
     ):
         """Test that NEW change proceeds without requiring --force."""
-        mock_check_status.return_value = "NEW"
-        mock_extract_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_fetch.return_value = (
+            "NEW",
+            "https://github.com/owner/repo/pull/123",
+        )
         mock_parse_pr.return_value = ("owner", "repo", 123)
         mock_close_pr.return_value = None
 
@@ -223,20 +223,20 @@ class TestForceFlag:
 
     @patch("github2gerrit.cli.close_pr_with_status")
     @patch("github2gerrit.cli.parse_pr_url")
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
-    @patch("github2gerrit.cli.check_gerrit_change_status")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_unknown_status_proceeds_without_force(
         self,
-        mock_check_status,
-        mock_extract_pr,
+        mock_fetch,
         mock_parse_pr,
         mock_close_pr,
         mock_inputs,
         mock_github_context,
     ):
         """Test that UNKNOWN status proceeds without requiring --force."""
-        mock_check_status.return_value = "UNKNOWN"
-        mock_extract_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_fetch.return_value = (
+            "UNKNOWN",
+            "https://github.com/owner/repo/pull/123",
+        )
         mock_parse_pr.return_value = ("owner", "repo", 123)
         mock_close_pr.return_value = None
 
@@ -253,15 +253,15 @@ class TestForceFlag:
         # Verify PR closure was attempted
         mock_close_pr.assert_called_once()
 
-    @patch("github2gerrit.cli.extract_pr_url_from_gerrit_change")
+    @patch("github2gerrit.cli.fetch_change_status_and_pr_url")
     def test_merged_change_no_pr_url_returns_early(
         self,
-        mock_extract_pr,
+        mock_fetch,
         mock_inputs,
         mock_github_context,
     ):
         """Test that function returns early when no PR URL is found (no GitHub origin)."""
-        mock_extract_pr.return_value = None  # No PR URL found
+        mock_fetch.return_value = ("MERGED", None)  # No PR URL found
 
         gerrit_url = "https://gerrit.example.org/c/project/+/12345"
 
@@ -274,4 +274,4 @@ class TestForceFlag:
         )
 
         # Should check for PR URL and return early
-        mock_extract_pr.assert_called_once()
+        mock_fetch.assert_called_once_with(gerrit_url)
@@ -13,14 +13,21 @@ Verifies that:
 
 from __future__ import annotations
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+from github2gerrit.gerrit_pr_closer import _gerrit_client
+from github2gerrit.gerrit_pr_closer import _gerrit_warning_batch
+from github2gerrit.gerrit_pr_closer import _github_client
 from github2gerrit.gerrit_pr_closer import check_gerrit_change_status
+from github2gerrit.gerrit_pr_closer import clear_client_cache
 from github2gerrit.gerrit_pr_closer import (
     close_github_pr_for_merged_gerrit_change,
 )
 from github2gerrit.gerrit_pr_closer import extract_change_number_from_url
+from github2gerrit.gerrit_pr_closer import fetch_change_status_and_pr_url
 
 
 class TestExtractChangeNumberFromUrl:
@@ -71,7 +78,7 @@ class TestCheckGerritChangeStatus:
         status = check_gerrit_change_status(url)
 
         assert status == "MERGED"
-        mock_client.get.assert_called_once_with("/changes/12345")
+        mock_client.get.assert_called_once_with("/changes/12345/detail")
 
     @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
     def test_abandoned_change_status(self, mock_build_client):
@@ -116,6 +123,163 @@ class TestCheckGerritChangeStatus:
 
         assert status == "UNKNOWN"
 
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_repeated_status_checks_share_one_request(self, mock_build_client):
+        """Status checks on one change reuse the cached /detail response."""
+        mock_client = MagicMock()
+        mock_client.get.return_value = {"status": "MERGED"}
+        mock_build_client.return_value = mock_client
+
+        url = "https://gerrit.example.org/c/project/+/12345"
+        assert check_gerrit_change_status(url) == "MERGED"
+        assert check_gerrit_change_status(url) == "MERGED"
+        assert fetch_change_status_and_pr_url(url) == ("MERGED", None)
+
+        mock_client.get.assert_called_once_with("/changes/12345/detail")
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_repeated_failures_in_batch_warn_once(
+        self, mock_build_client, caplog
+    ):
+        """Repeated failures in a batch log one warning plus a summary."""
+        mock_client = MagicMock()
+        mock_client.get.side_effect = Exception("503 Service Unavailable")
+        mock_build_client.return_value = mock_client
+
+        with (
+            caplog.at_level(logging.WARNING, "github2gerrit.gerrit_pr_closer"),
+            _gerrit_warning_batch(),
+        ):
+            for number in (1, 2, 3):
+                url = f"https://gerrit.example.org/c/project/+/{number}"
+                assert check_gerrit_change_status(url) == "UNKNOWN"
+
+        warnings = [r.getMessage() for r in caplog.records]
+        assert len(warnings) == 2
+        assert "Gerrit change 1" in warnings[0]
+        assert "2 further Gerrit query failure(s)" in warnings[1]
+
+
+class TestFetchChangeStatusAndPrUrl:
+    """Tests for the combined status + PR URL lookup."""
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_single_detail_request(self, mock_build_client):
+        """Status and PR URL both come from one /detail response."""
+        mock_client = MagicMock()
+        mock_client.get.return_value = {
+            "status": "ABANDONED",
+            "current_revision": "abc123",
+            "revisions": {
+                "abc123": {
+                    "commit": {
+                        "message": (
+                            "Subject\n\n"
+                            "GitHub-PR: https://github.com/o/r/pull/7\n"
+                        )
+                    }
+                }
+            },
+        }
+        mock_build_client.return_value = mock_client
+
+        url = "https://gerrit.example.org/c/project/+/12345"
+        result = fetch_change_status_and_pr_url(url)
+
+        assert result == ("ABANDONED", "https://github.com/o/r/pull/7")
+        mock_client.get.assert_called_once_with("/changes/12345/detail")
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_detail_response_cached(self, mock_build_client):
+        """Repeated lookups of one change reuse the cached response."""
+        mock_client = MagicMock()
+        mock_client.get.return_value = {"status": "NEW"}
+        mock_build_client.return_value = mock_client
+
+        url = "https://gerrit.example.org/c/project/+/12345"
+        assert fetch_change_status_and_pr_url(url) == ("NEW", None)
+        assert fetch_change_status_and_pr_url(url) == ("NEW", None)
+
+        mock_client.get.assert_called_once_with("/changes/12345/detail")
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_client_reused_per_host(self, mock_build_client):
+        """One Gerrit client is built per host and reused across changes."""
+        mock_client = MagicMock()
+        mock_client.get.return_value = {"status": "NEW"}
+        mock_build_client.return_value = mock_client
+
+        fetch_change_status_and_pr_url(
+            "https://gerrit.example.org/c/project/+/1"
+        )
+        check_gerrit_change_status("https://gerrit.example.org/c/project/+/2")
+
+        mock_build_client.assert_called_once_with("gerrit.example.org")
+        assert mock_client.get.call_count == 2
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_client_not_shared_across_threads(self, mock_build_client):
+        """Each worker thread builds and keeps its own Gerrit client."""
+        mock_build_client.side_effect = lambda host: MagicMock()
+
+        main_client = _gerrit_client("gerrit.example.org")
+        assert _gerrit_client("gerrit.example.org") is main_client
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            worker_client = executor.submit(
+                _gerrit_client, "gerrit.example.org"
+            ).result()
+
+        assert worker_client is not main_client
+        assert mock_build_client.call_count == 2
+
+        clear_client_cache()
+        assert _gerrit_client("gerrit.example.org") is not main_client
+        assert mock_build_client.call_count == 3
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client")
+    def test_github_client_passes_token(self, mock_build_client, monkeypatch):
+        """The GitHub client is built with the configured token."""
+        monkeypatch.setenv("GITHUB_TOKEN", "ghp_example")
+
+        assert _github_client() is _github_client()
+
+        mock_build_client.assert_called_once_with("ghp_example")
+
+    @patch("github2gerrit.gerrit_pr_closer.time.monotonic")
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_detail_cache_expires(self, mock_build_client, mock_monotonic):
+        """Open changes are queried again once the short TTL has passed."""
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [{"status": "NEW"}, {"status": "MERGED"}]
+        mock_build_client.return_value = mock_client
+        mock_monotonic.side_effect = [1000.0, 1031.0, 1100.0]
+
+        url = "https://gerrit.example.org/c/project/+/12345"
+        assert fetch_change_status_and_pr_url(url)[0] == "NEW"
+        assert fetch_change_status_and_pr_url(url)[0] == "MERGED"
+        # Merged changes stay cached beyond the short TTL
+        assert fetch_change_status_and_pr_url(url)[0] == "MERGED"
+
+        assert mock_client.get.call_count == 2
+
+    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
+    def test_api_failure_returns_unknown(self, mock_build_client):
+        """API failures yield UNKNOWN status and no PR URL."""
+        mock_client = MagicMock()
+        mock_client.get.side_effect = Exception("API error")
+        mock_build_client.return_value = mock_client
+
+        url = "https://gerrit.example.org/c/project/+/12345"
+        assert fetch_change_status_and_pr_url(url) == ("UNKNOWN", None)
+
+    def test_invalid_url_returns_unknown(self):
+        """Invalid URLs yield UNKNOWN status and no PR URL."""
+        assert fetch_change_status_and_pr_url("https://invalid-url") == (
+            "UNKNOWN",
+            None,
+        )
+
 
 class TestForceFlag:
     """Tests for force flag behavior in PR closure."""
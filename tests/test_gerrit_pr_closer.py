@@ -9,18 +9,132 @@ Tests the functionality of closing GitHub PRs when Gerrit changes are merged.
 
 from __future__ import annotations
 
+from types import SimpleNamespace
+from unittest.mock import ANY
 from unittest.mock import MagicMock
-from unittest.mock import patch
+from unittest.mock import Mock
 
+import pytest
+from github.PullRequest import PullRequest
+from github.Repository import Repository
+
+from github2gerrit.gerrit_pr_closer import _build_abandoned_comment
+from github2gerrit.gerrit_pr_closer import _build_abandoned_notification_comment
 from github2gerrit.gerrit_pr_closer import _build_closure_comment
 from github2gerrit.gerrit_pr_closer import _env_bool
+from github2gerrit.gerrit_pr_closer import _github_error_kind
+from github2gerrit.gerrit_pr_closer import abandon_gerrit_change_for_closed_pr
 from github2gerrit.gerrit_pr_closer import (
     close_github_pr_for_merged_gerrit_change,
 )
+from github2gerrit.gerrit_pr_closer import close_pr_with_status
 from github2gerrit.gerrit_pr_closer import extract_pr_info_for_display
 from github2gerrit.gerrit_pr_closer import extract_pr_url_from_commit
 from github2gerrit.gerrit_pr_closer import parse_pr_url
 from github2gerrit.gerrit_pr_closer import process_recent_commits_for_pr_closure
+from github2gerrit.github_api import Github
+from github2gerrit.github_api import RateLimitExceededExceptionType
+
+
+# PR and Gerrit change the tests resolve commits to
+_PR_URL = "https://github.com/owner/repo/pull/123"
+_PR_REF = ("owner", "repo", 123)
+_GERRIT_CHANGE_URL = "https://gerrit.example.org/c/project/+/12345"
+_GERRIT_SERVER = "gerrit.example.com"
+
+# Shared failures raised by mocked git and GitHub calls
+_GIT_ERR = RuntimeError("Git error")
+_NOT_FOUND = RuntimeError("404 Not Found")
+_RATE_LIMITED = RuntimeError("API rate limit exceeded")
+
+
+def _mock_closer_attributes(monkeypatch, names):
+    """Replace each named gerrit_pr_closer attribute with a MagicMock.
+
+    Returns a namespace holding the mocks under the same names.
+    """
+    mocks = SimpleNamespace()
+    for name in names:
+        mock = MagicMock()
+        monkeypatch.setattr(f"github2gerrit.gerrit_pr_closer.{name}", mock)
+        setattr(mocks, name, mock)
+    return mocks
+
+
+# Collaborators of close_github_pr_for_merged_gerrit_change replaced by the
+# closer_mocks fixture
+_CLOSER_DEPENDENCIES = (
+    "extract_pr_url_from_commit",
+    "parse_pr_url",
+    "build_client",
+    "get_pull",
+    "close_pr",
+    "extract_pr_info_for_display",
+    "display_pr_info",
+    "check_gerrit_change_status",
+    "create_pr_comment",
+)
+
+
+@pytest.fixture
+def pr_graph():
+    """Open PR reachable through a mocked GitHub client and repository."""
+    pr = Mock(spec=PullRequest, state="open", number=123)
+    pr.user.login = "testuser"
+    pr.base.ref = "main"
+    pr.head.sha = "abc123"
+    repo = Mock(spec=Repository)
+    repo.get_pull.return_value = pr
+    client = Mock(spec=Github)
+    client.get_repo.return_value = repo
+    return SimpleNamespace(client=client, repo=repo, pr=pr)
+
+
+@pytest.fixture
+def closer_mocks(monkeypatch, pr_graph):
+    """Replace the PR closer's collaborators with MagicMocks.
+
+    Returns a namespace holding one mock per name in _CLOSER_DEPENDENCIES,
+    wired so the commit resolves to owner/repo#123 and to the open PR in
+    ``pr_graph``. Tests override only what their scenario changes.
+    """
+    mocks = _mock_closer_attributes(monkeypatch, _CLOSER_DEPENDENCIES)
+    mocks.extract_pr_url_from_commit.return_value = _PR_URL
+    mocks.parse_pr_url.return_value = _PR_REF
+    mocks.build_client.return_value = pr_graph.client
+    mocks.get_pull.return_value = pr_graph.pr
+    return mocks
+
+
+# Gerrit and GitHub entry points replaced by the abandon_mocks fixture
+_ABANDON_DEPENDENCIES = (
+    "build_client_for_host",
+    "build_client",
+    "get_pull",
+    "_abandon_gerrit_change",
+)
+
+
+@pytest.fixture
+def abandon_mocks(monkeypatch):
+    """Replace abandon_gerrit_change_for_closed_pr's collaborators.
+
+    ``gerrit`` is the REST client returned by build_client_for_host.
+    """
+    mocks = _mock_closer_attributes(monkeypatch, _ABANDON_DEPENDENCIES)
+    mocks.gerrit = mocks.build_client_for_host.return_value
+    return mocks
+
+
+@pytest.fixture
+def close_mock(monkeypatch):
+    """Replace close_github_pr_for_merged_gerrit_change with a MagicMock."""
+    mock = MagicMock()
+    monkeypatch.setattr(
+        "github2gerrit.gerrit_pr_closer.close_github_pr_for_merged_gerrit_change",
+        mock,
+    )
+    return mock
 
 
 class TestEnvBool:
@@ -71,12 +185,7 @@ class TestEnvBool:
         assert _env_bool("TEST_VAR", False) is True
 
 
-class TestExtractPrUrlFromCommit:
-    """Tests for extract_pr_url_from_commit function."""
-
-    def test_extracts_pr_url_from_commit_with_trailer(self):
-        """Test extracting PR URL from a commit with GitHub-PR trailer."""
-        commit_message = """Fix critical bug
+_MSG_SINGLE = """Fix critical bug
 
 This commit fixes a critical bug in the parser.
 
@@ -85,95 +194,160 @@ GitHub-PR: https://github.com/owner/repo/pull/123
 GitHub-Hash: abc123
 Signed-off-by: Developer <dev@example.com>"""
 
-        with patch("github2gerrit.gerrit_pr_closer.git_show") as mock_git_show:
-            mock_git_show.return_value = commit_message
+_MSG_MULTI = """Commit with multiple trailers
 
-            result = extract_pr_url_from_commit("abc123def456")
-
-            assert result == "https://github.com/owner/repo/pull/123"
-            mock_git_show.assert_called_once_with("abc123def456", fmt="%B")
+Change-Id: I1234567890abcdef1234567890abcdef12345678
+GitHub-PR: https://github.com/owner/repo/pull/111
+GitHub-PR: https://github.com/owner/repo/pull/222
+Signed-off-by: Developer <dev@example.com>"""
 
-    def test_returns_none_when_no_trailer(self):
-        """Test returns None when commit has no GitHub-PR trailer."""
-        commit_message = """Regular commit
+_MSG_NONE = """Regular commit
 
 Just a regular commit without any trailers.
 """
 
-        with patch("github2gerrit.gerrit_pr_closer.git_show") as mock_git_show:
-            mock_git_show.return_value = commit_message
-
-            result = extract_pr_url_from_commit("xyz789")
-
-            assert result is None
-
-    def test_returns_last_trailer_when_multiple(self):
-        """Test returns the last GitHub-PR trailer when multiple exist."""
-        commit_message = """Commit with multiple trailers
 
-Change-Id: I1234567890abcdef1234567890abcdef12345678
-GitHub-PR: https://github.com/owner/repo/pull/111
-GitHub-PR: https://github.com/owner/repo/pull/222
-Signed-off-by: Developer <dev@example.com>"""
+class TestExtractPrUrlFromCommit:
+    """Tests for extract_pr_url_from_commit function."""
 
-        with patch("github2gerrit.gerrit_pr_closer.git_show") as mock_git_show:
-            mock_git_show.return_value = commit_message
+    @pytest.mark.parametrize(
+        "commit_message,expected",
+        [
+            (_MSG_SINGLE, _PR_URL),
+            (_MSG_MULTI, "https://github.com/owner/repo/pull/222"),
+            (_MSG_NONE, None),
+        ],
+        ids=["trailer", "last-of-multiple", "no-trailer"],
+    )
+    def test_extracts_pr_url_trailer(
+        self, monkeypatch, commit_message, expected
+    ):
+        """Test the last GitHub-PR trailer wins and a missing one is None."""
+        mock_git_show = MagicMock(return_value=commit_message)
+        monkeypatch.setattr(
+            "github2gerrit.gerrit_pr_closer.git_show", mock_git_show
+        )
 
-            result = extract_pr_url_from_commit("commit123")
+        result = extract_pr_url_from_commit("abc123def456")
 
-            assert result == "https://github.com/owner/repo/pull/222"
+        assert result == expected
+        mock_git_show.assert_called_once_with("abc123def456", fmt="%B")
 
-    def test_handles_git_show_error(self):
+    def test_handles_git_show_error(self, monkeypatch):
         """Test gracefully handles git show errors."""
-        with patch("github2gerrit.gerrit_pr_closer.git_show") as mock_git_show:
-            mock_git_show.side_effect = Exception("Git error")
+        monkeypatch.setattr(
+            "github2gerrit.gerrit_pr_closer.git_show",
+            MagicMock(side_effect=_GIT_ERR),
+        )
 
-            result = extract_pr_url_from_commit("badcommit")
+        result = extract_pr_url_from_commit("badcommit")
 
-            assert result is None
+        assert result is None
 
 
 class TestParsePrUrl:
     """Tests for parse_pr_url function."""
 
-    def test_parses_valid_pr_url(self):
-        """Test parsing a valid GitHub PR URL."""
-        url = "https://github.com/owner/repo/pull/123"
-
-        result = parse_pr_url(url)
-
-        assert result == ("owner", "repo", 123)
-
-    def test_parses_http_url(self):
-        """Test parsing HTTP (not HTTPS) URL."""
-        url = "http://github.com/myorg/myrepo/pull/456"
-
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            (_PR_URL, _PR_REF),
+            (
+                "http://github.com/myorg/myrepo/pull/456",
+                ("myorg", "myrepo", 456),
+            ),
+            (
+                "https://github.com/test/test/pull/99999",
+                ("test", "test", 99999),
+            ),
+        ],
+        ids=["https", "http", "large-number"],
+    )
+    def test_parses_valid_pr_url(self, url, expected):
+        """Test parsing valid GitHub PR URLs into an integer PR number."""
         result = parse_pr_url(url)
 
-        assert result == ("myorg", "myrepo", 456)
+        assert result == expected
+        assert isinstance(result[2], int)
 
-    def test_returns_none_for_invalid_url(self):
-        """Test returns None for invalid URL format."""
-        invalid_urls = [
+    @pytest.mark.parametrize(
+        "url",
+        [
             "not-a-url",
             "https://gitlab.com/owner/repo/pull/123",
             "https://github.com/owner/repo/issues/123",
             "https://github.com/owner/repo",
             "github.com/owner/repo/pull/123",
-        ]
-
-        for url in invalid_urls:
-            result = parse_pr_url(url)
-            assert result is None, f"Expected None for {url}"
+        ],
+    )
+    def test_returns_none_for_invalid_url(self, url):
+        """Test returns None for invalid URL format."""
+        assert parse_pr_url(url) is None
+
+    def test_rejects_lookalike_hosts(self):
+        """Test hosts merely ending in 'github.com' are rejected."""
+        assert parse_pr_url("https://evilgithub.com/o/r/pull/1") is None
+        assert parse_pr_url("https://git.gitlab.com/o/r/pull/1") is None
+
+    def test_accepts_configured_ghe_host(self, monkeypatch):
+        """Test the GitHub Enterprise server from GITHUB_SERVER_URL."""
+        url = "https://ghe.example.com/owner/repo/pull/7"
+        monkeypatch.delenv("GITHUB_SERVER_URL", raising=False)
+        assert parse_pr_url(url) is None
+
+        monkeypatch.setenv("GITHUB_SERVER_URL", "https://ghe.example.com")
+        assert parse_pr_url(url) == ("owner", "repo", 7)
+
+
+class TestGithubErrorKind:
+    """Tests for _github_error_kind classification."""
+
+    def test_uses_structured_status(self):
+        """HTTP status on the exception decides the kind."""
+        for status, kind in (
+            (401, "auth"),
+            (403, "auth"),
+            (404, "not_found"),
+            (429, "rate_limit"),
+            (500, "other"),
+        ):
+            exc = Exception("opaque")
+            exc.status = status  # type: ignore[attr-defined]
+            assert _github_error_kind(exc) == kind
+
+    def test_rate_limit_exception_type(self):
+        """PyGithub's rate limit exception is recognized by type."""
+        assert (
+            _github_error_kind(RateLimitExceededExceptionType("x"))
+            == "rate_limit"
+        )
 
-    def test_handles_numeric_pr_numbers(self):
-        """Test correctly parses PR number as integer."""
-        url = "https://github.com/test/test/pull/99999"
+    def test_falls_back_to_message(self):
+        """Unstructured errors are classified from their message."""
+        assert _github_error_kind(Exception("404 Not Found")) == "not_found"
+        assert _github_error_kind(Exception("401 Unauthorized")) == "auth"
+        assert (
+            _github_error_kind(Exception("API rate limit exceeded"))
+            == "rate_limit"
+        )
+        assert _github_error_kind(Exception("boom")) == "other"
 
-        result = parse_pr_url(url)
+    def test_message_fallback_precedence(self):
+        """Auth markers win over not-found and rate-limit markers."""
+        assert (
+            _github_error_kind(Exception("403: rate limit, 404 not found"))
+            == "auth"
+        )
+        assert _github_error_kind(Exception("Rate Limit; 404")) == "not_found"
+        assert _github_error_kind(Exception("HTTP 429")) == "rate_limit"
 
-        assert result == ("test", "test", 99999)
-        assert isinstance(result[2], int)
+    def test_embedded_status_code_not_matched(self):
+        """Numbers that merely contain a status code are not classified."""
+        for message in (
+            "Timed out after 4290 ms",
+            "GET https://api.github.com/repos/o/r/pulls/1403 failed",
+        ):
+            assert _github_error_kind(Exception(message)) == "other"
 
 
 class TestExtractPrInfoForDisplay:
@@ -181,12 +355,12 @@ class TestExtractPrInfoForDisplay:
 
     def test_extracts_complete_pr_info(self):
         """Test extracting complete PR information."""
-        mock_pr = MagicMock()
+        mock_pr = Mock(spec=PullRequest)
         mock_pr.title = "Test PR Title"
         mock_pr.user.login = "testuser"
         mock_pr.base.ref = "main"
         mock_pr.head.sha = "abc123def456"
-        mock_pr.get_files.return_value = [MagicMock(), MagicMock()]  # 2 files
+        mock_pr.changed_files = 2
 
         result = extract_pr_info_for_display(
             mock_pr,
@@ -195,18 +369,20 @@ class TestExtractPrInfoForDisplay:
             pr_number=42,
         )
 
-        assert result["Repository"] == "owner/repo"
-        assert result["PR Number"] == 42
-        assert result["Title"] == "Test PR Title"
-        assert result["Author"] == "testuser"
-        assert result["Base Branch"] == "main"
-        assert result["SHA"] == "abc123def456"
-        assert result["URL"] == "https://github.com/owner/repo/pull/42"
-        assert result["Files Changed"] == 2
+        assert result.repository == "owner/repo"
+        assert result.pr_number == 42
+        assert result.title == "Test PR Title"
+        assert result.author == "testuser"
+        assert result.base_branch == "main"
+        assert result.sha == "abc123def456"
+        assert result.url == "https://github.com/owner/repo/pull/42"
+        assert result.files_changed == 2
+        assert dict(result.items())["Base Branch"] == "main"
+        mock_pr.get_files.assert_not_called()
 
     def test_handles_missing_user(self):
         """Test handles PR with missing user information."""
-        mock_pr = MagicMock()
+        mock_pr = Mock(spec=PullRequest)
         mock_pr.title = "Test PR"
         mock_pr.user = None
         mock_pr.base.ref = "main"
@@ -214,566 +390,359 @@ class TestExtractPrInfoForDisplay:
 
         result = extract_pr_info_for_display(mock_pr, "owner", "repo", 1)
 
-        assert result["Author"] == "Unknown"
+        assert result.author == "Unknown"
 
-    def test_handles_files_error(self):
-        """Test handles error when fetching file count."""
-        mock_pr = MagicMock()
+    def test_handles_missing_file_count(self):
+        """Test handles PR without a changed files count."""
+        mock_pr = Mock(spec=PullRequest)
         mock_pr.title = "Test PR"
         mock_pr.user.login = "testuser"
         mock_pr.base.ref = "main"
         mock_pr.head.sha = "abc123"
-        mock_pr.get_files.side_effect = Exception("API error")
+        mock_pr.changed_files = None
 
         result = extract_pr_info_for_display(mock_pr, "owner", "repo", 1)
 
-        assert result["Files Changed"] == "unknown"
+        assert result.files_changed == "unknown"
 
 
 class TestBuildClosureComment:
-    """Tests for _build_closure_comment function."""
-
-    def test_builds_comment_with_gerrit_url(self):
-        """Test builds comment with Gerrit change URL."""
-        gerrit_url = "https://gerrit.example.com/c/project/+/12345"
-
-        result = _build_closure_comment(gerrit_url)
-
-        assert "**Automated PR Closure**" in result
-        assert "merged" in result.lower()
-        assert gerrit_url in result
-        assert "GitHub2Gerrit" in result
-
-    def test_builds_comment_without_gerrit_url(self):
-        """Test builds comment without Gerrit change URL."""
-        result = _build_closure_comment(None)
+    """Tests for the PR comment builders."""
+
+    @pytest.mark.parametrize(
+        "builder,gerrit_url,required,forbidden",
+        [
+            (
+                _build_closure_comment,
+                _GERRIT_CHANGE_URL,
+                ["**Automated PR Closure**", "merged", "GitHub2Gerrit"],
+                [],
+            ),
+            (
+                _build_closure_comment,
+                None,
+                ["**Automated PR Closure**", "merged", "GitHub2Gerrit"],
+                ["https://"],
+            ),
+            (
+                _build_abandoned_comment,
+                _GERRIT_CHANGE_URL,
+                [
+                    "Automated PR Closure",
+                    "⛔️",
+                    "abandoned",
+                    "rejected",
+                    "NOT part of the main codebase",
+                ],
+                [],
+            ),
+            (
+                _build_abandoned_comment,
+                None,
+                [
+                    "Automated PR Closure",
+                    "⛔️",
+                    "abandoned",
+                    "rejected",
+                    "NOT part of the main codebase",
+                ],
+                ["https://"],
+            ),
+            (
+                _build_abandoned_notification_comment,
+                _GERRIT_CHANGE_URL,
+                [
+                    "Gerrit Change Abandoned",
+                    "🏳️",
+                    "abandoned",
+                    "remains open",
+                    "CLOSE_MERGED_PRS",
+                    "disabled",
+                ],
+                [],
+            ),
+            (
+                _build_abandoned_notification_comment,
+                None,
+                ["Gerrit Change Abandoned", "🏳️", "abandoned", "remains open"],
+                ["https://"],
+            ),
+        ],
+        ids=[
+            "closure-url",
+            "closure-no-url",
+            "abandoned-url",
+            "abandoned-no-url",
+            "notification-url",
+            "notification-no-url",
+        ],
+    )
+    def test_builds_comment(self, builder, gerrit_url, required, forbidden):
+        """Test each comment carries its markers and the optional URL."""
+        comment = builder(gerrit_url)
 
-        assert "**Automated PR Closure**" in result
-        assert "merged" in result.lower()
-        assert "https://" not in result  # No specific URL
-        assert "GitHub2Gerrit" in result
+        if gerrit_url:
+            required = [*required, gerrit_url]
+        for text in required:
+            assert text in comment
+        for text in forbidden:
+            assert text not in comment
 
 
 class TestCloseGithubPrForMergedGerritChange:
     """Tests for close_github_pr_for_merged_gerrit_change function."""
 
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    @patch("github2gerrit.gerrit_pr_closer.close_pr")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_info_for_display")
-    @patch("github2gerrit.gerrit_pr_closer.display_pr_info")
-    def test_closes_pr_successfully(
-        self,
-        mock_display,
-        mock_extract_info,
-        mock_close,
-        mock_get_pull,
-        mock_build_client,
-        mock_parse_url,
-        mock_extract_url,
-    ):
+    def test_closes_pr_successfully(self, closer_mocks, pr_graph):
         """Test successfully closing a GitHub PR."""
-        # Setup mocks
-        mock_extract_url.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse_url.return_value = ("owner", "repo", 123)
-
-        mock_client = MagicMock()
-        mock_repo = MagicMock()
-        mock_pr = MagicMock()
-        mock_pr.state = "open"
-
-        mock_build_client.return_value = mock_client
-        mock_client.get_repo.return_value = mock_repo
-        mock_get_pull.return_value = mock_pr
-        mock_extract_info.return_value = {"PR Number": 123}
-
-        # Execute
         result = close_github_pr_for_merged_gerrit_change("abc123")
 
-        # Verify
         assert result is True
-        mock_extract_url.assert_called_once_with("abc123")
-        mock_parse_url.assert_called_once_with(
-            "https://github.com/owner/repo/pull/123"
+        closer_mocks.extract_pr_url_from_commit.assert_called_once_with(
+            "abc123", None
         )
-        mock_client.get_repo.assert_called_once_with("owner/repo")
-        mock_get_pull.assert_called_once_with(mock_repo, 123)
-        mock_close.assert_called_once()
-
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    def test_returns_false_when_no_pr_url(self, mock_extract_url):
-        """Test returns False when commit has no PR URL."""
-        mock_extract_url.return_value = None
-
-        result = close_github_pr_for_merged_gerrit_change("commit123")
-
-        assert result is False
-
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    def test_returns_false_when_invalid_pr_url(
-        self, mock_parse_url, mock_extract_url
-    ):
-        """Test returns False when PR URL is invalid."""
-        mock_extract_url.return_value = "invalid-url"
-        mock_parse_url.return_value = None
-
-        result = close_github_pr_for_merged_gerrit_change("commit123")
-
-        assert result is False
-
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_info_for_display")
-    @patch("github2gerrit.gerrit_pr_closer.display_pr_info")
-    def test_returns_false_when_pr_already_closed(
-        self,
-        mock_display,
-        mock_extract_info,
-        mock_get_pull,
-        mock_build_client,
-        mock_parse_url,
-        mock_extract_url,
+        closer_mocks.parse_pr_url.assert_called_once_with(_PR_URL)
+        pr_graph.client.get_repo.assert_called_once_with("owner/repo")
+        closer_mocks.get_pull.assert_called_once_with(pr_graph.repo, 123)
+        closer_mocks.close_pr.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "pr_url,parsed,fetch_error",
+        [
+            (None, None, None),
+            ("invalid-url", None, None),
+            (_PR_URL, _PR_REF, _NOT_FOUND),
+            (_PR_URL, _PR_REF, _RATE_LIMITED),
+        ],
+        ids=["no-pr-url", "invalid-pr-url", "pr-not-found", "api-error"],
+    )
+    def test_returns_false_without_usable_pr(
+        self, closer_mocks, pr_url, parsed, fetch_error
     ):
-        """Test returns False when PR already closed (non-fatal)."""
-        mock_extract_url.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse_url.return_value = ("owner", "repo", 123)
-
-        mock_client = MagicMock()
-        mock_repo = MagicMock()
-        mock_pr = MagicMock()
-        mock_pr.state = "closed"  # Already closed
-
-        mock_build_client.return_value = mock_client
-        mock_client.get_repo.return_value = mock_repo
-        mock_get_pull.return_value = mock_pr
+        """Test missing URLs and GitHub fetch errors are non-fatal."""
+        closer_mocks.extract_pr_url_from_commit.return_value = pr_url
+        closer_mocks.parse_pr_url.return_value = parsed
+        closer_mocks.get_pull.side_effect = fetch_error
 
         result = close_github_pr_for_merged_gerrit_change("abc123")
 
         assert result is False
+        closer_mocks.close_pr.assert_not_called()
 
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    def test_returns_false_when_pr_not_found(
-        self,
-        mock_get_pull,
-        mock_build_client,
-        mock_parse_url,
-        mock_extract_url,
-    ):
-        """Test returns False when PR not found (404) - non-fatal."""
-        mock_extract_url.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse_url.return_value = ("owner", "repo", 123)
-
-        mock_client = MagicMock()
-        mock_repo = MagicMock()
-
-        mock_build_client.return_value = mock_client
-        mock_client.get_repo.return_value = mock_repo
-
-        # Simulate 404 error when fetching PR
-        mock_get_pull.side_effect = Exception("404 Not Found")
+    def test_returns_false_when_pr_already_closed(self, closer_mocks, pr_graph):
+        """Test returns False when PR already closed (non-fatal)."""
+        pr_graph.pr.state = "closed"  # Already closed
 
-        # Should return False without raising exception
         result = close_github_pr_for_merged_gerrit_change("abc123")
 
         assert result is False
 
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    def test_returns_false_on_api_error(
-        self,
-        mock_get_pull,
-        mock_build_client,
-        mock_parse_url,
-        mock_extract_url,
-    ):
-        """Test returns False on GitHub API error - non-fatal."""
-        mock_extract_url.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse_url.return_value = ("owner", "repo", 123)
+    def test_dry_run_mode(self, closer_mocks):
+        """Test dry-run mode doesn't actually close PR."""
+        result = close_github_pr_for_merged_gerrit_change(
+            "abc123", dry_run=True
+        )
 
-        mock_client = MagicMock()
-        mock_repo = MagicMock()
+        assert result is True
+        closer_mocks.close_pr.assert_not_called()  # Should not close in dry-run
 
-        mock_build_client.return_value = mock_client
-        mock_client.get_repo.return_value = mock_repo
 
-        # Simulate API error
-        mock_get_pull.side_effect = Exception("API rate limit exceeded")
+class TestClosePrWithStatus:
+    """Tests for close_pr_with_status function."""
 
-        # Should return False without raising exception
-        result = close_github_pr_for_merged_gerrit_change("abc123")
+    def test_skips_github_when_nothing_to_do(self, closer_mocks):
+        """Test no GitHub calls when merged PRs are not to be closed."""
+        result = close_pr_with_status(
+            _PR_URL,
+            None,
+            "MERGED",
+            close_merged_prs=False,
+        )
 
         assert result is False
+        closer_mocks.build_client.assert_not_called()
 
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_info_for_display")
-    @patch("github2gerrit.gerrit_pr_closer.display_pr_info")
-    def test_dry_run_mode(
-        self,
-        mock_display,
-        mock_extract_info,
-        mock_get_pull,
-        mock_build_client,
-        mock_parse_url,
-        mock_extract_url,
+    def test_reports_change_number_for_nested_project(
+        self, closer_mocks, monkeypatch
     ):
-        """Test dry-run mode doesn't actually close PR."""
-        mock_extract_url.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse_url.return_value = ("owner", "repo", 123)
-
-        mock_client = MagicMock()
-        mock_repo = MagicMock()
-        mock_pr = MagicMock()
-        mock_pr.state = "open"
-
-        mock_build_client.return_value = mock_client
-        mock_client.get_repo.return_value = mock_repo
-        mock_get_pull.return_value = mock_pr
-        mock_extract_info.return_value = {"PR Number": 123}
+        """Test the closure message names changes in nested projects."""
+        mock_print = MagicMock()
+        monkeypatch.setattr(
+            "github2gerrit.gerrit_pr_closer.safe_console_print", mock_print
+        )
 
-        with patch("github2gerrit.gerrit_pr_closer.close_pr") as mock_close:
-            result = close_github_pr_for_merged_gerrit_change(
-                "abc123", dry_run=True
-            )
+        result = close_pr_with_status(
+            _PR_URL,
+            "https://gerrit.example.org/infra/c/releng/lftools/+/678",
+            "MERGED",
+        )
 
-            assert result is True
-            mock_close.assert_not_called()  # Should not close in dry-run
+        assert result is True
+        mock_print.assert_called_once()
+        assert "Gerrit change 678" in mock_print.call_args.args[0]
 
 
 class TestProcessRecentCommitsForPrClosure:
     """Tests for process_recent_commits_for_pr_closure function."""
 
-    @patch(
-        "github2gerrit.gerrit_pr_closer.close_github_pr_for_merged_gerrit_change"
+    @pytest.mark.parametrize(
+        "outcomes,expected",
+        [
+            ([True, False, True], 2),
+            ([True, True, True], 3),
+            ([False, False, False], 0),
+        ],
+        ids=["mixed", "all-closed", "all-fail"],
     )
-    def test_processes_multiple_commits(self, mock_close):
-        """Test processing multiple commits."""
-        mock_close.side_effect = [True, False, True]  # Close 2 out of 3
+    def test_counts_closed_prs(self, close_mock, outcomes, expected):
+        """Test every commit is tried and only successful closures count.
 
-        commits = ["commit1", "commit2", "commit3"]
-        result = process_recent_commits_for_pr_closure(commits)
+        Failures are reported as False by the per-commit helper, so they
+        never raise and never stop the batch.
+        """
+        close_mock.side_effect = outcomes
 
-        assert result == 2
-        assert mock_close.call_count == 3
+        result = process_recent_commits_for_pr_closure(
+            ["commit1", "commit2", "commit3"]
+        )
 
-    @patch(
-        "github2gerrit.gerrit_pr_closer.close_github_pr_for_merged_gerrit_change"
-    )
-    def test_returns_zero_for_empty_list(self, mock_close):
+        assert result == expected
+        assert close_mock.call_count == 3
+
+    def test_returns_zero_for_empty_list(self, close_mock):
         """Test returns 0 when no commits provided."""
         result = process_recent_commits_for_pr_closure([])
 
         assert result == 0
-        mock_close.assert_not_called()
+        close_mock.assert_not_called()
 
-    @patch(
-        "github2gerrit.gerrit_pr_closer.close_github_pr_for_merged_gerrit_change"
-    )
-    def test_continues_on_error(self, mock_close):
-        """Test continues processing commits even when one fails."""
-        # Since the function is now non-fatal, it returns False on errors
-        mock_close.side_effect = [
-            True,
-            False,  # Returns False on error (non-fatal)
-            True,
-        ]
-
-        commits = ["commit1", "commit2", "commit3"]
-        result = process_recent_commits_for_pr_closure(commits)
-
-        assert result == 2  # Should have closed 2
-        assert mock_close.call_count == 3  # Should have tried all 3
-
-    @patch(
-        "github2gerrit.gerrit_pr_closer.close_github_pr_for_merged_gerrit_change"
-    )
-    def test_dry_run_mode_propagates(self, mock_close):
+    def test_dry_run_mode_propagates(self, close_mock):
         """Test dry-run mode propagates to individual close calls."""
-        mock_close.return_value = True
+        close_mock.return_value = True
 
         commits = ["commit1", "commit2"]
         process_recent_commits_for_pr_closure(commits, dry_run=True)
 
         # Verify dry_run=True passed to each call
-        for call_args in mock_close.call_args_list:
-            assert call_args[1]["dry_run"] is True
-
-    @patch(
-        "github2gerrit.gerrit_pr_closer.close_github_pr_for_merged_gerrit_change"
-    )
-    def test_no_exceptions_on_failures(self, mock_close):
-        """Test that failures don't raise exceptions (non-fatal behavior)."""
-        # Simulate various failure scenarios by returning False
-        mock_close.side_effect = [False, False, False]
-
-        commits = ["commit1", "commit2", "commit3"]
+        assert close_mock.call_count == 2
+        for call in close_mock.call_args_list:
+            assert call.kwargs["dry_run"] is True
+
+    def test_skips_duplicate_shas_and_pr_urls(self, close_mock, monkeypatch):
+        """Test each SHA and each referenced PR is processed only once."""
+        close_mock.return_value = True
+        pr_msg = "Fix\n\nGitHub-PR: https://github.com/owner/repo/pull/1\n"
+        messages = {
+            "commit1": pr_msg,
+            "commit2": pr_msg,  # Same PR as commit1
+            "commit3": "Other\n",  # No PR trailer
+        }
+
+        monkeypatch.setattr(
+            "github2gerrit.gerrit_pr_closer.git_show_many",
+            MagicMock(return_value=messages),
+        )
 
-        # Should not raise any exceptions
-        result = process_recent_commits_for_pr_closure(commits)
+        result = process_recent_commits_for_pr_closure(
+            ["commit1", "commit2", "commit1", "commit3"]
+        )
 
-        # All failed, so closed_count should be 0
-        assert result == 0
-        assert mock_close.call_count == 3
+        assert result == 2
+        processed = sorted(c[0][0] for c in close_mock.call_args_list)
+        assert processed == ["commit1", "commit3"]
 
 
 class TestAbandonedChangeHandling:
     """Tests for handling abandoned Gerrit changes."""
 
-    def test_build_abandoned_comment_with_url(self):
-        """Test building abandoned comment with Gerrit URL."""
-        from github2gerrit.gerrit_pr_closer import _build_abandoned_comment
-
-        url = "https://gerrit.example.org/c/project/+/12345"
-        comment = _build_abandoned_comment(url)
-
-        assert "Automated PR Closure" in comment
-        assert "⛔️" in comment
-        assert "abandoned" in comment
-        assert "rejected" in comment
-        assert url in comment
-        assert "NOT part of the main codebase" in comment
-
-    def test_build_abandoned_comment_without_url(self):
-        """Test building abandoned comment without Gerrit URL."""
-        from github2gerrit.gerrit_pr_closer import _build_abandoned_comment
-
-        comment = _build_abandoned_comment(None)
-
-        assert "Automated PR Closure" in comment
-        assert "⛔️" in comment
-        assert "abandoned" in comment
-        assert "rejected" in comment
-        assert "NOT part of the main codebase" in comment
-
-    def test_build_abandoned_notification_comment_with_url(self):
-        """Test building abandoned notification comment with Gerrit URL."""
-        from github2gerrit.gerrit_pr_closer import (
-            _build_abandoned_notification_comment,
-        )
-
-        url = "https://gerrit.example.org/c/project/+/12345"
-        comment = _build_abandoned_notification_comment(url)
-
-        assert "Gerrit Change Abandoned" in comment
-        assert "🏳️" in comment
-        assert "abandoned" in comment
-        assert url in comment
-        assert "remains open" in comment
-        assert "CLOSE_MERGED_PRS" in comment
-        assert "disabled" in comment
-
-    def test_build_abandoned_notification_comment_without_url(self):
-        """Test building abandoned notification comment without Gerrit URL."""
-        from github2gerrit.gerrit_pr_closer import (
-            _build_abandoned_notification_comment,
-        )
-
-        comment = _build_abandoned_notification_comment(None)
-
-        assert "Gerrit Change Abandoned" in comment
-        assert "🏳️" in comment
-        assert "abandoned" in comment
-        assert "remains open" in comment
-
-    @patch("github2gerrit.gerrit_pr_closer.check_gerrit_change_status")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.close_pr")
     def test_close_pr_when_abandoned_and_close_merged_prs_true(
-        self,
-        mock_close_pr,
-        mock_build_client,
-        mock_parse,
-        mock_extract,
-        mock_check_status,
+        self, closer_mocks, pr_graph
     ):
         """Test PR is closed when change is abandoned and close_merged_prs=True."""
-        # Setup mocks
-        mock_check_status.return_value = "ABANDONED"
-        mock_extract.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse.return_value = ("owner", "repo", 123)
-
-        # Mock GitHub API
-        mock_pr = MagicMock()
-        mock_pr.state = "open"
-        mock_pr.number = 123
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
-        mock_build_client.return_value = mock_client
+        closer_mocks.check_gerrit_change_status.return_value = "ABANDONED"
 
         # Call function with close_merged_prs=True (default)
         result = close_github_pr_for_merged_gerrit_change(
             "abc123",
-            gerrit_change_url="https://gerrit.example.org/c/project/+/12345",
+            gerrit_change_url=_GERRIT_CHANGE_URL,
             close_merged_prs=True,
         )
 
         assert result is True
-        mock_close_pr.assert_called_once()
+        closer_mocks.close_pr.assert_called_once_with(pr_graph.pr, comment=ANY)
         # Verify the comment contains abandoned message
-        call_args = mock_close_pr.call_args
-        comment = call_args[1]["comment"]
-        assert "abandoned" in comment.lower()
-        assert "rejected" in comment.lower()
+        comment = closer_mocks.close_pr.call_args.kwargs["comment"].lower()
+        assert "abandoned" in comment
+        assert "rejected" in comment
         assert "⛔️" in comment
 
-    @patch("github2gerrit.gerrit_pr_closer.check_gerrit_change_status")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.create_pr_comment")
-    @patch("github2gerrit.gerrit_pr_closer.close_pr")
     def test_comment_only_when_abandoned_and_close_merged_prs_false(
-        self,
-        mock_close_pr,
-        mock_create_comment,
-        mock_build_client,
-        mock_parse,
-        mock_extract,
-        mock_check_status,
+        self, closer_mocks, pr_graph
     ):
         """Test only comment added when change is abandoned and close_merged_prs=False."""
-        # Setup mocks
-        mock_check_status.return_value = "ABANDONED"
-        mock_extract.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse.return_value = ("owner", "repo", 123)
-
-        # Mock GitHub API
-        mock_pr = MagicMock()
-        mock_pr.state = "open"
-        mock_pr.number = 123
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
-        mock_build_client.return_value = mock_client
+        closer_mocks.check_gerrit_change_status.return_value = "ABANDONED"
 
         # Call function with close_merged_prs=False
         result = close_github_pr_for_merged_gerrit_change(
             "abc123",
-            gerrit_change_url="https://gerrit.example.org/c/project/+/12345",
+            gerrit_change_url=_GERRIT_CHANGE_URL,
             close_merged_prs=False,
         )
 
         assert result is True
-        # PR should NOT be closed
-        mock_close_pr.assert_not_called()
-        # Comment should be added
-        mock_create_comment.assert_called_once()
+        # PR should NOT be closed, only commented on
+        closer_mocks.close_pr.assert_not_called()
+        closer_mocks.create_pr_comment.assert_called_once_with(pr_graph.pr, ANY)
         # Verify the comment contains abandoned notification
-        call_args = mock_create_comment.call_args
-        comment = call_args[0][1]
-        assert "abandoned" in comment.lower()
-        assert "remains open" in comment.lower()
+        comment = closer_mocks.create_pr_comment.call_args.args[1].lower()
+        assert "abandoned" in comment
+        assert "remains open" in comment
         assert "🏳️" in comment
 
-    @patch("github2gerrit.gerrit_pr_closer.check_gerrit_change_status")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
-    @patch("github2gerrit.gerrit_pr_closer.parse_pr_url")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.close_pr")
     def test_close_pr_when_merged_and_close_merged_prs_true(
-        self,
-        mock_close_pr,
-        mock_build_client,
-        mock_parse,
-        mock_extract,
-        mock_check_status,
+        self, closer_mocks, pr_graph
     ):
         """Test PR is closed when change is merged and close_merged_prs=True."""
-        # Setup mocks
-        mock_check_status.return_value = "MERGED"
-        mock_extract.return_value = "https://github.com/owner/repo/pull/123"
-        mock_parse.return_value = ("owner", "repo", 123)
-
-        # Mock GitHub API
-        mock_pr = MagicMock()
-        mock_pr.state = "open"
-        mock_pr.number = 123
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
-        mock_build_client.return_value = mock_client
+        closer_mocks.check_gerrit_change_status.return_value = "MERGED"
 
         # Call function with close_merged_prs=True
         result = close_github_pr_for_merged_gerrit_change(
             "abc123",
-            gerrit_change_url="https://gerrit.example.org/c/project/+/12345",
+            gerrit_change_url=_GERRIT_CHANGE_URL,
             close_merged_prs=True,
         )
 
         assert result is True
-        mock_close_pr.assert_called_once()
+        closer_mocks.close_pr.assert_called_once_with(pr_graph.pr, comment=ANY)
         # Verify the comment contains merged message (not abandoned)
-        call_args = mock_close_pr.call_args
-        comment = call_args[1]["comment"]
-        assert "merged" in comment.lower()
-        assert "abandoned" not in comment.lower()
+        comment = closer_mocks.close_pr.call_args.kwargs["comment"].lower()
+        assert "merged" in comment
+        assert "abandoned" not in comment
 
-    @patch("github2gerrit.gerrit_pr_closer.check_gerrit_change_status")
-    @patch("github2gerrit.gerrit_pr_closer.extract_pr_url_from_commit")
     def test_no_action_when_merged_and_close_merged_prs_false(
-        self,
-        mock_extract,
-        mock_check_status,
+        self, closer_mocks
     ):
         """Test no action taken when change is merged and close_merged_prs=False."""
-        # Setup mocks
-        mock_check_status.return_value = "MERGED"
-        mock_extract.return_value = "https://github.com/owner/repo/pull/123"
+        closer_mocks.check_gerrit_change_status.return_value = "MERGED"
 
         # Call function with close_merged_prs=False
         result = close_github_pr_for_merged_gerrit_change(
             "abc123",
-            gerrit_change_url="https://gerrit.example.org/c/project/+/12345",
+            gerrit_change_url=_GERRIT_CHANGE_URL,
             close_merged_prs=False,
         )
 
         # Should return False (no action taken)
         assert result is False
+        closer_mocks.build_client.assert_not_called()
 
 
 class TestAbandonGerritChangeForClosedPr:
     """Tests for abandon_gerrit_change_for_closed_pr function."""
 
-    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    @patch("github2gerrit.gerrit_pr_closer._abandon_gerrit_change")
-    def test_abandons_gerrit_change_for_closed_pr(
-        self,
-        mock_abandon,
-        mock_get_pull,
-        mock_build_client,
-        mock_build_gerrit_client,
-    ):
+    def test_abandons_gerrit_change_for_closed_pr(self, abandon_mocks):
         """Test successfully abandons Gerrit change when PR is closed."""
-        from github2gerrit.gerrit_pr_closer import (
-            abandon_gerrit_change_for_closed_pr,
-        )
-
-        # Setup Gerrit client mock
-        mock_gerrit_client = MagicMock()
-        mock_build_gerrit_client.return_value = mock_gerrit_client
-
         # Mock Gerrit query response with matching change
-        mock_gerrit_client.get.return_value = [
+        abandon_mocks.gerrit.get.return_value = [
             {
                 "_number": "12345",
                 "subject": "Test change",
@@ -792,11 +761,9 @@ class TestAbandonGerritChangeForClosedPr:
         ]
 
         # Setup GitHub client mock
-        mock_repo = MagicMock()
-        mock_build_client.return_value.get_repo.return_value = mock_repo
         mock_pr = MagicMock()
         mock_pr.number = 42
-        mock_get_pull.return_value = mock_pr
+        abandon_mocks.get_pull.return_value = mock_pr
 
         # Mock PR comments
         mock_issue = MagicMock()
@@ -809,7 +776,7 @@ class TestAbandonGerritChangeForClosedPr:
         # Call function
         result = abandon_gerrit_change_for_closed_pr(
             pr_number=42,
-            gerrit_server="gerrit.example.com",
+            gerrit_server=_GERRIT_SERVER,
             gerrit_project="test-project",
             repository="owner/repo",
             dry_run=False,
@@ -817,33 +784,22 @@ class TestAbandonGerritChangeForClosedPr:
 
         # Verify result
         assert result == "12345"
-        mock_abandon.assert_called_once()
-        call_args = mock_abandon.call_args
-        assert call_args[0][1] == "12345"  # change_number
-        assert "GitHub pull request #42 was closed" in call_args[0][2]
-        assert "Closing this PR" in call_args[0][2]
-
-    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
-    def test_returns_false_when_no_matching_change(
-        self,
-        mock_build_gerrit_client,
-    ):
-        """Test returns False when no matching Gerrit change found."""
-        from github2gerrit.gerrit_pr_closer import (
-            abandon_gerrit_change_for_closed_pr,
+        abandon_mocks._abandon_gerrit_change.assert_called_once_with(
+            abandon_mocks.gerrit, "12345", ANY
         )
+        abandon_message = abandon_mocks._abandon_gerrit_change.call_args.args[2]
+        assert "GitHub pull request #42 was closed" in abandon_message
+        assert "Closing this PR" in abandon_message
 
-        # Setup Gerrit client mock
-        mock_gerrit_client = MagicMock()
-        mock_build_gerrit_client.return_value = mock_gerrit_client
-
+    def test_returns_false_when_no_matching_change(self, abandon_mocks):
+        """Test returns False when no matching Gerrit change found."""
         # Mock empty Gerrit query response
-        mock_gerrit_client.get.return_value = []
+        abandon_mocks.gerrit.get.return_value = []
 
         # Call function
         result = abandon_gerrit_change_for_closed_pr(
             pr_number=42,
-            gerrit_server="gerrit.example.com",
+            gerrit_server=_GERRIT_SERVER,
             gerrit_project="test-project",
             repository="owner/repo",
             dry_run=False,
@@ -852,22 +808,10 @@ class TestAbandonGerritChangeForClosedPr:
         # Verify result
         assert result is None
 
-    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
-    def test_returns_false_when_no_pr_url_match(
-        self,
-        mock_build_gerrit_client,
-    ):
+    def test_returns_false_when_no_pr_url_match(self, abandon_mocks):
         """Test returns False when Gerrit changes don't match PR URL."""
-        from github2gerrit.gerrit_pr_closer import (
-            abandon_gerrit_change_for_closed_pr,
-        )
-
-        # Setup Gerrit client mock
-        mock_gerrit_client = MagicMock()
-        mock_build_gerrit_client.return_value = mock_gerrit_client
-
         # Mock Gerrit query response with non-matching change
-        mock_gerrit_client.get.return_value = [
+        abandon_mocks.gerrit.get.return_value = [
             {
                 "_number": "12345",
                 "subject": "Test change",
@@ -888,7 +832,7 @@ class TestAbandonGerritChangeForClosedPr:
         # Call function looking for PR #42
         result = abandon_gerrit_change_for_closed_pr(
             pr_number=42,
-            gerrit_server="gerrit.example.com",
+            gerrit_server=_GERRIT_SERVER,
             gerrit_project="test-project",
             repository="owner/repo",
             dry_run=False,
@@ -897,26 +841,10 @@ class TestAbandonGerritChangeForClosedPr:
         # Verify result
         assert result is None
 
-    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    def test_dry_run_does_not_abandon(
-        self,
-        mock_get_pull,
-        mock_build_client,
-        mock_build_gerrit_client,
-    ):
+    def test_dry_run_does_not_abandon(self, abandon_mocks):
         """Test dry-run mode does not actually abandon change."""
-        from github2gerrit.gerrit_pr_closer import (
-            abandon_gerrit_change_for_closed_pr,
-        )
-
-        # Setup Gerrit client mock
-        mock_gerrit_client = MagicMock()
-        mock_build_gerrit_client.return_value = mock_gerrit_client
-
         # Mock Gerrit query response with matching change
-        mock_gerrit_client.get.return_value = [
+        abandon_mocks.gerrit.get.return_value = [
             {
                 "_number": "12345",
                 "subject": "Test change",
@@ -935,17 +863,15 @@ class TestAbandonGerritChangeForClosedPr:
         ]
 
         # Setup GitHub client mock
-        mock_repo = MagicMock()
-        mock_build_client.return_value.get_repo.return_value = mock_repo
         mock_pr = MagicMock()
         mock_pr.number = 42
-        mock_get_pull.return_value = mock_pr
+        abandon_mocks.get_pull.return_value = mock_pr
         mock_pr.as_issue.return_value.get_comments.return_value = []
 
         # Call function in dry-run mode
         result = abandon_gerrit_change_for_closed_pr(
             pr_number=42,
-            gerrit_server="gerrit.example.com",
+            gerrit_server=_GERRIT_SERVER,
             gerrit_project="test-project",
             repository="owner/repo",
             dry_run=True,
@@ -953,27 +879,18 @@ class TestAbandonGerritChangeForClosedPr:
 
         # Verify result is change number but no POST was made
         assert result == "12345"
-        mock_gerrit_client.post.assert_not_called()
+        abandon_mocks._abandon_gerrit_change.assert_not_called()
+        abandon_mocks.gerrit.post.assert_not_called()
 
-    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
-    def test_handles_gerrit_query_exception(
-        self,
-        mock_build_gerrit_client,
-    ):
+    def test_handles_gerrit_query_exception(self, abandon_mocks):
         """Test handles exception during Gerrit query gracefully."""
-        from github2gerrit.gerrit_pr_closer import (
-            abandon_gerrit_change_for_closed_pr,
-        )
-
-        # Setup Gerrit client mock to raise exception
-        mock_gerrit_client = MagicMock()
-        mock_build_gerrit_client.return_value = mock_gerrit_client
-        mock_gerrit_client.get.side_effect = Exception("Connection error")
+        # Gerrit query raises
+        abandon_mocks.gerrit.get.side_effect = Exception("Connection error")
 
         # Call function
         result = abandon_gerrit_change_for_closed_pr(
             pr_number=42,
-            gerrit_server="gerrit.example.com",
+            gerrit_server=_GERRIT_SERVER,
             gerrit_project="test-project",
             repository="owner/repo",
             dry_run=False,
@@ -982,26 +899,9 @@ class TestAbandonGerritChangeForClosedPr:
         # Verify result is None
         assert result is None
 
-    @patch("github2gerrit.gerrit_pr_closer.build_client_for_host")
-    @patch("github2gerrit.gerrit_pr_closer.build_client")
-    @patch("github2gerrit.gerrit_pr_closer.get_pull")
-    @patch("github2gerrit.gerrit_pr_closer._abandon_gerrit_change")
-    def test_includes_closure_comments(
-        self,
-        mock_abandon,
-        mock_get_pull,
-        mock_build_client,
-        mock_build_gerrit_client,
-    ):
+    def test_includes_closure_comments(self, abandon_mocks):
         """Test includes PR closure comments in abandon message."""
-        from github2gerrit.gerrit_pr_closer import (
-            abandon_gerrit_change_for_closed_pr,
-        )
-
-        # Setup Gerrit client mock
-        mock_gerrit_client = MagicMock()
-        mock_build_gerrit_client.return_value = mock_gerrit_client
-        mock_gerrit_client.get.return_value = [
+        abandon_mocks.gerrit.get.return_value = [
             {
                 "_number": "12345",
                 "subject": "Test change",
@@ -1020,11 +920,9 @@ class TestAbandonGerritChangeForClosedPr:
         ]
 
         # Setup GitHub client mock with comments
-        mock_repo = MagicMock()
-        mock_build_client.return_value.get_repo.return_value = mock_repo
         mock_pr = MagicMock()
         mock_pr.number = 42
-        mock_get_pull.return_value = mock_pr
+        abandon_mocks.get_pull.return_value = mock_pr
 
         # Mock multiple PR comments
         mock_issue = MagicMock()
@@ -1047,7 +945,7 @@ class TestAbandonGerritChangeForClosedPr:
         # Call function
         result = abandon_gerrit_change_for_closed_pr(
             pr_number=42,
-            gerrit_server="gerrit.example.com",
+            gerrit_server=_GERRIT_SERVER,
             gerrit_project="test-project",
             repository="owner/repo",
             dry_run=False,
@@ -1055,8 +953,8 @@ class TestAbandonGerritChangeForClosedPr:
 
         # Verify abandon was called with comments included
         assert result == "12345"
-        mock_abandon.assert_called_once()
-        abandon_message = mock_abandon.call_args[0][2]
+        abandon_mocks._abandon_gerrit_change.assert_called_once()
+        abandon_message = abandon_mocks._abandon_gerrit_change.call_args.args[2]
         assert "Comment by user1" in abandon_message
         assert "Comment by user2" in abandon_message
         assert "Comment by user3" in abandon_message
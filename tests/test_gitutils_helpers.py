@@ -310,6 +310,35 @@ def test_git_last_commit_trailers_returns_empty_on_git_error(
     assert git_last_commit_trailers(keys=["Change-Id"]) == {}
 
 
+def test_git_show_many_returns_messages_per_sha(tmp_path: Path) -> None:
+    """All requested commit messages are read with one git invocation."""
+    from github2gerrit.gitutils import git_show_many
+
+    git(["init", "-q"], cwd=tmp_path)
+    shas = []
+    for subject in ("First", "Second"):
+        git(
+            [
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                subject,
+                "-m",
+                f"GitHub-PR: https://github.com/o/r/pull/{len(shas) + 1}",
+            ],
+            cwd=tmp_path,
+        )
+        shas.append(git(["rev-parse", "HEAD"], cwd=tmp_path).stdout.strip())
+
+    messages = git_show_many([shas[1], shas[0][:10]], cwd=tmp_path)
+
+    assert list(messages) == [shas[1], shas[0][:10]]
+    assert messages[shas[1]].startswith("Second\n\nGitHub-PR: ")
+    assert messages[shas[0][:10]].rstrip().endswith("/pull/1")
+    assert git_show_many([], cwd=tmp_path) == {}
+
+
 def test_git_quiet_suppresses_failure_logging(
     caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
 ) -> None:
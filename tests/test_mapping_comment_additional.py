@@ -24,6 +24,7 @@ from github2gerrit.mapping_comment import compute_mapping_digest
 from github2gerrit.mapping_comment import find_mapping_comments
 from github2gerrit.mapping_comment import parse_mapping_comments
 from github2gerrit.mapping_comment import serialize_mapping_comment
+from github2gerrit.mapping_comment import serialize_mapping_comments
 from github2gerrit.mapping_comment import update_mapping_comment_body
 from github2gerrit.mapping_comment import validate_mapping_consistency
 
@@ -146,6 +147,15 @@ def test_parse_mapping_comments_handles_malformed_block():
     assert parse_mapping_comments([malformed]) is None
 
 
+def test_parse_mapping_comments_skips_stray_leading_end_marker():
+    body = (
+        "<!-- end github2gerrit:change-id-map -->\n\n" + _make_mapping_comment()
+    )
+    mapping = parse_mapping_comments([body])
+    assert mapping
+    assert mapping.change_ids == _valid_ids(2)
+
+
 def test_parse_mapping_comments_deduplicates_ids():
     dup_block = "\n".join(
         [
@@ -165,6 +175,30 @@ def test_parse_mapping_comments_deduplicates_ids():
     assert mapping.change_ids == ["I1111111111111111111111111111111111111111"]
 
 
+def test_serialize_mapping_comments_round_trip():
+    mappings = [
+        ChangeIdMapping(
+            pr_url=f"https://github.com/org/repo/pull/{n}",
+            mode="multi-commit",
+            topic=f"GH-org-repo-{n}",
+            change_ids=_valid_ids(n),
+            github_hash=f"hash{n}",
+            digest=compute_mapping_digest(_valid_ids(n)) if n % 2 else "",
+        )
+        for n in range(1, 4)
+    ]
+    comments = serialize_mapping_comments(mappings)
+    assert len(comments) == 3
+    for mapping, comment in zip(mappings, comments, strict=True):
+        assert parse_mapping_comments([comment]) == mapping
+    assert comments[1] == _make_mapping_comment(
+        pr_url=mappings[1].pr_url,
+        topic=mappings[1].topic,
+        change_ids=_valid_ids(2),
+        gh_hash="hash2",
+    )
+
+
 # ---------------------------------------------------------------------------
 # Mapping replacement
 # ---------------------------------------------------------------------------
@@ -22,12 +22,18 @@ Covers:
 
 from __future__ import annotations
 
-from typing import Any
+import logging
+from dataclasses import replace
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
+from github2gerrit.cli import _build_inputs_from_env
+from github2gerrit.core import Orchestrator
+from github2gerrit.models import GitHubContext
+from github2gerrit.models import Inputs
 from github2gerrit.pr_commands import CMD_CREATE_MISSING
 from github2gerrit.pr_commands import COMMAND_REGISTRY
 from github2gerrit.pr_commands import CommandDefinition
@@ -51,11 +57,91 @@ _TEST_TOKEN = "test-token-for-unit-tests"
 
 @pytest.fixture()
 def _clean_registry():
-    """Snapshot and restore COMMAND_REGISTRY around a test."""
-    original = list(COMMAND_REGISTRY)
+    """Snapshot and restore COMMAND_REGISTRY around a test.
+
+    The parser's matchers are memoized per registry snapshot, so they need
+    no reset here.
+    """
+    original = tuple(COMMAND_REGISTRY)
     yield
-    COMMAND_REGISTRY.clear()
-    COMMAND_REGISTRY.extend(original)
+    COMMAND_REGISTRY[:] = original
+
+
+@pytest.fixture(scope="module")
+def inputs_template():
+    """Minimal Inputs with create_missing left at its default.
+
+    Inputs is a frozen dataclass, so tests derive variants with
+    ``dataclasses.replace`` instead of rebuilding every field.
+    """
+    return Inputs(
+        submit_single_commits=False,
+        use_pr_as_commit=False,
+        fetch_depth=10,
+        gerrit_known_hosts="",
+        gerrit_ssh_privkey_g2g="",
+        gerrit_ssh_user_g2g="",
+        gerrit_ssh_user_g2g_email="",
+        github_token=_TEST_TOKEN,
+        organization="TestOrg",
+        reviewers_email="",
+        preserve_github_prs=True,
+        dry_run=False,
+        normalise_commit=True,
+        gerrit_server="gerrit.example.com",
+        gerrit_server_port=29418,
+        gerrit_project="test-project",
+        issue_id="",
+        issue_id_lookup_json="",
+        commit_rules_json="",
+        allow_duplicates=True,
+        ci_testing=False,
+    )
+
+
+@pytest.fixture()
+def gh_ctx():
+    """GitHubContext for a synchronize event on PR #42."""
+    return GitHubContext(
+        event_name="pull_request",
+        event_action="synchronize",
+        event_path=None,
+        repository="TestOrg/test-repo",
+        repository_owner="TestOrg",
+        server_url="https://github.com",
+        run_id="12345",
+        sha="abc123",
+        base_ref="main",
+        head_ref="dependabot/npm/lodash-4.17.21",
+        pr_number=42,
+    )
+
+
+def _comment(body: str) -> SimpleNamespace:
+    """Stand-in for a PyGithub IssueComment; only ``body`` is read."""
+    return SimpleNamespace(body=body)
+
+
+@pytest.fixture()
+def mocked_gh(monkeypatch):
+    """Patch the GitHub helpers used by core with lightweight stubs.
+
+    Returns the patched ``build_client`` mock (for call assertions), the
+    PR stub and the ``comments`` list its issue view returns; tests
+    extend ``comments`` with ``_comment()`` stubs.
+    """
+    comments: list[SimpleNamespace] = []
+    issue = SimpleNamespace(get_comments=lambda: comments)
+    pr = SimpleNamespace(as_issue=lambda: issue)
+    repo = SimpleNamespace()
+    build_client = MagicMock(return_value=SimpleNamespace())
+
+    monkeypatch.setattr("github2gerrit.core.build_client", build_client)
+    monkeypatch.setattr(
+        "github2gerrit.core.get_repo_from_env", lambda client: repo
+    )
+    monkeypatch.setattr("github2gerrit.core.get_pull", lambda repo, number: pr)
+    return SimpleNamespace(build_client=build_client, pr=pr, comments=comments)
 
 
 # ── CommandDefinition tests ─────────────────────────────────────────
@@ -75,11 +161,26 @@ class TestCommandDefinition:
         defn = CommandDefinition(name="solo")
         assert defn.all_phrases() == ("solo",)
 
+    def test_all_phrases_built_once(self):
+        defn = CommandDefinition(name="foo bar", aliases=("fb",))
+        assert defn.all_phrases() is defn.all_phrases()
+
     def test_frozen(self):
         defn = CommandDefinition(name="x")
         with pytest.raises(AttributeError):
             defn.name = "y"  # type: ignore[misc]
 
+    def test_equality_ignores_derived_fields(self):
+        assert CommandDefinition(name="x") == CommandDefinition(name="x")
+        assert hash(CommandDefinition(name="x")) == hash(
+            CommandDefinition(name="x")
+        )
+
+    def test_matches_share_interned_canonical_name(self):
+        first = parse_commands(["@github2gerrit create-missing"])
+        second = parse_commands(["@github2gerrit Create Missing Change"])
+        assert first.matches[0].command_name is (second.matches[0].command_name)
+
 
 # ── Built-in registry tests ────────────────────────────────────────
 
@@ -139,7 +240,7 @@ class TestParseCommands:
     def test_empty_comments(self):
         result = parse_commands([])
         assert not result.has_matches
-        assert result.matches == []
+        assert result.matches == ()
         assert result.unrecognised == []
 
     def test_no_mentions(self):
@@ -150,37 +251,38 @@ class TestParseCommands:
         result = parse_commands(comments)
         assert not result.has_matches
 
-    def test_canonical_command(self):
-        comments = ["@github2gerrit create missing change"]
-        result = parse_commands(comments)
+    @pytest.mark.parametrize(
+        "comment",
+        [
+            "@github2gerrit create missing change",
+            "@github2gerrit CREATE MISSING CHANGE",
+            "@github2gerrit Create Missing Change",
+            "@github2gerrit create-missing",
+            "@github2gerrit create missing",
+            "@github2gerrit create missing change.",
+            # Matches via prefix matching
+            "@github2gerrit create missing change please",
+            "@github2gerrit   create   missing   change",
+            "  @github2gerrit create missing change",
+        ],
+        ids=[
+            "canonical",
+            "upper-case",
+            "mixed-case",
+            "alias-hyphenated",
+            "alias-short",
+            "trailing-punctuation",
+            "trailing-text",
+            "extra-whitespace",
+            "after-whitespace",
+        ],
+    )
+    def test_matches_canonical(self, comment):
+        result = parse_commands([comment])
         assert result.has_matches
         assert len(result.matches) == 1
         assert result.matches[0].command_name == "create missing change"
 
-    def test_case_insensitive(self):
-        comments = ["@github2gerrit CREATE MISSING CHANGE"]
-        result = parse_commands(comments)
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
-    def test_mixed_case(self):
-        comments = ["@github2gerrit Create Missing Change"]
-        result = parse_commands(comments)
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
-    def test_alias_create_missing(self):
-        comments = ["@github2gerrit create-missing"]
-        result = parse_commands(comments)
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
-    def test_alias_create_missing_short(self):
-        comments = ["@github2gerrit create missing"]
-        result = parse_commands(comments)
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
     def test_command_in_multiline_comment(self):
         comments = [
             "Hey team, I noticed the workflow is stuck.\n"
@@ -193,19 +295,6 @@ class TestParseCommands:
         assert result.has_matches
         assert result.matches[0].command_name == "create missing change"
 
-    def test_command_with_trailing_punctuation(self):
-        comments = ["@github2gerrit create missing change."]
-        result = parse_commands(comments)
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
-    def test_command_with_trailing_text(self):
-        comments = ["@github2gerrit create missing change please"]
-        result = parse_commands(comments)
-        # Should match via prefix matching
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
     def test_deduplication_latest_wins(self):
         comments = [
             "@github2gerrit create missing change",
@@ -244,16 +333,6 @@ class TestParseCommands:
         assert len(result.matches) == 1
         assert result.matches[0].command_name == "create missing change"
 
-    def test_mention_prefix_at_start_of_line(self):
-        comments = ["@github2gerrit create missing change"]
-        result = parse_commands(comments)
-        assert result.has_matches
-
-    def test_mention_prefix_after_whitespace(self):
-        comments = ["  @github2gerrit create missing change"]
-        result = parse_commands(comments)
-        assert result.has_matches
-
     def test_embedded_in_sentence_not_matched(self):
         # The mention needs to be preceded by whitespace or start-of-line
         comments = ["please-do-not@github2gerrit create missing change"]
@@ -273,17 +352,19 @@ class TestParseCommands:
         result = parse_commands(comments)
         assert result.has_matches
 
-    def test_extra_whitespace_in_command(self):
-        comments = ["@github2gerrit   create   missing   change"]
-        result = parse_commands(comments)
-        assert result.has_matches
-        assert result.matches[0].command_name == "create missing change"
-
     def test_raw_text_preserved(self):
         comments = ["@github2gerrit Create Missing Change"]
         result = parse_commands(comments)
         assert result.matches[0].raw_text == "Create Missing Change"
 
+    def test_raw_text_preserved_with_length_changing_lowercase(self):
+        # "İ".lower() is two code points; matching must not rely on a
+        # lowercased copy of the body
+        comments = ["İstanbul\n@GitHub2Gerrit Create Missing Change"]
+        result = parse_commands(comments)
+        assert result.matches[0].command_name == "create missing change"
+        assert result.matches[0].raw_text == "Create Missing Change"
+
 
 # ── CommandParseResult tests ────────────────────────────────────────
 
@@ -297,15 +378,17 @@ class TestCommandParseResult:
 
     def test_has_matches_with_match(self):
         r = CommandParseResult(
-            matches=[CommandMatch(command_name="foo", raw_text="foo")]
+            matches=(CommandMatch(command_name="foo", raw_text="foo"),)
         )
         assert r.has_matches
 
     def test_has_method(self):
         r = CommandParseResult(
-            matches=[
-                CommandMatch(command_name="create missing change", raw_text="x")
-            ]
+            matches=(
+                CommandMatch(
+                    command_name="create missing change", raw_text="x"
+                ),
+            )
         )
         assert r.has("create missing change")
         assert r.has("CREATE MISSING CHANGE")
@@ -313,7 +396,7 @@ class TestCommandParseResult:
 
     def test_has_strips_whitespace(self):
         r = CommandParseResult(
-            matches=[CommandMatch(command_name="foo bar", raw_text="x")]
+            matches=(CommandMatch(command_name="foo bar", raw_text="x"),)
         )
         assert r.has("  foo bar  ")
 
@@ -358,6 +441,33 @@ class TestFindCommand:
         match = find_command(comments, "CREATE MISSING CHANGE")
         assert match is not None
 
+    def test_repeated_lookups_scan_once(self):
+        comments = ["@github2gerrit create missing change", "unique body"]
+        with patch(
+            "github2gerrit.pr_commands.CommandMatch",
+            wraps=CommandMatch,
+        ) as spy:
+            assert has_command(comments, "create missing change")
+            assert find_command(comments, "create missing change")
+            assert parse_commands(comments).has("create missing change")
+        assert spy.call_count == 1
+
+    def test_cached_result_not_shared(self):
+        comments = ["@github2gerrit create missing change"]
+        first = parse_commands(comments)
+        assert isinstance(first.matches, tuple)
+        first.unrecognised.append("noise")
+        assert parse_commands(comments).unrecognised == []
+
+    def test_cached_lookups_still_log(self, caplog):
+        comments = ["@github2gerrit create missing change", "log me"]
+        with caplog.at_level(logging.INFO, "github2gerrit.pr_commands"):
+            parse_commands(comments)
+            parse_commands(comments)
+            find_command(comments, "create missing change")
+        found = [r for r in caplog.records if r.msg.startswith("Found ")]
+        assert len(found) == 3
+
 
 # ── Custom command registration tests ───────────────────────────────
 
@@ -403,6 +513,24 @@ class TestCustomCommandRegistration:
         names = {m.command_name for m in result.matches}
         assert names == {"alpha", "beta"}
 
+    @pytest.mark.usefixtures("_clean_registry")
+    def test_longest_registered_prefix_wins(self):
+        register_command(CommandDefinition(name="alpha"))
+        register_command(CommandDefinition(name="alpha beta"))
+        result = parse_commands(["@github2gerrit alpha beta, please"])
+        assert [m.command_name for m in result.matches] == ["alpha beta"]
+        result = parse_commands(["@github2gerrit alpha bet"])
+        assert [m.command_name for m in result.matches] == ["alpha"]
+
+    @pytest.mark.usefixtures("_clean_registry")
+    def test_direct_registry_edit_seen_after_parse(self):
+        comments = ["@github2gerrit gamma"]
+        assert not parse_commands(comments).has("gamma")
+        COMMAND_REGISTRY.append(CommandDefinition(name="gamma"))
+        assert parse_commands(comments).has("gamma")
+        COMMAND_REGISTRY.pop()
+        assert not parse_commands(comments).has("gamma")
+
 
 # ── _should_create_missing Orchestrator integration tests ───────────
 
@@ -410,197 +538,69 @@ class TestCustomCommandRegistration:
 class TestShouldCreateMissing:
     """Tests for the Orchestrator._should_create_missing method."""
 
-    def _make_inputs(self, create_missing: bool = False, **kwargs: Any):
-        """Create a minimal Inputs object for testing."""
-        from github2gerrit.models import Inputs
-
-        defaults = {
-            "submit_single_commits": False,
-            "use_pr_as_commit": False,
-            "fetch_depth": 10,
-            "gerrit_known_hosts": "",
-            "gerrit_ssh_privkey_g2g": "",
-            "gerrit_ssh_user_g2g": "",
-            "gerrit_ssh_user_g2g_email": "",
-            "github_token": _TEST_TOKEN,
-            "organization": "TestOrg",
-            "reviewers_email": "",
-            "preserve_github_prs": True,
-            "dry_run": False,
-            "normalise_commit": True,
-            "gerrit_server": "gerrit.example.com",
-            "gerrit_server_port": 29418,
-            "gerrit_project": "test-project",
-            "issue_id": "",
-            "issue_id_lookup_json": "",
-            "commit_rules_json": "",
-            "allow_duplicates": True,
-            "ci_testing": False,
-            "create_missing": create_missing,
-        }
-        defaults.update(kwargs)
-        return Inputs(**defaults)
-
-    def _make_gh(self, pr_number: int = 42):
-        """Create a minimal GitHubContext for testing."""
-        from github2gerrit.models import GitHubContext
-
-        return GitHubContext(
-            event_name="pull_request",
-            event_action="synchronize",
-            event_path=None,
-            repository="TestOrg/test-repo",
-            repository_owner="TestOrg",
-            server_url="https://github.com",
-            run_id="12345",
-            sha="abc123",
-            base_ref="main",
-            head_ref="dependabot/npm/lodash-4.17.21",
-            pr_number=pr_number,
-        )
-
-    def test_cli_flag_returns_true(self, tmp_path):
+    def test_cli_flag_returns_true(self, tmp_path, inputs_template, gh_ctx):
         """--create-missing flag bypasses comment check."""
-        from github2gerrit.core import Orchestrator
-
         orch = Orchestrator(workspace=tmp_path)
-        inputs = self._make_inputs(create_missing=True)
-        gh = self._make_gh()
+        inputs = replace(inputs_template, create_missing=True)
 
-        result = orch._should_create_missing(inputs, gh)
+        result = orch._should_create_missing(inputs, gh_ctx)
         assert result is True
 
-    def test_no_flag_no_comment_returns_false(self, tmp_path):
+    def test_no_flag_no_comment_returns_false(
+        self, tmp_path, inputs_template, gh_ctx, mocked_gh
+    ):
         """Without flag and without matching comment, returns False."""
-        from github2gerrit.core import Orchestrator
-
         orch = Orchestrator(workspace=tmp_path)
-        inputs = self._make_inputs(create_missing=False)
-        gh = self._make_gh()
-
-        # Mock GitHub API to return no matching comments
-        mock_comment = MagicMock()
-        mock_comment.body = "Just a regular comment"
-
-        mock_issue = MagicMock()
-        mock_issue.get_comments.return_value = [mock_comment]
-
-        mock_pr = MagicMock()
-        mock_pr.as_issue.return_value = mock_issue
+        mocked_gh.comments.append(_comment("Just a regular comment"))
 
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
-
-        with (
-            patch("github2gerrit.core.build_client", return_value=mock_client),
-            patch(
-                "github2gerrit.core.get_repo_from_env",
-                return_value=mock_repo,
-            ),
-            patch("github2gerrit.core.get_pull", return_value=mock_pr),
-        ):
-            result = orch._should_create_missing(inputs, gh)
-            assert result is False
+        result = orch._should_create_missing(inputs_template, gh_ctx)
+        assert result is False
 
-    def test_comment_directive_returns_true(self, tmp_path):
+    def test_comment_directive_returns_true(
+        self, tmp_path, inputs_template, gh_ctx, mocked_gh
+    ):
         """PR comment with @github2gerrit create missing change returns True."""
-        from github2gerrit.core import Orchestrator
-
         orch = Orchestrator(workspace=tmp_path)
-        inputs = self._make_inputs(create_missing=False)
-        gh = self._make_gh()
-
-        mock_comment_1 = MagicMock()
-        mock_comment_1.body = "CI is stuck, let me try this:"
-
-        mock_comment_2 = MagicMock()
-        mock_comment_2.body = "@github2gerrit create missing change"
-
-        mock_issue = MagicMock()
-        mock_issue.get_comments.return_value = [mock_comment_1, mock_comment_2]
-
-        mock_pr = MagicMock()
-        mock_pr.as_issue.return_value = mock_issue
-
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
+        mocked_gh.comments.extend(
+            [
+                _comment("CI is stuck, let me try this:"),
+                _comment("@github2gerrit create missing change"),
+            ]
+        )
 
-        with (
-            patch("github2gerrit.core.build_client", return_value=mock_client),
-            patch(
-                "github2gerrit.core.get_repo_from_env",
-                return_value=mock_repo,
-            ),
-            patch("github2gerrit.core.get_pull", return_value=mock_pr),
-        ):
-            result = orch._should_create_missing(inputs, gh)
-            assert result is True
+        result = orch._should_create_missing(inputs_template, gh_ctx)
+        assert result is True
 
-    def test_no_pr_number_returns_false(self, tmp_path):
+    def test_no_pr_number_returns_false(
+        self, tmp_path, inputs_template, gh_ctx, mocked_gh
+    ):
         """Without a PR number, cannot check comments."""
-        from github2gerrit.core import Orchestrator
-
         orch = Orchestrator(workspace=tmp_path)
-        inputs = self._make_inputs(create_missing=False)
-        gh = self._make_gh(pr_number=None)
+        gh = replace(gh_ctx, pr_number=None)
 
-        result = orch._should_create_missing(inputs, gh)
+        result = orch._should_create_missing(inputs_template, gh)
         assert result is False
+        mocked_gh.build_client.assert_not_called()
 
-    def test_github_api_failure_returns_false(self, tmp_path):
+    def test_github_api_failure_returns_false(
+        self, tmp_path, inputs_template, gh_ctx, mocked_gh
+    ):
         """GitHub API failure does not crash; returns False."""
-        from github2gerrit.core import Orchestrator
-
         orch = Orchestrator(workspace=tmp_path)
-        inputs = self._make_inputs(create_missing=False)
-        gh = self._make_gh()
+        mocked_gh.build_client.side_effect = RuntimeError("API unavailable")
 
-        with patch(
-            "github2gerrit.core.build_client",
-            side_effect=RuntimeError("API unavailable"),
-        ):
-            result = orch._should_create_missing(inputs, gh)
-            assert result is False
+        result = orch._should_create_missing(inputs_template, gh_ctx)
+        assert result is False
 
-    def test_alias_in_comment_returns_true(self, tmp_path):
+    def test_alias_in_comment_returns_true(
+        self, tmp_path, inputs_template, gh_ctx, mocked_gh
+    ):
         """PR comment with alias @github2gerrit create-missing returns True."""
-        from github2gerrit.core import Orchestrator
-
         orch = Orchestrator(workspace=tmp_path)
-        inputs = self._make_inputs(create_missing=False)
-        gh = self._make_gh()
+        mocked_gh.comments.append(_comment("@github2gerrit create-missing"))
 
-        mock_comment = MagicMock()
-        mock_comment.body = "@github2gerrit create-missing"
-
-        mock_issue = MagicMock()
-        mock_issue.get_comments.return_value = [mock_comment]
-
-        mock_pr = MagicMock()
-        mock_pr.as_issue.return_value = mock_issue
-
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
-
-        with (
-            patch("github2gerrit.core.build_client", return_value=mock_client),
-            patch(
-                "github2gerrit.core.get_repo_from_env",
-                return_value=mock_repo,
-            ),
-            patch("github2gerrit.core.get_pull", return_value=mock_pr),
-        ):
-            result = orch._should_create_missing(inputs, gh)
-            assert result is True
+        result = orch._should_create_missing(inputs_template, gh_ctx)
+        assert result is True
 
 
 # ── _post_create_missing_notice tests ───────────────────────────────
@@ -609,118 +609,41 @@ class TestShouldCreateMissing:
 class TestPostCreateMissingNotice:
     """Tests for the PR notice posted during create-missing fallback."""
 
-    def test_posts_comment(self, tmp_path):
-        from github2gerrit.core import Orchestrator
-        from github2gerrit.models import GitHubContext
-
-        orch = Orchestrator(workspace=tmp_path)
-        gh = GitHubContext(
-            event_name="pull_request",
-            event_action="synchronize",
-            event_path=None,
-            repository="Org/repo",
-            repository_owner="Org",
-            server_url="https://github.com",
-            run_id="1",
-            sha="abc",
-            base_ref="main",
-            head_ref="feature",
-            pr_number=99,
+    def test_posts_comment(self, tmp_path, monkeypatch, gh_ctx, mocked_gh):
+        mock_comment = MagicMock()
+        monkeypatch.setattr(
+            "github2gerrit.core.create_pr_comment", mock_comment
         )
+        orch = Orchestrator(workspace=tmp_path)
 
-        mock_pr = MagicMock()
-        mock_repo = MagicMock()
-        mock_repo.get_pull.return_value = mock_pr
-        mock_client = MagicMock()
-        mock_client.get_repo.return_value = mock_repo
-
-        with (
-            patch("github2gerrit.core.build_client", return_value=mock_client),
-            patch(
-                "github2gerrit.core.get_repo_from_env",
-                return_value=mock_repo,
-            ),
-            patch("github2gerrit.core.get_pull", return_value=mock_pr),
-            patch("github2gerrit.core.create_pr_comment") as mock_comment,
-        ):
-            orch._post_create_missing_notice(gh)
-            mock_comment.assert_called_once()
-            call_body = mock_comment.call_args[0][1]
-            assert "GitHub2Gerrit" in call_body
-            assert "fallback" in call_body.lower()
-
-    def test_skips_when_ci_testing(self, tmp_path, monkeypatch):
-        from github2gerrit.core import Orchestrator
-        from github2gerrit.models import GitHubContext
+        orch._post_create_missing_notice(gh_ctx)
+        mock_comment.assert_called_once()
+        pr_obj, call_body = mock_comment.call_args[0]
+        assert pr_obj is mocked_gh.pr
+        assert "GitHub2Gerrit" in call_body
+        assert "fallback" in call_body.lower()
 
+    def test_skips_when_ci_testing(
+        self, tmp_path, monkeypatch, gh_ctx, mocked_gh
+    ):
         monkeypatch.setenv("CI_TESTING", "true")
         orch = Orchestrator(workspace=tmp_path)
-        gh = GitHubContext(
-            event_name="pull_request",
-            event_action="synchronize",
-            event_path=None,
-            repository="Org/repo",
-            repository_owner="Org",
-            server_url="https://github.com",
-            run_id="1",
-            sha="abc",
-            base_ref="main",
-            head_ref="feature",
-            pr_number=99,
-        )
-
-        with patch("github2gerrit.core.build_client") as mock_build:
-            orch._post_create_missing_notice(gh)
-            mock_build.assert_not_called()
 
-    def test_skips_when_no_pr_number(self, tmp_path):
-        from github2gerrit.core import Orchestrator
-        from github2gerrit.models import GitHubContext
+        orch._post_create_missing_notice(gh_ctx)
+        mocked_gh.build_client.assert_not_called()
 
+    def test_skips_when_no_pr_number(self, tmp_path, gh_ctx, mocked_gh):
         orch = Orchestrator(workspace=tmp_path)
-        gh = GitHubContext(
-            event_name="pull_request",
-            event_action="synchronize",
-            event_path=None,
-            repository="Org/repo",
-            repository_owner="Org",
-            server_url="https://github.com",
-            run_id="1",
-            sha="abc",
-            base_ref="main",
-            head_ref="feature",
-            pr_number=None,
-        )
-
-        with patch("github2gerrit.core.build_client") as mock_build:
-            orch._post_create_missing_notice(gh)
-            mock_build.assert_not_called()
 
-    def test_handles_api_error_gracefully(self, tmp_path):
-        from github2gerrit.core import Orchestrator
-        from github2gerrit.models import GitHubContext
+        orch._post_create_missing_notice(replace(gh_ctx, pr_number=None))
+        mocked_gh.build_client.assert_not_called()
 
+    def test_handles_api_error_gracefully(self, tmp_path, gh_ctx, mocked_gh):
         orch = Orchestrator(workspace=tmp_path)
-        gh = GitHubContext(
-            event_name="pull_request",
-            event_action="synchronize",
-            event_path=None,
-            repository="Org/repo",
-            repository_owner="Org",
-            server_url="https://github.com",
-            run_id="1",
-            sha="abc",
-            base_ref="main",
-            head_ref="feature",
-            pr_number=99,
-        )
+        mocked_gh.build_client.side_effect = RuntimeError("boom")
 
-        with patch(
-            "github2gerrit.core.build_client",
-            side_effect=RuntimeError("boom"),
-        ):
-            # Should not raise
-            orch._post_create_missing_notice(gh)
+        # Should not raise
+        orch._post_create_missing_notice(gh_ctx)
 
 
 # ── Inputs model tests ──────────────────────────────────────────────
@@ -729,61 +652,11 @@ class TestPostCreateMissingNotice:
 class TestInputsCreateMissing:
     """Tests for the create_missing field on the Inputs model."""
 
-    def test_default_is_false(self):
-        from github2gerrit.models import Inputs
-
-        inputs = Inputs(
-            submit_single_commits=False,
-            use_pr_as_commit=False,
-            fetch_depth=10,
-            gerrit_known_hosts="",
-            gerrit_ssh_privkey_g2g="",
-            gerrit_ssh_user_g2g="",
-            gerrit_ssh_user_g2g_email="",
-            github_token=_TEST_TOKEN,
-            organization="org",
-            reviewers_email="",
-            preserve_github_prs=True,
-            dry_run=False,
-            normalise_commit=True,
-            gerrit_server="g.example.com",
-            gerrit_server_port=29418,
-            gerrit_project="proj",
-            issue_id="",
-            issue_id_lookup_json="",
-            commit_rules_json="",
-            allow_duplicates=True,
-            ci_testing=False,
-        )
-        assert inputs.create_missing is False
+    def test_default_is_false(self, inputs_template):
+        assert inputs_template.create_missing is False
 
-    def test_can_set_true(self):
-        from github2gerrit.models import Inputs
-
-        inputs = Inputs(
-            submit_single_commits=False,
-            use_pr_as_commit=False,
-            fetch_depth=10,
-            gerrit_known_hosts="",
-            gerrit_ssh_privkey_g2g="",
-            gerrit_ssh_user_g2g="",
-            gerrit_ssh_user_g2g_email="",
-            github_token=_TEST_TOKEN,
-            organization="org",
-            reviewers_email="",
-            preserve_github_prs=True,
-            dry_run=False,
-            normalise_commit=True,
-            gerrit_server="g.example.com",
-            gerrit_server_port=29418,
-            gerrit_project="proj",
-            issue_id="",
-            issue_id_lookup_json="",
-            commit_rules_json="",
-            allow_duplicates=True,
-            ci_testing=False,
-            create_missing=True,
-        )
+    def test_can_set_true(self, inputs_template):
+        inputs = replace(inputs_template, create_missing=True)
         assert inputs.create_missing is True
 
 
@@ -797,8 +670,6 @@ class TestCreateMissingEnvVar:
         """Default value when CREATE_MISSING is not set."""
         monkeypatch.delenv("CREATE_MISSING", raising=False)
 
-        from github2gerrit.cli import _build_inputs_from_env
-
         # Set minimal required env vars
         monkeypatch.setenv("GITHUB_TOKEN", "test-token")
         inputs = _build_inputs_from_env()
@@ -809,8 +680,6 @@ class TestCreateMissingEnvVar:
         monkeypatch.setenv("CREATE_MISSING", "true")
         monkeypatch.setenv("GITHUB_TOKEN", "test-token")
 
-        from github2gerrit.cli import _build_inputs_from_env
-
         inputs = _build_inputs_from_env()
         assert inputs.create_missing is True
 
@@ -819,8 +688,6 @@ class TestCreateMissingEnvVar:
         monkeypatch.setenv("CREATE_MISSING", "false")
         monkeypatch.setenv("GITHUB_TOKEN", "test-token")
 
-        from github2gerrit.cli import _build_inputs_from_env
-
         inputs = _build_inputs_from_env()
         assert inputs.create_missing is False
 
@@ -844,60 +711,88 @@ class TestEdgeCases:
         result = parse_commands(comments)
         assert not result.has_matches
 
-    def test_html_comment_body(self):
-        """Commands inside HTML comments in the body still match."""
-        comments = [
-            "<!-- some html -->\n@github2gerrit create missing change\n<!-- end -->"
-        ]
-        result = parse_commands(comments)
-        assert result.has_matches
-
-    def test_code_block_not_special(self):
-        """Commands in code blocks still match (we do text scanning)."""
-        comments = ["```\n@github2gerrit create missing change\n```"]
-        result = parse_commands(comments)
-        # The regex does line-by-line matching; the mention inside
-        # a code fence is still on its own line, so it matches.
-        assert result.has_matches
-
-    def test_very_long_comment_body(self):
-        """Handling of very long comment bodies."""
-        padding = "x" * 10000
-        comments = [
-            f"{padding}\n@github2gerrit create missing change\n{padding}"
-        ]
-        result = parse_commands(comments)
-        assert result.has_matches
-
-    def test_unicode_in_surrounding_text(self):
-        """Unicode characters around the command don't break parsing."""
-        comments = [
-            "🔧 Let's fix this:\n@github2gerrit create missing change\n✅ Done"
-        ]
+    @pytest.mark.parametrize(
+        ("comments", "expected_index"),
+        [
+            pytest.param(
+                [
+                    "<!-- some html -->\n"
+                    "@github2gerrit create missing change\n"
+                    "<!-- end -->"
+                ],
+                0,
+                id="html-comment-body",
+            ),
+            # Matching is plain text scanning; a mention inside a code
+            # fence is still on its own line, so it matches
+            pytest.param(
+                ["```\n@github2gerrit create missing change\n```"],
+                0,
+                id="code-block",
+            ),
+            pytest.param(
+                [
+                    f"{'x' * 10000}\n"
+                    "@github2gerrit create missing change\n"
+                    f"{'x' * 10000}"
+                ],
+                0,
+                id="very-long-body",
+            ),
+            pytest.param(
+                [
+                    "🔧 Let's fix this:\n"
+                    "@github2gerrit create missing change\n"
+                    "✅ Done"
+                ],
+                0,
+                id="unicode-surrounding-text",
+            ),
+            # Both mentions resolve to the same canonical name, so
+            # deduplication leaves one match
+            pytest.param(
+                [
+                    "@github2gerrit create missing change "
+                    "@github2gerrit create-missing"
+                ],
+                0,
+                id="multiple-mentions-same-line",
+            ),
+            pytest.param(
+                [
+                    "no command here",
+                    "also nothing",
+                    "@github2gerrit create missing change",
+                    "trailing comment",
+                ],
+                2,
+                id="comment-index-tracking",
+            ),
+        ],
+    )
+    def test_single_directive_found(self, comments, expected_index):
+        """The directive is found once, in the expected comment."""
         result = parse_commands(comments)
-        assert result.has_matches
+        assert len(result.matches) == 1
+        assert result.matches[0].command_name == "create missing change"
+        assert result.matches[0].comment_index == expected_index
 
-    def test_multiple_mentions_on_same_line(self):
-        """Only the first mention on a line should match (regex behavior)."""
+    def test_other_mentions_and_addresses_skipped(self):
+        """Non-bot @-mentions before the directive are not directives."""
         comments = [
-            "@github2gerrit create missing change @github2gerrit create-missing"
+            "cc @alice @bob, mail x@example.com\n" * 50
+            + "@GitHub2Gerrit create missing change"
         ]
         result = parse_commands(comments)
-        # Should get at least one match
-        assert result.has_matches
-        # Both resolve to same canonical name so deduplication applies
-        assert len(result.matches) == 1
+        assert result.matches[0].raw_text == "create missing change"
+        assert result.unrecognised == []
 
-    def test_command_match_comment_index_tracking(self):
-        """Verify comment_index tracks which comment contained the match."""
-        comments = [
-            "no command here",
-            "also nothing",
-            "@github2gerrit create missing change",
-            "trailing comment",
-        ]
+    def test_mention_lookalike_not_matched(self):
+        """Case folding does not turn a dotless i into the mention."""
+        comments = ["İ\n@g\u0131thub2gerrit create missing change"]
         result = parse_commands(comments)
-        assert result.matches[0].comment_index == 2
+        assert not result.has_matches
+        assert result.unrecognised == []
 
 
 # ── Real-world regression tests ─────────────────────────────────────
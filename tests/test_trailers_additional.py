@@ -13,6 +13,8 @@ import pytest
 
 from github2gerrit import trailers
 from github2gerrit.trailers import add_trailers
+from github2gerrit.trailers import compute_bitset_jaccard_similarities
+from github2gerrit.trailers import compute_bitset_jaccard_similarity
 from github2gerrit.trailers import compute_file_signature
 from github2gerrit.trailers import compute_jaccard_similarity
 from github2gerrit.trailers import extract_change_ids
@@ -21,6 +23,9 @@ from github2gerrit.trailers import extract_subject_tokens
 from github2gerrit.trailers import has_trailer
 from github2gerrit.trailers import normalize_subject_for_matching
 from github2gerrit.trailers import parse_trailers
+from github2gerrit.trailers import tokens_to_bitset
+from github2gerrit.trailers import which_trailer_values_present
+from github2gerrit.trailers import which_trailers_present
 
 
 # ---------------------------------------------------------------------------
@@ -76,6 +81,16 @@ def test_extract_change_ids_list():
     assert ids == ["I111", "I222"]
 
 
+def test_extractors_return_fresh_copies_of_cached_results():
+    msg = "T\n\nChange-Id: I111\nGitHub-Hash: h1\n"
+    ids = extract_change_ids(msg)
+    ids.append("Ibogus")
+    meta = extract_github_metadata(msg)
+    meta["GitHub-Hash"] = "mutated"
+    assert extract_change_ids(msg) == ["I111"]
+    assert extract_github_metadata(msg) == {"GitHub-Hash": "h1"}
+
+
 # ---------------------------------------------------------------------------
 # has_trailer + add_trailers
 # ---------------------------------------------------------------------------
@@ -89,6 +104,15 @@ def test_has_trailer_any_value_and_specific():
     assert not has_trailer(msg, "X", "3")
 
 
+def test_which_trailers_present_batch_checks():
+    msg = "T\n\nX: 1\nX: 2\nZ: 9\n"
+    assert which_trailers_present(msg, {"X", "Y", "Z"}) == {"X", "Z"}
+    assert which_trailers_present("", ["X"]) == frozenset()
+    assert which_trailer_values_present(
+        msg, [("X", "2"), ("X", "3"), ("Y", "1")]
+    ) == {("X", "2")}
+
+
 def test_add_trailers_deduplicates_and_appends():
     base = "Title\n\nBody."
     out = add_trailers(base, {"A": "1", "B": "2"})
@@ -148,6 +172,13 @@ def test_compute_file_signature_order_insensitive_and_normalized():
 
 def test_compute_file_signature_empty_list():
     assert compute_file_signature([]) == ""
+    assert compute_file_signature(["/", "  "]) == ""
+
+
+def test_compute_file_signature_ignores_duplicate_paths():
+    assert compute_file_signature(["a.py", "A.py/"]) == compute_file_signature(
+        ["a.py"]
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -170,6 +201,39 @@ def test_compute_jaccard_similarity_partial_overlap():
     assert abs(sim - expected) < 1e-9
 
 
+def test_bitset_jaccard_matches_set_jaccard():
+    s1 = {"alpha", "beta", "gamma"}
+    s2 = {"beta", "gamma", "delta", "epsilon"}
+    vocabulary: dict[str, int] = {}
+    b1 = tokens_to_bitset(s1, vocabulary)
+    b2 = tokens_to_bitset(s2, vocabulary)
+    assert len(vocabulary) == 5
+    assert b1.bit_count() == 3
+    assert compute_bitset_jaccard_similarity(
+        b1, b2
+    ) == compute_jaccard_similarity(s1, s2)
+    assert compute_bitset_jaccard_similarity(0, 0) == 1.0
+    assert compute_bitset_jaccard_similarity(b1, 0) == 0.0
+
+
+def test_bitset_jaccard_similarities_bulk_matches_pairwise():
+    vocabulary: dict[str, int] = {}
+    query = tokens_to_bitset({"network", "parser", "crash"}, vocabulary)
+    candidates = [
+        tokens_to_bitset(tokens, vocabulary)
+        for tokens in (
+            {"network", "parser"},
+            {"unrelated"},
+            set(),
+            {"network", "parser", "crash"},
+        )
+    ]
+    assert compute_bitset_jaccard_similarities(query, candidates) == [
+        compute_bitset_jaccard_similarity(query, other) for other in candidates
+    ]
+    assert compute_bitset_jaccard_similarities(0, [0, query]) == [1.0, 0.0]
+
+
 # ---------------------------------------------------------------------------
 # Integration style: ensure parse + add interplay
 # ---------------------------------------------------------------------------